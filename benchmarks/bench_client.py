@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+"""Throughput benchmark for the cadastre client against the replay server.
+
+Runs one workload in several client modes and reports, per mode, operations
+per second, p50 / p95 latency per operation, cache hit rate, retries and the
+HTTP requests the server saw:
+
+  * ``sequential`` — default urllib fetcher, one call at a time.
+  * ``pooled``     — ``http_pool.PooledFetcher`` (keep-alive), one at a time.
+  * ``concurrent`` — PooledFetcher on ``concurrency.run_ordered`` with
+    ``--workers`` threads (plus ``--rate`` token bucket): BatchTask's pipeline.
+  * ``async``      — ``napr_async.AsyncClient`` with ``--workers`` in flight.
+    Every item starts at once, so its latency includes time queued behind
+    the semaphore.
+
+Workloads: ``lookup`` (code -> search + geometry [+ info], as BatchTask) and
+``area`` (reverse lookups over a point grid, then geometry for every new lbl,
+as AreaFetchTask). ``--repeat`` re-asks that share of codes / points to
+exercise the cache. Every mode starts from an empty in-memory cache and code
+index.
+
+Results are comparable across releases: ``--json`` writes them with the
+plugin version, the full configuration and the seed::
+
+    python benchmarks/bench_client.py --codes 400 --latency 40 --json out.json
+
+Pure standard library (no QGIS). By default an in-process replay server is
+started; ``--url`` targets one that is already running.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import threading
+import time
+from urllib.request import urlopen
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from georgian_cadastre import concurrency, http_pool, napr_async, napr_client  # noqa: E402
+from georgian_cadastre.napr_client import NaprError  # noqa: E402
+from replay_server import ReplayServer  # noqa: E402
+
+SCHEMA = 1
+MODES = ("sequential", "pooled", "concurrent", "async")
+
+
+def plugin_version():
+    path = os.path.join(ROOT, "georgian_cadastre", "metadata.txt")
+    try:
+        with open(path, encoding="utf-8") as fh:
+            for line in fh:
+                if line.startswith("version="):
+                    return line.split("=", 1)[1].strip()
+    except OSError:
+        pass
+    return None
+
+
+# --------------------------------------------------------------------------- #
+# Workloads
+# --------------------------------------------------------------------------- #
+def make_items(args):
+    rng = random.Random(args.seed)
+    if args.workload == "lookup":
+        base = ["01.{:02d}.{:02d}.{:03d}.{:03d}".format(
+            rng.randint(10, 19), rng.randint(1, 20), rng.randint(1, 300), i % 1000)
+            for i in range(args.codes)]
+    else:
+        base = [(44.70 + (i % 25) * 0.0006, 41.70 + (i // 25) * 0.0006)
+                for i in range(args.codes)]
+    repeats = [rng.choice(base) for _ in range(int(len(base) * args.repeat))]
+    items = base + repeats
+    rng.shuffle(items)
+    return items
+
+
+class _Area:
+    """AreaFetchTask's two phases folded per point: reverse, then geometry
+    for each lbl not seen before (shared across workers)."""
+
+    def __init__(self):
+        self.seen = set()
+        self.lock = threading.Lock()
+
+    def fresh(self, matches):
+        with self.lock:
+            new = [m["lbl"] for m in matches if m["lbl"] not in self.seen]
+            self.seen.update(new)
+        return new
+
+    def sync(self, point, fetch):
+        matches = napr_client.reverse(point[0], point[1], radius=50, limit=15,
+                                      fetch=fetch)
+        for lbl in self.fresh(matches):
+            napr_client.fetch_features(lbl, fetch=fetch)
+
+    async def aio(self, point, client):
+        matches = await client.reverse(point[0], point[1], radius=50, limit=15)
+        await asyncio.gather(*(client.fetch_features(lbl)
+                               for lbl in self.fresh(matches)))
+
+
+def _op(args, area):
+    if args.workload == "lookup":
+        return lambda item, fetch: napr_client.lookup(
+            item, fetch=fetch, with_info=args.with_info)
+    return area.sync
+
+
+# --------------------------------------------------------------------------- #
+# Modes
+# --------------------------------------------------------------------------- #
+def _timed(fn):
+    samples = []
+
+    def _call(item):
+        t0 = time.perf_counter()
+        try:
+            fn(item)
+        finally:
+            samples.append(time.perf_counter() - t0)
+
+    return _call, samples
+
+
+def run_sync(args, items, mode):
+    area = _Area()
+    op = _op(args, area)
+    fetch = None if mode == "sequential" else http_pool.PooledFetcher(
+        max_per_host=max(1, args.workers))
+    workers = args.workers if mode == "concurrent" else 1
+    if mode == "concurrent" and args.rate:
+        fetch = concurrency.throttled(fetch, concurrency.TokenBucket(args.rate))
+    call, samples = _timed(lambda item: op(item, fetch))
+    ok = failed = 0
+    t0 = time.perf_counter()
+    for _, _, success, _ in concurrency.run_ordered(call, items, workers=workers):
+        ok += success
+        failed += not success
+    wall = time.perf_counter() - t0
+    if hasattr(fetch, "close"):
+        fetch.close()
+    return wall, ok, failed, samples
+
+
+def run_async(args, items):
+    area = _Area()
+    client = napr_async.AsyncClient(concurrency=max(1, args.workers))
+    samples = []
+
+    async def one(item):
+        t0 = time.perf_counter()
+        try:
+            if args.workload == "lookup":
+                await client.lookup(item, with_info=args.with_info)
+            else:
+                await area.aio(item, client)
+            return True
+        except NaprError:
+            return False
+        finally:
+            samples.append(time.perf_counter() - t0)
+
+    async def main():
+        return await asyncio.gather(*(one(i) for i in items))
+
+    t0 = time.perf_counter()
+    outcomes = asyncio.run(main())
+    wall = time.perf_counter() - t0
+    ok = sum(outcomes)
+    return wall, ok, len(outcomes) - ok, samples
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[k]
+
+
+def server_requests(url, server):
+    if server is not None:
+        return server.stats()["requests"]
+    try:
+        with urlopen(url + "/__stats", timeout=5) as resp:
+            return json.loads(resp.read().decode("utf-8"))["requests"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def bench_mode(args, items, mode, url, server):
+    napr_client.set_cache(None)
+    napr_client.set_code_index(None)
+    napr_client.reset_endpoint_stats()
+    before_net = napr_client.net_stats()
+    before_http = server_requests(url, server)
+    if mode == "async":
+        wall, ok, failed, samples = run_async(args, items)
+    else:
+        wall, ok, failed, samples = run_sync(args, items, mode)
+    cache = napr_client.cache_stats()
+    after_net = napr_client.net_stats()
+    after_http = server_requests(url, server)
+    looked = cache["hits"] + cache["misses"]
+    p50, p95 = percentile(samples, 50), percentile(samples, 95)
+    return {
+        "mode": mode,
+        "ops": len(items),
+        "ok": ok,
+        "failed": failed,
+        "wall_s": round(wall, 4),
+        "ops_per_s": round(len(items) / wall, 2) if wall else None,
+        "p50_ms": round(p50 * 1000, 2) if p50 is not None else None,
+        "p95_ms": round(p95 * 1000, 2) if p95 is not None else None,
+        "cache_hit_rate": round(cache["hits"] / looked, 4) if looked else None,
+        "retries": after_net["retries"] - before_net["retries"],
+        "breaker_trips": after_net["breaker_trips"] - before_net["breaker_trips"],
+        "http_requests": (after_http - before_http
+                          if None not in (after_http, before_http) else None),
+        "endpoints": napr_client.endpoint_stats(),
+    }
+
+
+# --------------------------------------------------------------------------- #
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("--workload", choices=("lookup", "area"), default="lookup")
+    ap.add_argument("--modes", default=",".join(MODES))
+    ap.add_argument("--codes", type=int, default=200,
+                    help="distinct codes (lookup) or grid points (area)")
+    ap.add_argument("--repeat", type=float, default=0.2,
+                    help="extra share of repeated items (cache hits)")
+    ap.add_argument("--workers", type=int, default=8)
+    ap.add_argument("--rate", type=float, default=0.0,
+                    help="req/s limit in concurrent mode (0 = none)")
+    ap.add_argument("--with-info", action="store_true")
+    ap.add_argument("--latency", type=float, default=30.0, help="server ms")
+    ap.add_argument("--jitter", type=float, default=20.0, help="server ms")
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--malformed-rate", type=float, default=0.0)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--url", help="use a running replay server instead")
+    ap.add_argument("--json", help="write results to this file")
+    args = ap.parse_args(argv)
+
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        ap.error("unknown mode(s): {}".format(", ".join(sorted(unknown))))
+
+    # Fail fast instead of sleeping through backoff between modes.
+    napr_client.BACKOFF_BASE = min(napr_client.BACKOFF_BASE, 0.05)
+
+    server = None
+    url = args.url
+    if url is None:
+        server = ReplayServer(latency=args.latency / 1000.0,
+                              jitter=args.jitter / 1000.0,
+                              error_rate=args.error_rate,
+                              malformed_rate=args.malformed_rate,
+                              seed=args.seed).start()
+        url = server.url
+    napr_client.set_base_url(url)
+    items = make_items(args)
+
+    results = []
+    try:
+        print("{} x {} ({} workers) against {}".format(
+            args.workload, len(items), args.workers, url))
+        print("{:<11} {:>9} {:>9} {:>9} {:>7} {:>6} {:>7} {:>6}".format(
+            "mode", "ops/s", "p50 ms", "p95 ms", "hit %", "fail", "retries", "http"))
+        for mode in modes:
+            r = bench_mode(args, items, mode, url, server)
+            results.append(r)
+            print("{:<11} {:>9} {:>9} {:>9} {:>7} {:>6} {:>7} {:>6}".format(
+                mode, r["ops_per_s"], r["p50_ms"], r["p95_ms"],
+                "-" if r["cache_hit_rate"] is None
+                else round(100 * r["cache_hit_rate"], 1),
+                r["failed"], r["retries"],
+                "-" if r["http_requests"] is None else r["http_requests"]))
+    finally:
+        napr_client.set_base_url(None)
+        if server is not None:
+            server.stop()
+
+    if args.json:
+        report = {
+            "schema": SCHEMA,
+            "plugin_version": plugin_version(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": {k: v for k, v in vars(args).items() if k != "json"},
+            "results": results,
+        }
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2, ensure_ascii=False)
+        print("wrote {}".format(args.json))
+
+
+if __name__ == "__main__":
+    main()
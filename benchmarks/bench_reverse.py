@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""Benchmark: getinfo2 reverse-lookup parsing (napr_client._parse_reverse).
+
+Times the current parser (the payload split at most ``limit + 1`` times)
+against the original split-everything-then-search parser over the payloads in
+``benchmarks/fixtures/getinfo2_*.json`` (drop more recorded service responses
+there), and checks both return the same rows.
+Pure standard library::
+
+    python benchmarks/bench_reverse.py [repeat]
+"""
+import glob
+import os
+import re
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from georgian_cadastre import napr_client  # noqa: E402
+
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures", "getinfo2_*.json")
+LIMITS = (1, 8, 15, 1000)
+
+_NAME = re.compile(r'"name"\s*:\s*"([^"]*)"')
+_DESC = re.compile(r'"descript"\s*:\s*"([^"]*)"')
+_LBL = re.compile(r'lbl=([A-Za-z0-9_:]+)')
+_DIST = re.compile(r'"distance"\s*:\s*"?([\d.]+)"?')
+
+
+def legacy_parse_reverse(raw, limit):
+    """The pre-scanner implementation, kept here as the reference."""
+    chunks = re.split(r'"id"\s*:', raw)[1:]
+    out = []
+    for chunk in chunks[:limit]:
+        name = _NAME.search(chunk)
+        lbl = _LBL.search(chunk)
+        if not name or not lbl:
+            continue
+        desc = _DESC.search(chunk)
+        dist = _DIST.search(chunk)
+        out.append({
+            "code": name.group(1),
+            "address": desc.group(1) if desc else "",
+            "lbl": lbl.group(1),
+            "distance": float(dist.group(1)) if dist else None,
+        })
+    return out
+
+
+def main(repeat=2000):
+    paths = sorted(glob.glob(FIXTURES))
+    if not paths:
+        sys.exit("no fixtures in {}".format(os.path.dirname(FIXTURES)))
+    print("{:<28} {:>6} {:>5} {:>11} {:>11} {:>6}".format(
+        "payload", "bytes", "limit", "legacy us", "current us", "x"))
+    for path in paths:
+        with open(path, encoding="utf-8") as fh:
+            raw = fh.read()
+        for limit in LIMITS:
+            expected = legacy_parse_reverse(raw, limit)
+            got = napr_client._parse_reverse(raw, limit)
+            if got != expected:
+                sys.exit("MISMATCH on {} (limit {})".format(path, limit))
+            old = min(timeit.repeat(lambda: legacy_parse_reverse(raw, limit),
+                                    number=repeat, repeat=3)) / repeat
+            new = min(timeit.repeat(lambda: napr_client._parse_reverse(raw, limit),
+                                    number=repeat, repeat=3)) / repeat
+            print("{:<28} {:>6} {:>5} {:>11.1f} {:>11.1f} {:>6.1f}".format(
+                os.path.basename(path), len(raw.encode("utf-8")), limit,
+                old * 1e6, new * 1e6, old / new if new else 0.0))
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:2]))
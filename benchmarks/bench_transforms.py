@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""Micro-benchmark: per-row reprojection + measurement in cadastre_core.
+
+Compares the old per-feature path (a new QgsCoordinateTransform for the output
+geometry and another for the UTM measurement) with the cached-transform,
+single-pass ``project_and_measure`` used by ``make_features`` now.
+
+Needs a QGIS Python environment (the bundled python / OSGeo4W shell)::
+
+    python benchmarks/bench_transforms.py [rows] [vertices]
+"""
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qgis.core import (  # noqa: E402
+    QgsApplication,
+    QgsCoordinateTransform,
+    QgsGeometry,
+    QgsProject,
+)
+
+
+def _parcel_wkt(i, vertices):
+    """A many-vertex polygon somewhere in Georgia (alternates 37N / 38N)."""
+    lon = (41.6 if i % 2 else 44.8) + (i % 50) * 0.001
+    lat = 41.7 + (i // 50) * 0.001
+    r = 0.0004
+    ring = ["{} {}".format(lon + r * math.cos(2 * math.pi * k / vertices),
+                           lat + r * math.sin(2 * math.pi * k / vertices))
+            for k in range(vertices)]
+    ring.append(ring[0])
+    return "POLYGON(({}))".format(", ".join(ring))
+
+
+def _old(core, geom, target_epsg):
+    """The pre-cache path: two fresh transforms per row."""
+    def tr(epsg):
+        t = QgsCoordinateTransform(core.WGS84, core._crs(epsg),
+                                   QgsProject.instance())
+        g = QgsGeometry(geom)
+        g.transform(t)
+        return g
+    out = tr(target_epsg)
+    utm = tr(core.auto_zone_epsg(geom))
+    return out, utm.area(), utm.length()
+
+
+def _time(fn, geoms, target_epsg):
+    t0 = time.perf_counter()
+    for g in geoms:
+        fn(g, target_epsg)
+    return time.perf_counter() - t0
+
+
+def main(rows=2000, vertices=64):
+    from georgian_cadastre import cadastre_core as core
+
+    geoms = [core.geometry_from_wkt(_parcel_wkt(i, vertices)) for i in range(rows)]
+    print("{} parcels x {} vertices".format(rows, vertices))
+    for target in (core.ZONE_38N, 3857):
+        core.clear_transform_cache()
+        old = _time(lambda g, t: _old(core, g, t), geoms, target)
+        new = _time(core.project_and_measure, geoms, target)
+        print("EPSG:{:<6} old {:7.3f} s ({:6.0f} rows/s)   "
+              "new {:7.3f} s ({:6.0f} rows/s)   x{:.1f}".format(
+                  target, old, rows / old, new, rows / new, old / new))
+
+
+if __name__ == "__main__":
+    app = QgsApplication([], False)
+    app.initQgis()
+    try:
+        main(*(int(a) for a in sys.argv[1:3]))
+    finally:
+        app.exitQgis()
@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+"""Local stand-in for the public cadastre service, for load tests.
+
+Serves the three endpoints napr_client talks to, on the same paths:
+
+  * POST /map/portal/search      -> search JSON (code -> lbl)
+  * GET  /lr/bo/mg/getinfo.alpha -> features JSON (``res=shp``) or HTML card
+  * GET  /lr/bo/mg/getinfo2      -> nearest-parcels payload
+
+Recorded responses are served verbatim when present under the fixtures
+folder: ``search/<code>.json``, ``features/<lbl>.json``, ``info/<lbl>.html``
+(``:`` in an lbl written as ``_``) and ``getinfo2_*.json`` (rotated by
+coordinate). Anything not recorded is synthesized deterministically, so any
+list of codes works. Quirks are configurable: per-request latency + jitter,
+an error rate (HTTP 503) and a malformed rate (truncated JSON for search /
+features, unescaped quotes in getinfo2 as the real service does). Connections
+are HTTP/1.1 keep-alive. ``GET /__stats`` returns request counters.
+
+Point the client at it with ``napr_client.set_base_url(server.url)``::
+
+    python benchmarks/replay_server.py --port 8765 --latency 60 --error-rate 0.02
+
+Pure standard library.
+"""
+import argparse
+import glob
+import json
+import math
+import os
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+SEARCH_PATH = "/map/portal/search"
+GETINFO_PATH = "/lr/bo/mg/getinfo.alpha"
+GETINFO2_PATH = "/lr/bo/mg/getinfo2"
+
+# Codes with this prefix are "not registered": search returns no result.
+MISSING_PREFIX = "00."
+
+
+class ReplayServer:
+    """Threaded replay server. ``latency`` / ``jitter`` are seconds; rates are
+    probabilities per request. Use as a context manager or start()/stop()."""
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0,
+                 error_rate=0.0, malformed_rate=0.0, seed=None,
+                 fixtures=FIXTURES, vertices=24, card_bytes=30000):
+        self.latency = float(latency)
+        self.jitter = float(jitter)
+        self.error_rate = float(error_rate)
+        self.malformed_rate = float(malformed_rate)
+        self.fixtures = fixtures
+        self.vertices = max(4, int(vertices))
+        self.card_bytes = int(card_bytes)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._getinfo2 = [_read(p) for p in
+                          sorted(glob.glob(os.path.join(fixtures, "getinfo2_*.json")))]
+        self.counters = {"requests": 0, "search": 0, "features": 0, "info": 0,
+                         "getinfo2": 0, "errors": 0, "malformed": 0}
+        self._httpd = ThreadingHTTPServer((host, port), _handler_for(self))
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return "http://{}:{}".format(host, port)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever,
+                                        name="replay-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ------------------------------------------------------------ internals
+    def _roll(self):
+        """Per-request dice: (delay seconds, fail?, malformed?)."""
+        with self._lock:
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+            fail = self._rng.random() < self.error_rate
+            bad = self._rng.random() < self.malformed_rate
+        return delay, fail, bad
+
+    def _count(self, *names):
+        with self._lock:
+            for name in names:
+                self.counters[name] += 1
+
+    def _recorded(self, kind, key, ext):
+        path = os.path.join(self.fixtures, kind, key.replace(":", "_") + ext)
+        return _read(path) if os.path.isfile(path) else None
+
+    def search_body(self, code):
+        body = self._recorded("search", code, ".json")
+        if body is not None:
+            return body
+        result = []
+        if code and not code.startswith(MISSING_PREFIX):
+            result.append({
+                "name": code,
+                "descript": u"ქ. თბილისი, ნაკვეთი {}".format(code),
+                "resultlink": "{}?lbl={}&lang=ka".format(GETINFO_PATH,
+                                                        lbl_for(code)),
+            })
+        return json.dumps({"result": result}, ensure_ascii=False)
+
+    def features_body(self, lbl):
+        body = self._recorded("features", lbl, ".json")
+        if body is not None:
+            return body
+        return json.dumps({"data": [{
+            "id": _lbl_number(lbl), "name": lbl, "proj": "EPSG:4326",
+            "shape": _parcel_wkt(lbl, self.vertices),
+        }]})
+
+    def info_body(self, lbl):
+        body = self._recorded("info", lbl, ".html")
+        if body is not None:
+            return body
+        n = _lbl_number(lbl)
+        head = (u"<html><body><table>"
+                u"<tr><td>საკადასტრო კოდი</td><td>01.10.{:03d}.{:03d}</td></tr>"
+                u"<tr><td>ფართობი</td><td>{} კვ.მ</td></tr>"
+                u"<tr><td>ნაკვეთის ტიპი</td><td>არასასოფლო-სამეურნეო</td></tr>"
+                u"<tr><td>მისამართი</td><td>ქ. თბილისი</td></tr>"
+                u"<tr><td>სტატუსი</td><td>რეგისტრირებულია</td></tr>").format(
+                    n % 1000, n // 1000 % 1000, 200 + n % 5000)
+        row = u"<tr><td>ისტორია</td><td>ჩანაწერი</td></tr>"
+        pad = row * max(0, (self.card_bytes - len(head.encode("utf-8")))
+                        // len(row.encode("utf-8")))
+        return head + pad + u"</table></body></html>"
+
+    def getinfo2_body(self, lon, lat, malformed):
+        if self._getinfo2:
+            idx = zlib.crc32("{:.5f},{:.5f}".format(lon, lat).encode()) \
+                % len(self._getinfo2)
+            body = self._getinfo2[idx]
+        else:
+            body = json.dumps({"result": []})
+        if malformed:
+            # The real service's quirk: unescaped quotes inside descript.
+            body = body.replace(u'"descript":"', u'"descript":"შპს "ალფა" ', 3)
+        return body
+
+
+def lbl_for(code):
+    """Deterministic fake label id for a code (same code -> same lbl)."""
+    return "lr_parcels:{}".format(
+        1000000 + zlib.crc32(code.encode("utf-8")) % 9000000)
+
+
+def _lbl_number(lbl):
+    tail = lbl.rsplit(":", 1)[-1]
+    return int(tail) if tail.isdigit() else zlib.crc32(lbl.encode("utf-8"))
+
+
+def _parcel_wkt(lbl, vertices):
+    """A small closed polygon in Georgia, placed by the lbl number."""
+    n = _lbl_number(lbl)
+    lon = 41.6 + (n % 1000) * 0.006
+    lat = 41.2 + (n // 1000 % 200) * 0.005
+    ring = ["{:.7f} {:.7f}".format(
+        lon + 0.0003 * math.cos(2 * math.pi * k / vertices),
+        lat + 0.0002 * math.sin(2 * math.pi * k / vertices))
+        for k in range(vertices)]
+    ring.append(ring[0])
+    return "POLYGON(({}))".format(",".join(ring))
+
+
+def _read(path):
+    with open(path, encoding="utf-8") as fh:
+        return fh.read()
+
+
+def _handler_for(server):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out in separate writes; with Nagle on, delayed
+        # ACKs would add ~40 ms to every keep-alive response.
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+            if parts.path == "/__stats":
+                return self._send(200, json.dumps(server.stats()), "application/json")
+            if parts.path == GETINFO_PATH:
+                lbl = query.get("lbl", "")
+                if query.get("res") == "shp":
+                    return self._serve("features", lambda bad: server.features_body(lbl),
+                                       "application/json", truncate=True)
+                return self._serve("info", lambda bad: server.info_body(lbl),
+                                   "text/html; charset=utf-8")
+            if parts.path == GETINFO2_PATH:
+                lon = float(query.get("LON", 0) or 0)
+                lat = float(query.get("LAT", 0) or 0)
+                return self._serve(
+                    "getinfo2", lambda bad: server.getinfo2_body(lon, lat, bad),
+                    "application/json")
+            self._send(404, "not found", "text/plain")
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            form = parse_qs(self.rfile.read(length).decode("utf-8"))
+            if urlsplit(self.path).path != SEARCH_PATH:
+                return self._send(404, "not found", "text/plain")
+            code = (form.get("keyword") or [""])[-1].strip()
+            self._serve("search", lambda bad: server.search_body(code),
+                        "application/json", truncate=True)
+
+        def _serve(self, kind, make, ctype, truncate=False):
+            delay, fail, bad = server._roll()
+            if delay > 0:
+                time.sleep(delay)
+            if fail:
+                server._count("requests", kind, "errors")
+                return self._send(503, "Service Unavailable", "text/plain")
+            body = make(bad)
+            if bad:
+                server._count("malformed")
+                if truncate:
+                    body = body[:max(1, len(body) // 2)]
+            server._count("requests", kind)
+            self._send(200, body, ctype)
+
+        def _send(self, status, body, ctype):
+            raw = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def log_message(self, fmt, *args):
+            pass
+
+    return Handler
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=0.0, help="ms per request")
+    ap.add_argument("--jitter", type=float, default=0.0, help="extra ms, uniform")
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--malformed-rate", type=float, default=0.0)
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--fixtures", default=FIXTURES)
+    args = ap.parse_args(argv)
+    server = ReplayServer(args.host, args.port, args.latency / 1000.0,
+                          args.jitter / 1000.0, args.error_rate,
+                          args.malformed_rate, args.seed, args.fixtures)
+    print("replaying cadastre service on {}".format(server.url))
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
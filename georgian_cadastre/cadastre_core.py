@@ -1,9 +1,13 @@
 # -*- coding: utf-8 -*-
-"""QGIS glue: WKT (EPSG:4326) -> reprojected layer, and export to SHP/DXF/CSV.
+"""QGIS glue: WKT (EPSG:4326) -> reprojected layer, and export to SHP/DXF/GPKG/FGB/CSV.
 
 This is the "last mile" only. All heavy lifting (CRS transforms, format
 writers, area measurement) is QGIS core — we never reimplement it.
 """
+import os
+import sqlite3
+import threading
+
 from qgis.core import (
     QgsCoordinateReferenceSystem,
     QgsCoordinateTransform,
@@ -15,10 +19,11 @@ from qgis.core import (
     QgsProject,
     QgsVectorFileWriter,
     QgsVectorLayer,
-    QgsWkbTypes,
 )
 from qgis.PyQt.QtCore import QVariant
 
+from .napr_geom import unpack
+
 WGS84 = QgsCoordinateReferenceSystem("EPSG:4326")
 
 # UTM zones used across Georgia. The cadastre service uses exactly these two.
@@ -48,17 +53,60 @@ def geometry_from_wkt(wkt):
     return geom
 
 
+def geometry_from_row(row):
+    """QgsGeometry (EPSG:4326) for a napr_client feature row.
+
+    Compact rows are rebuilt straight from their WKB; older rows (or geometry
+    the WKB codec rejected) fall back to WKT."""
+    if "wkb" not in row:
+        return geometry_from_wkt(row["wkt"])
+    geom = QgsGeometry()
+    geom.fromWkb(unpack(row["wkb"]))
+    if geom.isEmpty():
+        raise ValueError("Could not parse geometry WKB.")
+    return geom
+
+
 def _crs(epsg):
     return QgsCoordinateReferenceSystem("EPSG:{}".format(int(epsg)))
 
 
+# Building a QgsCoordinateTransform (CRS lookup + PROJ pipeline) costs far more
+# than applying it, so keep one per (src, dst) pair. Per thread: transform
+# objects are not meant to be shared across threads. Clearing bumps a
+# generation every thread's cache is checked against, so worker threads drop
+# theirs too, on their next lookup.
+_TRANSFORMS = threading.local()
+_TRANSFORM_GEN = 0
+
+
+def transformer(src_epsg, dst_epsg):
+    """Cached QgsCoordinateTransform for an EPSG pair (current thread)."""
+    cache = getattr(_TRANSFORMS, "by_pair", None)
+    if cache is None or _TRANSFORMS.gen != _TRANSFORM_GEN:
+        cache = _TRANSFORMS.by_pair = {}
+        _TRANSFORMS.gen = _TRANSFORM_GEN
+    key = (int(src_epsg), int(dst_epsg))
+    tr = cache.get(key)
+    if tr is None:
+        tr = cache[key] = QgsCoordinateTransform(
+            _crs(key[0]), _crs(key[1]), QgsProject.instance())
+    return tr
+
+
+def clear_transform_cache():
+    """Drop cached transforms in every thread (e.g. after the project's datum
+    settings change)."""
+    global _TRANSFORM_GEN
+    _TRANSFORM_GEN += 1
+
+
 def _transform(geom_wgs84, target_epsg):
     """Return a copy of the geometry transformed from WGS84 to target_epsg."""
     if int(target_epsg) == 4326:
         return QgsGeometry(geom_wgs84)
-    tr = QgsCoordinateTransform(WGS84, _crs(target_epsg), QgsProject.instance())
     g = QgsGeometry(geom_wgs84)
-    g.transform(tr)
+    g.transform(transformer(4326, target_epsg))
     return g
 
 
@@ -73,6 +121,20 @@ def true_area_perimeter(geom_wgs84):
     return g.area(), g.length()
 
 
+def project_and_measure(geom_wgs84, target_epsg):
+    """Output geometry in ``target_epsg`` plus its true area and perimeter.
+
+    Same results as ``_transform`` + ``true_area_perimeter`` but the parcel is
+    reprojected only once when the target is its own UTM zone (the default
+    after auto zone selection); otherwise twice, with cached transforms."""
+    zone = auto_zone_epsg(geom_wgs84)
+    utm = _transform(geom_wgs84, zone)
+    area, perim = utm.area(), utm.length()
+    if int(target_epsg) == zone:
+        return utm, area, perim
+    return _transform(geom_wgs84, target_epsg), area, perim
+
+
 def _fields():
     f = QgsFields()
     f.append(QgsField("cad_code", QVariant.String))
@@ -86,27 +148,25 @@ def _fields():
     return f
 
 
-def build_layer(features, code, address, target_epsg, info=None):
-    """Create an in-memory MultiPolygon layer in the target CRS.
-
-    ``features`` is the list returned by napr_client.fetch_features (each has
-    ``wkt`` in EPSG:4326). ``info`` is the optional non-personal attribute dict
-    from napr_client.fetch_info.
-    """
-    info = info or {}
+def new_layer(name, target_epsg):
+    """An empty in-memory MultiPolygon layer with the parcel fields."""
     crs = _crs(target_epsg)
     layer = QgsVectorLayer(
-        "MultiPolygon?crs={}".format(crs.authid()), code or "parcel", "memory"
+        "MultiPolygon?crs={}".format(crs.authid()), name or "parcel", "memory"
     )
-    dp = layer.dataProvider()
-    dp.addAttributes(_fields().toList())
+    layer.dataProvider().addAttributes(_fields().toList())
     layer.updateFields()
+    return layer
+
 
+def make_features(fields, features, code, address, target_epsg, info=None):
+    """QgsFeatures (not yet added to any layer) for one parcel's rows."""
+    info = info or {}
+    out = []
     for feat_row in features:
-        geom4326 = geometry_from_wkt(feat_row["wkt"])
-        geom = _transform(geom4326, target_epsg)
-        area, perim = true_area_perimeter(geom4326)
-        f = QgsFeature(layer.fields())
+        geom, area, perim = project_and_measure(
+            geometry_from_row(feat_row), target_epsg)
+        f = QgsFeature(fields)
         f.setGeometry(geom)
         f.setAttributes([
             feat_row.get("code") or code,
@@ -118,12 +178,39 @@ def build_layer(features, code, address, target_epsg, info=None):
             info.get("status", ""),
             "public cadastre service",
         ])
-        dp.addFeature(f)
+        out.append(f)
+    return out
+
+
+def build_layer(features, code, address, target_epsg, info=None):
+    """Create an in-memory MultiPolygon layer in the target CRS.
 
+    ``features`` is the list returned by napr_client.fetch_features (each has
+    ``wkt`` in EPSG:4326). ``info`` is the optional non-personal attribute dict
+    from napr_client.fetch_info.
+    """
+    layer = new_layer(code or "parcel", target_epsg)
+    layer.dataProvider().addFeatures(
+        make_features(layer.fields(), features, code, address, target_epsg, info))
     layer.updateExtents()
     return layer
 
 
+def append_results(layer, results, target_epsg):
+    """Bulk-append lookup results (``napr_client.lookup`` dicts) to ``layer``
+    with a single ``addFeatures`` call. Returns the number of features added."""
+    fields = layer.fields()
+    feats = []
+    for d in results:
+        feats.extend(make_features(fields, d["features"], d["code"],
+                                   d["address"], target_epsg, d.get("info")))
+    if feats:
+        layer.dataProvider().addFeatures(feats)
+        layer.updateExtents()
+        layer.triggerRepaint()
+    return len(feats)
+
+
 def add_to_project(layer):
     QgsProject.instance().addMapLayer(layer)
     return layer
@@ -132,84 +219,204 @@ def add_to_project(layer):
 # --------------------------------------------------------------------------- #
 # Export
 # --------------------------------------------------------------------------- #
-_DRIVERS = {"SHP": "ESRI Shapefile", "DXF": "DXF"}
+# CSV export writes through a 64 KiB file buffer, joining this many rows per
+# write call.
+_CSV_BUFFER = 1 << 16
+_CSV_FLUSH_ROWS = 4096
+
+_DRIVERS = {"SHP": "ESRI Shapefile", "DXF": "DXF", "GPKG": "GPKG",
+            "FGB": "FlatGeobuf"}
+EXTENSIONS = {"SHP": "shp", "DXF": "dxf", "CSV": "csv", "GPKG": "gpkg",
+              "FGB": "fgb"}
+
+# Spatial index on write: an R-tree in GeoPackage, the packed Hilbert R-tree
+# in FlatGeobuf (so viewers can range-read the file).
+_LAYER_OPTIONS = {"GPKG": ["SPATIAL_INDEX=YES"], "FGB": ["SPATIAL_INDEX=YES"]}
+
+# Parcel-code columns given an attribute index in GeoPackage exports
+# (cadastre layers use cad_code, the drawing parcel layers LEGAL_DOC).
+_CODE_FIELDS = ("cad_code", "LEGAL_DOC")
+
+# Features handed to the writer per addFeatures call. GPKG output is written
+# inside the writer's own transaction, committed when it closes.
+_WRITE_CHUNK = 1000
+
+
+def _project_context():
+    return QgsProject.instance().transformContext() \
+        if hasattr(QgsProject.instance(), "transformContext") \
+        else QgsCoordinateTransformContext()
+
 
+def export_layer(layer, fmt, path, progress=None, should_stop=None):
+    """Write `layer` to `path` as SHP, DXF, GPKG or FGB. Returns "" on success,
+    else the raw driver message (the caller localizes the prefix)."""
+    return write_layer(layer, layer.fields(), layer.wkbType(), layer.crs(),
+                       fmt, path, progress=progress, should_stop=should_stop,
+                       total=layer.featureCount())
 
-def _geometry_only_clone(layer):
-    """A copy of `layer` with same CRS and geometries but no attribute fields.
-    The OGR DXF writer rejects arbitrary fields; CAD output is geometry anyway.
+
+def write_layer(source, fields, wkb_type, crs, fmt, path, context=None,
+                progress=None, should_stop=None, total=None):
+    """Stream features from ``source`` (a layer or feature source) into a new
+    file, ``_WRITE_CHUNK`` features per write. Same return contract as
+    ``export_layer``, plus ``"err_cancelled"`` (partial output is removed).
+
+    DXF gets geometry only: the OGR DXF writer rejects arbitrary fields and CAD
+    output is geometry anyway. GPKG gets an R-tree plus an index on the parcel
+    code column; FlatGeobuf its packed Hilbert R-tree.
     """
-    wkb = QgsWkbTypes.displayString(layer.wkbType())
-    clone = QgsVectorLayer(
-        "{}?crs={}".format(wkb, layer.crs().authid()), layer.name(), "memory"
-    )
-    dp = clone.dataProvider()
-    for src in layer.getFeatures():
-        f = QgsFeature()
-        f.setGeometry(src.geometry())
-        dp.addFeature(f)
-    clone.updateExtents()
-    return clone
-
-
-def export_layer(layer, fmt, path):
-    """Write `layer` to `path` as SHP or DXF. Returns "" on success, else the
-    raw driver message (the caller localizes the prefix)."""
     fmt = fmt.upper()
     driver = _DRIVERS.get(fmt)
     if driver is None:
         raise ValueError("Unsupported format: {}".format(fmt))
 
-    if fmt == "DXF":
-        layer = _geometry_only_clone(layer)
+    geometry_only = fmt == "DXF"
+    if geometry_only:
+        fields = QgsFields()
+    table = os.path.splitext(os.path.basename(path))[0]
 
     opts = QgsVectorFileWriter.SaveVectorOptions()
     opts.driverName = driver
     opts.fileEncoding = "UTF-8"
-
-    ctx = QgsProject.instance().transformContext() \
-        if hasattr(QgsProject.instance(), "transformContext") \
-        else QgsCoordinateTransformContext()
-
-    err = QgsVectorFileWriter.writeAsVectorFormatV3(layer, path, ctx, opts)
-    code = err[0] if isinstance(err, (tuple, list)) else err
-    if code != QgsVectorFileWriter.NoError:
-        return err[1] if isinstance(err, (tuple, list)) and len(err) > 1 else "?"
+    opts.layerName = table
+    opts.layerOptions = list(_LAYER_OPTIONS.get(fmt, []))
+
+    writer = QgsVectorFileWriter.create(
+        path, fields, wkb_type, crs, context or _project_context(), opts)
+    if writer.hasError() != QgsVectorFileWriter.NoError:
+        return writer.errorMessage() or "?"
+
+    err = _write_chunks(writer, source, fields if geometry_only else None,
+                        progress, should_stop, total)
+    del writer          # closes the file (commits, builds the FGB index)
+    if err == "err_cancelled":
+        _remove_output(path, fmt)
+    elif not err and fmt == "GPKG":
+        _index_code_fields(path, table, fields)
+    return err
+
+
+def _write_chunks(writer, source, geometry_fields, progress, should_stop, total):
+    chunk = []
+    done = 0
+    for feat in source.getFeatures():
+        if should_stop is not None and should_stop():
+            return "err_cancelled"
+        if geometry_fields is not None:
+            bare = QgsFeature(geometry_fields)
+            bare.setGeometry(feat.geometry())
+            feat = bare
+        chunk.append(feat)
+        if len(chunk) >= _WRITE_CHUNK:
+            if not writer.addFeatures(chunk):
+                return writer.errorMessage() or "?"
+            done += len(chunk)
+            chunk = []
+            if progress is not None and total:
+                progress(min(100.0, 100.0 * done / total))
+    if chunk and not writer.addFeatures(chunk):
+        return writer.errorMessage() or "?"
     return ""
 
 
-def export_csv_vertices(layer, path, decimals=3):
+def _index_code_fields(path, table, fields):
+    """Best-effort attribute index on the parcel code column of a GeoPackage."""
+    names = [n for n in _CODE_FIELDS if fields.indexOf(n) >= 0]
+    if not names:
+        return
+    quoted = table.replace('"', '""')
+    try:
+        db = sqlite3.connect(path)
+        try:
+            for name in names:
+                db.execute('CREATE INDEX IF NOT EXISTS "{0}_{1}_idx" '
+                           'ON "{0}" ("{1}")'.format(quoted, name))
+            db.commit()
+        finally:
+            db.close()
+    except sqlite3.Error:
+        pass
+
+
+def _remove_output(path, fmt):
+    stem = os.path.splitext(path)[0]
+    extra = (".shx", ".dbf", ".prj", ".cpg") if fmt == "SHP" else ()
+    for p in (path,) + tuple(stem + e for e in extra):
+        try:
+            os.remove(p)
+        except OSError:
+            pass
+
+
+def export_csv_vertices(layer, path, decimals=3, progress=None,
+                        should_stop=None, total=None):
     """Export polygon vertices as CSV (part,id,X,Y) in the layer's CRS.
 
     Matches webgis.ge's CSV (a plain vertex coordinate list). A ``part`` column
     keeps multi-feature / multi-part parcels separable.
-    """
-    feats = list(layer.getFeatures())
-    if not feats:
-        return "err_empty_layer"
 
-    fmt = u"{{:.{}f}}".format(decimals)
-    lines = ["part,id,X,Y"]
+    Streams: features are read lazily from ``layer`` (a layer or a
+    QgsVectorLayerFeatureSource snapshot) and rows are written in buffered
+    batches, so memory stays flat on very large layers. ``progress(percent)``
+    is reported when ``total`` (feature count) is given; if ``should_stop()``
+    turns true the partial file is removed and ``"err_cancelled"`` returned.
+    """
+    row = u"\n%d,%d,%.{0}f,%.{0}f".format(int(decimals))
+    buf = []
+    fh = None
     part = 1
-    for feat in feats:
-        geom = feat.geometry()
-        rings = []
-        if geom.isMultipart():
-            for poly in geom.asMultiPolygon():
-                rings.extend(poly)
-        else:
-            rings.extend(geom.asPolygon())
-        for ring in rings:
-            n = 1
-            for pt in ring:
-                lines.append(u"{},{},{},{}".format(
-                    part, n, fmt.format(pt.x()), fmt.format(pt.y())))
-                n += 1
-            part += 1
-
+    done = 0
+    last_pct = -1
+    cancelled = False
     try:
-        with open(path, "w", encoding="utf-8", newline="") as fh:
-            fh.write(u"\n".join(lines))
+        for feat in layer.getFeatures():
+            if should_stop is not None and should_stop():
+                cancelled = True
+                break
+            if fh is None:
+                fh = open(path, "w", encoding="utf-8", newline="",
+                          buffering=_CSV_BUFFER)
+                fh.write(u"part,id,X,Y")
+            for ring in _rings(feat.geometry()):
+                n = 1
+                for pt in ring:
+                    buf.append(row % (part, n, pt.x(), pt.y()))
+                    n += 1
+                part += 1
+            if len(buf) >= _CSV_FLUSH_ROWS:
+                fh.write(u"".join(buf))
+                buf.clear()
+            done += 1
+            if progress is not None and total:
+                pct = int(100 * done / total)
+                if pct != last_pct:
+                    last_pct = pct
+                    progress(float(min(pct, 100)))
+        if fh is not None and not cancelled:
+            fh.write(u"".join(buf))
     except OSError as exc:
         return str(exc)
+    finally:
+        if fh is not None:
+            fh.close()
+    if cancelled:
+        if fh is not None:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        return "err_cancelled"
+    if fh is None:
+        return "err_empty_layer"
     return ""
+
+
+def _rings(geom):
+    rings = []
+    if geom.isMultipart():
+        for poly in geom.asMultiPolygon():
+            rings.extend(poly)
+    else:
+        rings.extend(geom.asPolygon())
+    return rings
@@ -1,9 +1,10 @@
 # -*- coding: utf-8 -*-
 """The plugin dialog — bilingual (ka/en), asynchronous.
 
-Single tab : code -> (picker if several) -> add to map / export SHP·DXF·CSV.
+Single tab : code -> (picker if several) -> add to map / export SHP·DXF·CSV·GPKG·FGB.
 Batch tab  : many codes -> one combined layer.
 Reverse    : click the map to resolve the parcel under the cursor.
+Network tab: per-endpoint request / cache statistics (napr_metrics).
 
 All network work runs on background QgsTasks (proxy-aware) so the UI never
 freezes.
@@ -12,6 +13,7 @@ import os
 
 from qgis.core import QgsApplication, QgsSettings
 from qgis.PyQt.QtCore import Qt
+from qgis.PyQt.QtGui import QFontDatabase
 from qgis.PyQt.QtWidgets import (
     QCheckBox,
     QComboBox,
@@ -32,6 +34,8 @@ from qgis.PyQt.QtWidgets import (
 
 from . import cadastre_core as core
 from . import i18n
+from . import napr_client
+from . import napr_metrics
 from . import tasks
 
 
@@ -54,6 +58,9 @@ class CadastreDialog(QDialog):
         self._tasks = []         # keep references so tasks aren't GC'd
         self._map_tool = None
         self._prev_tool = None
+        self._batch_layer = None  # batch results stream into this layer
+        self._prefetch = None     # PrefetchTask warming the picker's matches
+        self._want_lbl = None     # the match whose geometry should be shown
 
         self.setMinimumWidth(460)
         self._build_ui()
@@ -83,6 +90,8 @@ class CadastreDialog(QDialog):
         self.tabs = QTabWidget()
         self.tabs.addTab(self._build_single_tab(), "")
         self.tabs.addTab(self._build_batch_tab(), "")
+        self.tabs.addTab(self._build_stats_tab(), "")
+        self.tabs.currentChanged.connect(self._on_tab_changed)
         root.addWidget(self.tabs)
 
         # shared options
@@ -141,14 +150,20 @@ class CadastreDialog(QDialog):
         self.shp_btn = QPushButton()
         self.dxf_btn = QPushButton()
         self.csv_btn = QPushButton()
+        self.gpkg_btn = QPushButton()
+        self.fgb_btn = QPushButton()
         self.add_btn.clicked.connect(self.on_add_to_map)
         self.shp_btn.clicked.connect(lambda: self.on_export("SHP"))
         self.dxf_btn.clicked.connect(lambda: self.on_export("DXF"))
         self.csv_btn.clicked.connect(lambda: self.on_export("CSV"))
+        self.gpkg_btn.clicked.connect(lambda: self.on_export("GPKG"))
+        self.fgb_btn.clicked.connect(lambda: self.on_export("FGB"))
         grid.addWidget(self.add_btn, 0, 0, 1, 3)
         grid.addWidget(self.shp_btn, 1, 0)
         grid.addWidget(self.dxf_btn, 1, 1)
         grid.addWidget(self.csv_btn, 1, 2)
+        grid.addWidget(self.gpkg_btn, 2, 0)
+        grid.addWidget(self.fgb_btn, 2, 1)
         lay.addWidget(self.abox)
         lay.addStretch(1)
         return w
@@ -172,11 +187,35 @@ class CadastreDialog(QDialog):
         lay.addLayout(row)
         return w
 
+    def _build_stats_tab(self):
+        w = QWidget()
+        lay = QVBoxLayout(w)
+        self.stats_view = QPlainTextEdit()
+        self.stats_view.setReadOnly(True)
+        self.stats_view.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.stats_view.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        lay.addWidget(self.stats_view)
+        row = QHBoxLayout()
+        self.stats_refresh_btn = QPushButton()
+        self.stats_refresh_btn.clicked.connect(self._refresh_stats)
+        self.stats_reset_btn = QPushButton()
+        self.stats_reset_btn.clicked.connect(self.on_stats_reset)
+        row.addWidget(self.stats_refresh_btn)
+        row.addWidget(self.stats_reset_btn)
+        row.addStretch(1)
+        lay.addLayout(row)
+        self.stats_log_check = QCheckBox()
+        self.stats_log_check.setChecked(tasks.log_stats_enabled())
+        self.stats_log_check.toggled.connect(tasks.set_log_stats)
+        lay.addWidget(self.stats_log_check)
+        return w
+
     def _retranslate(self):
         self.setWindowTitle(self._t("window_title"))
         self.lang_lbl.setText(self._t("lang_label"))
         self.tabs.setTabText(0, self._t("tab_single"))
         self.tabs.setTabText(1, self._t("tab_batch"))
+        self.tabs.setTabText(2, self._t("tab_stats"))
         self.code_lbl.setText(self._t("code_label"))
         self.search_btn.setText(self._t("search_btn"))
         self.reverse_btn.setText(self._t("reverse_btn"))
@@ -187,9 +226,14 @@ class CadastreDialog(QDialog):
         self.shp_btn.setText(self._t("shp_btn"))
         self.dxf_btn.setText(self._t("dxf_btn"))
         self.csv_btn.setText(self._t("csv_btn"))
+        self.gpkg_btn.setText(self._t("gpkg_btn"))
+        self.fgb_btn.setText(self._t("fgb_btn"))
         self.batch_lbl.setText(self._t("batch_label"))
         self.batch_file_btn.setText(self._t("batch_from_file"))
         self.batch_run_btn.setText(self._t("batch_run"))
+        self.stats_refresh_btn.setText(self._t("stats_refresh"))
+        self.stats_reset_btn.setText(self._t("stats_reset"))
+        self.stats_log_check.setText(self._t("stats_log"))
         if self._result:
             self._show_result()
         elif not self.status_lbl.text():
@@ -200,7 +244,8 @@ class CadastreDialog(QDialog):
         self._retranslate()
 
     def _set_ready(self, ready):
-        for wgt in (self.add_btn, self.shp_btn, self.dxf_btn, self.csv_btn):
+        for wgt in (self.add_btn, self.shp_btn, self.dxf_btn, self.csv_btn,
+                    self.gpkg_btn, self.fgb_btn):
             wgt.setEnabled(ready)
 
     def _want_info(self):
@@ -214,6 +259,7 @@ class CadastreDialog(QDialog):
 
         def _done():
             self._tasks.remove(task) if task in self._tasks else None
+            self._refresh_stats()
             if task.error is not None:
                 self._show_task_error(task.error)
             else:
@@ -242,6 +288,7 @@ class CadastreDialog(QDialog):
         self._run(tasks.search_task(code), self._on_search_done)
 
     def _reset_single(self):
+        self._cancel_prefetch()
         self._result = None
         self._matches = []
         self.match_combo.blockSignals(True)
@@ -270,6 +317,28 @@ class CadastreDialog(QDialog):
             self.match_combo.blockSignals(False)
             self.info_lbl.setText(self._t("multiple_found", len(self._matches)))
         self._load_match(self._matches[0])
+        self._start_prefetch(self._matches[1:1 + tasks.PREFETCH_TOP])
+
+    def _start_prefetch(self, matches):
+        """Fetch the likely next picks in the background (cache only)."""
+        self._cancel_prefetch()
+        if not matches:
+            return
+        task = tasks.PrefetchTask(matches, self._want_info())
+
+        def _done():
+            if self._prefetch is task:
+                self._prefetch = None
+
+        task.taskCompleted.connect(_done)
+        task.taskTerminated.connect(_done)
+        self._prefetch = task
+        QgsApplication.taskManager().addTask(task)
+
+    def _cancel_prefetch(self):
+        if self._prefetch is not None:
+            self._prefetch.cancel()
+            self._prefetch = None
 
     def _on_match_picked(self, idx):
         if 0 <= idx < len(self._matches):
@@ -277,11 +346,18 @@ class CadastreDialog(QDialog):
 
     def _load_match(self, match):
         self._set_ready(False)
+        self._want_lbl = match["lbl"]
+        cached = tasks.cached_match(match, self._want_info())
+        if cached is not None:   # prefetched (or fetched earlier)
+            self._on_features_done(cached)
+            return
         self.info_lbl.setText(self._t("searching"))
         self._run(tasks.features_task(match, self._want_info()),
                   self._on_features_done)
 
     def _on_features_done(self, result):
+        if not result or result.get("lbl") != self._want_lbl:
+            return   # superseded by a later pick (e.g. an instant cached one)
         self._result = result
         self._auto_select_zone()
         self._show_result()
@@ -305,7 +381,7 @@ class CadastreDialog(QDialog):
 
     def _auto_select_zone(self):
         try:
-            geom = core.geometry_from_wkt(self._result["features"][0]["wkt"])
+            geom = core.geometry_from_row(self._result["features"][0])
             epsg = core.auto_zone_epsg(geom)
         except Exception:  # noqa: BLE001
             return
@@ -340,7 +416,7 @@ class CadastreDialog(QDialog):
     def on_export(self, fmt):
         if not self._result:
             return
-        ext = {"SHP": "shp", "DXF": "dxf", "CSV": "csv"}[fmt]
+        ext = core.EXTENSIONS[fmt]
         default_name = "{}.{}".format(self._result["code"].replace(".", "_"), ext)
         path, _ = QFileDialog.getSaveFileName(
             self, self._t("save_title", fmt), default_name,
@@ -351,14 +427,16 @@ class CadastreDialog(QDialog):
         if not path.lower().endswith("." + ext):
             path += "." + ext
         try:
-            layer = self._current_layer()
-            err = core.export_csv_vertices(layer, path) if fmt == "CSV" \
-                else core.export_layer(layer, fmt, path)
+            task = tasks.ExportTask(self._current_layer(), fmt, path)
         except Exception as exc:  # noqa: BLE001
             self._error(str(exc))
             return
+        self._run(task, lambda err: self._export_done(err, path),
+                  busy_msg=self._t("exporting"))
+
+    def _export_done(self, err, path):
         if err:
-            msg = self._t(err) if err == "err_empty_layer" \
+            msg = self._t(err) if err in ("err_empty_layer", "err_cancelled") \
                 else self._t("err_write", err)
             QMessageBox.warning(self, self._t("error_title"), msg)
         else:
@@ -440,36 +518,36 @@ class CadastreDialog(QDialog):
             return
         self.batch_run_btn.setEnabled(False)
         self.status_lbl.setText(self._t("batch_progress", 0, len(codes)))
-        task = tasks.BatchTask(codes, with_info=self._want_info())
+        # Results stream into one layer as they arrive (see _on_batch_chunk).
+        self._batch_layer = None
+        self._batch_epsg = self._target_epsg()
+        self._batch_added = 0
+        task = tasks.BatchTask(codes, with_info=self._want_info(),
+                               workers=tasks.BATCH_WORKERS, stream=True)
+        task.chunkReady.connect(self._on_batch_chunk)
         self._run(task, self._on_batch_done)
 
+    def _on_batch_chunk(self, results):
+        if self._batch_layer is None:
+            self._batch_layer = core.new_layer(self._t("batch_layer_name"),
+                                               self._batch_epsg)
+            core.add_to_project(self._batch_layer)
+        try:
+            self._batch_added += core.append_results(
+                self._batch_layer, [r["data"] for r in results], self._batch_epsg)
+        except Exception as exc:  # noqa: BLE001
+            self.status_lbl.setText(u"⚠ {}".format(exc))
+
     def _on_batch_done(self, results):
         self.batch_run_btn.setEnabled(True)
         results = results or []
         ok = [r for r in results if r.get("ok")]
         fail = [r for r in results if not r.get("ok")]
 
-        if ok:
-            target = self._target_epsg()
-            merged = None
-            for r in ok:
-                d = r["data"]
-                layer = core.build_layer(d["features"], d["code"], d["address"],
-                                         target, info=d.get("info"))
-                if merged is None:
-                    merged = layer
-                    merged.setName(self._t("batch_layer_name"))
-                    merged.startEditing()
-                else:
-                    for feat in layer.getFeatures():
-                        merged.dataProvider().addFeature(feat)
-            if merged is not None:
-                merged.commitChanges()
-                merged.updateExtents()
-                core.add_to_project(merged)
-                if self.iface is not None:
-                    self.iface.mapCanvas().setExtent(merged.extent())
-                    self.iface.mapCanvas().refresh()
+        layer = self._batch_layer
+        if layer is not None and self._batch_added and self.iface is not None:
+            self.iface.mapCanvas().setExtent(layer.extent())
+            self.iface.mapCanvas().refresh()
 
         self.status_lbl.setText(self._t("batch_done", len(ok), len(fail)))
         if fail:
@@ -477,10 +555,27 @@ class CadastreDialog(QDialog):
                                for r in fail)
             QMessageBox.warning(self, self._t("error_title"), detail)
 
+    # --------------------------------------------------------- statistics
+    def _on_tab_changed(self, idx):
+        if self.tabs.widget(idx) is self.stats_view.parentWidget():
+            self._refresh_stats()
+
+    def _refresh_stats(self):
+        idx = napr_client.code_index_stats()
+        self.stats_view.setPlainText(u"{}\n\n{}".format(
+            napr_metrics.format_table(napr_client.endpoint_stats(),
+                                      histogram=True),
+            self._t("stats_index", idx["entries"], idx["hits"], idx["stale"])))
+
+    def on_stats_reset(self):
+        napr_client.reset_endpoint_stats()
+        self._refresh_stats()
+
     # --------------------------------------------------------------- misc
     def _error(self, detail):
         QMessageBox.critical(self, self._t("error_title"), detail)
 
     def closeEvent(self, event):
+        self._cancel_prefetch()
         self._deactivate_tool()
         super().closeEvent(event)
@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""Bounded concurrency + politeness helpers for bulk cadastre work.
+
+Small building blocks the background tasks share:
+
+  * ``TokenBucket`` / ``throttled`` — a global requests-per-second limit that
+    wraps any napr_client fetcher, so every HTTP request (not every lookup)
+    waits for a token. ``shared_bucket()`` is the one bucket every task of the
+    process draws from (``set_rate`` configures it), so running a batch, a
+    prefetch and an area job together does not multiply the rate.
+  * ``capped`` — at most N requests in flight through a fetcher, however many
+    pools share it. ``shared_slots()`` is the process-wide cap, so the pools
+    of several tasks running at once stay under ``MAX_IN_FLIGHT`` together;
+    ``shared(fetch)`` applies both process-wide limits.
+  * ``run_ordered`` — apply a callable to many items on a small thread pool
+    and yield the outcomes back *in input order*, stopping promptly when the
+    caller's ``should_stop()`` turns true.
+  * ``when_up`` — while napr_client's circuit breaker reports the service as
+    down, pause the call (and so the whole pipeline) instead of failing it.
+
+Pure standard library (no QGIS), like napr_client, so it can be exercised from a CLI as well.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from . import napr_client
+from .napr_client import NaprError
+
+
+class Cancelled(NaprError):
+    """Raised inside a worker when the owning task was cancelled. A NaprError
+    so napr_client passes it through instead of wrapping it as a network error."""
+
+    def __init__(self):
+        super().__init__("err_cancelled")
+
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens/second, bursts up to ``burst``.
+    A rate of 0 (or None) lets everything through."""
+
+    def __init__(self, rate, burst=None):
+        self._lock = threading.Lock()
+        self._stamp = time.monotonic()
+        self.set_rate(rate, burst)
+        self._tokens = self.capacity
+
+    def set_rate(self, rate, burst=None):
+        """Change the rate in place; callers already waiting follow it."""
+        with self._lock:
+            self.rate = float(rate or 0.0)
+            self.capacity = float(burst if burst is not None
+                                  else max(1.0, self.rate))
+            self._tokens = min(getattr(self, "_tokens", self.capacity),
+                               self.capacity)
+
+    def _take(self):
+        """Take a token if available; else return seconds until one is."""
+        with self._lock:
+            if self.rate <= 0.0:
+                return 0.0
+            now = time.monotonic()
+            self._tokens = min(self.capacity,
+                               self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return 0.0
+            return (1.0 - self._tokens) / self.rate
+
+    def acquire(self, should_stop=None):
+        """Block until a token is available. Returns False if ``should_stop()``
+        became true while waiting (the token is then not consumed)."""
+        while True:
+            delay = self._take()
+            if delay <= 0.0:
+                return True
+            if should_stop is not None and should_stop():
+                return False
+            time.sleep(min(delay, 0.1))
+
+
+# Requests per second across every task in the process (see set_rate).
+DEFAULT_RATE = 4.0
+_SHARED_BUCKET = TokenBucket(DEFAULT_RATE)
+
+
+def shared_bucket():
+    """The process-wide bucket all tasks throttle through."""
+    return _SHARED_BUCKET
+
+
+def set_rate(rate):
+    """Set the process-wide request rate (requests/second; 0 = unlimited)."""
+    _SHARED_BUCKET.set_rate(rate)
+
+
+# Requests in flight across every task in the process, whatever each task's
+# own worker count (the area download alone may use up to 16).
+MAX_IN_FLIGHT = 16
+_SHARED_SLOTS = threading.BoundedSemaphore(MAX_IN_FLIGHT)
+
+
+def shared_slots():
+    """The process-wide request slots (pass to ``capped``)."""
+    return _SHARED_SLOTS
+
+
+def shared(fetch, should_stop=None):
+    """``fetch`` under both process-wide limits: the shared request slots and
+    the shared rate bucket. Every task builds its fetcher from this."""
+    return capped(throttled(fetch, _SHARED_BUCKET, should_stop),
+                  _SHARED_SLOTS, should_stop)
+
+
+def capped(fetch, slots, should_stop=None):
+    """Wrap a fetcher so at most ``slots`` requests run through it at once
+    (streams hold their slot until closed). ``slots`` is a count, or a
+    semaphore shared with other fetchers (see ``shared_slots``). Raises
+    Cancelled if ``should_stop()`` turns true while waiting for a slot."""
+    if isinstance(slots, int):
+        sem = threading.BoundedSemaphore(max(1, slots))
+    else:
+        sem = slots
+
+    def _take():
+        while not sem.acquire(timeout=0.1):
+            if should_stop is not None and should_stop():
+                raise Cancelled()
+
+    def _fetch(url, data, headers, timeout):
+        _take()
+        try:
+            return fetch(url, data, headers, timeout)
+        finally:
+            sem.release()
+
+    stream = getattr(fetch, "stream", None)
+    if stream is not None:
+        def _stream(url, data, headers, timeout):
+            _take()
+            try:
+                yield from stream(url, data, headers, timeout)
+            finally:
+                sem.release()
+
+        _fetch.stream = _stream
+    return _cancellable(_fetch, fetch, should_stop)
+
+
+def throttled(fetch, bucket, should_stop=None):
+    """Wrap a napr_client fetcher so each request first takes a token
+    (``.stream`` too, before the response starts). Raises Cancelled if
+    ``should_stop()`` turns true while waiting for one."""
+    if bucket is None:
+        return fetch
+
+    def _fetch(url, data, headers, timeout):
+        if not bucket.acquire(should_stop):
+            raise Cancelled()
+        return fetch(url, data, headers, timeout)
+
+    stream = getattr(fetch, "stream", None)
+    if stream is not None:
+        def _stream(url, data, headers, timeout):
+            if not bucket.acquire(should_stop):
+                raise Cancelled()
+            yield from stream(url, data, headers, timeout)
+
+        _fetch.stream = _stream
+    return _cancellable(_fetch, fetch, should_stop)
+
+
+def _cancellable(wrapper, fetch, should_stop):
+    """Expose ``should_stop`` (or the wrapped fetcher's) as
+    ``wrapper.should_stop``, so napr_client's retry backoff ends as soon as
+    the task is cancelled."""
+    should_stop = should_stop or getattr(fetch, "should_stop", None)
+    if should_stop is not None:
+        wrapper.should_stop = should_stop
+    return wrapper
+
+
+def when_up(fn, should_stop=None):
+    """Wrap ``fn`` so ``err_service_down`` waits for the circuit to close and
+    retries, rather than dropping the item. Raises Cancelled if the task is
+    cancelled while waiting."""
+
+    def _call(*args, **kwargs):
+        while True:
+            try:
+                return fn(*args, **kwargs)
+            except NaprError as exc:
+                if exc.key != "err_service_down":
+                    raise
+            if not napr_client.wait_for_service(should_stop):
+                raise Cancelled()
+
+    return _call
+
+
+def run_ordered(fn, items, workers=1, should_stop=None):
+    """Yield ``(index, item, ok, value)`` for ``fn(item)`` in input order.
+
+    ``value`` is the return value, or the exception when ``ok`` is False. At
+    most ``workers`` calls run at once; a few more are queued ahead so a slow
+    item does not idle the pool. With ``workers <= 1`` everything runs inline
+    on the calling thread (no pool). Once ``should_stop()`` is true iteration
+    ends at the first item that has not finished yet; queued calls are dropped
+    and running ones are abandoned after their current request.
+    """
+    items = list(items)
+    stop = should_stop or (lambda: False)
+    workers = max(1, int(workers or 1))
+
+    if workers == 1:
+        for i, item in enumerate(items):
+            if stop():
+                return
+            try:
+                value = fn(item)
+            except Cancelled:
+                return
+            except Exception as exc:  # noqa: BLE001 — reported per item
+                yield i, item, False, exc
+            else:
+                yield i, item, True, value
+        return
+
+    def _call(item):
+        if stop():
+            raise Cancelled()
+        return fn(item)
+
+    window = workers * 2
+    pool = ThreadPoolExecutor(max_workers=workers,
+                              thread_name_prefix="georgian-cadastre")
+    pending = {}
+    nxt = 0
+    try:
+        for i, item in enumerate(items):
+            while nxt < len(items) and nxt - i < window:
+                pending[nxt] = pool.submit(_call, items[nxt])
+                nxt += 1
+            fut = pending.pop(i)
+            while not wait([fut], timeout=0.1).done:
+                if stop():
+                    return
+            exc = fut.exception()
+            if isinstance(exc, Cancelled):
+                return
+            if exc is not None:
+                yield i, item, False, exc
+            else:
+                yield i, item, True, fut.result()
+    finally:
+        for fut in pending.values():
+            fut.cancel()
+        pool.shutdown(wait=False)
@@ -6,14 +6,45 @@ Strategy: sample a grid of points across the target area, reverse-lookup each
 point on the public cadastre service (proxy-aware, off the GUI thread), union the results
 by parcel, then fetch each unique parcel's geometry. Progress is reported the
 whole way so the UI never appears frozen.
+
+Sampling modes: the uniform ``extent_grid`` / ``circle_grid`` (every point is
+a request), or ``AdaptiveSampler`` — a quadtree that starts with a few coarse
+cells and splits only those whose reverse lookup still finds new parcels, so
+empty fields and large agricultural parcels cost a handful of requests.
+On a grid, ``skip_covered`` fetches each new parcel's geometry right away and
+skips the remaining points that fall inside one already fetched.
+
+The two phases overlap: every parcel the reverse lookups discover is queued
+for its geometry request at once, so polygons reach the map (in chunks of
+``CHUNK``) while sampling is still going on.
+
+Grids larger than ``MAX_POINTS`` are neither thinned nor widened: an
+``AreaGrid`` keeps the requested step and is cut into tiles (``tile_grid``)
+that the task generates and works through one at a time, as a queue of
+sub-jobs sharing one set of parcels, with overall progress and an ETA.
+
+With an ``area_journal.AreaJournal`` every finished lookup and parcel is
+checkpointed to disk; a task given a loaded journal skips that work.
 """
 
+import math
+import threading
 import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
+try:
+    import numpy as np
+except ImportError:  # the grids fall back to plain Python lists
+    np = None
+
+from qgis.PyQt.QtCore import pyqtSignal
 from qgis.core import (
     QgsTask,
-    QgsGeometry,
     QgsFeature,
+    QgsPointXY,
+    QgsRectangle,
+    QgsSpatialIndex,
     QgsVectorLayer,
     QgsCoordinateReferenceSystem,
     QgsCoordinateTransform,
@@ -24,58 +55,274 @@ from . import config
 from . import crs as crs_mod
 from . import styles as styles_mod
 from . import templates as tpl_mod
+from ... import concurrency
 from ... import napr_client
+from ... import napr_metrics
+from ... import tasks as napr_tasks
+from ...cadastre_core import geometry_from_row, transformer
+from ...napr_geom import copy_geometry
 from ...qgis_net import qgis_fetch
 
 WGS84 = "EPSG:4326"
 
-# Safety cap so an over-large area can't spawn thousands of requests silently.
+# Points per tile: larger grids run as several sub-jobs (see AreaGrid).
 MAX_POINTS = 500
+# Probe budget of one adaptive (quadtree) job.
+MAX_TILED_POINTS = 50000
+
+# Parcels per chunkReady emission when streaming results to the GUI.
+CHUNK = 25
 
 
 # --------------------------------------------------------------------------- #
-# Grid helpers (pure, projected metres) — testable without QGIS GUI.
+# Grid helpers (pure, projected metres) — testable without QGIS GUI. NumPy
+# builds the lattice when QGIS ships it; the results are the same without.
 # --------------------------------------------------------------------------- #
+def _count(span, step):
+    """Lattice points along ``span`` metres at ``step`` spacing."""
+    return max(0, int((span + 1e-6) / step) + 1)
+
+
+def _lattice(x0, y0, step, i0, i1, j0, j1, circle=None):
+    """Points (x0 + i*step, y0 + j*step), i in [i0, i1), j in [j0, j1), row
+    by row; only those inside ``circle`` (cx, cy, r) when given."""
+    if np is not None:
+        xs, ys = np.meshgrid(x0 + step * np.arange(i0, i1, dtype=float),
+                             y0 + step * np.arange(j0, j1, dtype=float))
+        xs, ys = xs.ravel(), ys.ravel()
+        if circle is not None:
+            cx, cy, r = circle
+            keep = (xs - cx) ** 2 + (ys - cy) ** 2 <= r * r
+            xs, ys = xs[keep], ys[keep]
+        return list(zip(xs.tolist(), ys.tolist()))
+    pts = [(x0 + i * step, y0 + j * step)
+           for j in range(j0, j1) for i in range(i0, i1)]
+    if circle is not None:
+        cx, cy, r = circle
+        pts = [(x, y) for x, y in pts if (x - cx) ** 2 + (y - cy) ** 2 <= r * r]
+    return pts
+
+
 def extent_grid(xmin, ymin, xmax, ymax, step):
     """Grid of (x, y) points covering an extent, spacing = step (metres)."""
     step = max(float(step), 1.0)
-    pts = []
-    y = ymin
-    while y <= ymax + 1e-6:
-        x = xmin
-        while x <= xmax + 1e-6:
-            pts.append((x, y))
-            x += step
-        y += step
-    return pts
+    return _lattice(xmin, ymin, step, 0, _count(xmax - xmin, step),
+                    0, _count(ymax - ymin, step))
 
 
 def circle_grid(cx, cy, radius, step):
     """Grid of (x, y) points inside a circle (centre cx,cy, radius m)."""
     step = max(float(step), 1.0)
-    pts = [(cx, cy)]
-    r2 = radius * radius
-    y = cy - radius
-    while y <= cy + radius + 1e-6:
-        x = cx - radius
-        while x <= cx + radius + 1e-6:
-            if (x - cx) ** 2 + (y - cy) ** 2 <= r2:
-                pts.append((x, y))
-            x += step
-        y += step
-    return pts
+    n = _count(2 * radius, step)
+    return [(cx, cy)] + _lattice(cx - radius, cy - radius, step, 0, n, 0, n,
+                                 circle=(cx, cy, radius))
 
 
-def cap_points(points):
-    """Return (points, dropped) after applying MAX_POINTS by even sampling."""
+def cap_points(points, limit=MAX_POINTS):
+    """Return (points, dropped) after applying ``limit`` by even sampling."""
     n = len(points)
-    if n <= MAX_POINTS:
+    if n <= limit:
         return points, 0
-    keep_every = n / float(MAX_POINTS)
-    sampled = [points[int(i * keep_every)] for i in range(MAX_POINTS)]
+    keep_every = n / float(limit)
+    sampled = [points[int(i * keep_every)] for i in range(limit)]
     return sampled, n - len(sampled)
 
 
+def _tile_blocks(xmin, ymin, xmax, ymax, step, circle=None, tile=MAX_POINTS):
+    """Lattice index ranges (i0, i1, j0, j1) of the square tiles of at most
+    ``tile`` points that cover the grid (only those touching ``circle``),
+    row of tiles by row, plus the lattice origin. Nothing is generated."""
+    if circle is not None:
+        cx, cy, r = circle
+        xmin, ymin, xmax, ymax = cx - r, cy - r, cx + r, cy + r
+    nx, ny = _count(xmax - xmin, step), _count(ymax - ymin, step)
+    side = max(1, int(math.sqrt(tile)))
+    blocks = []
+    for tj in range(0, ny, side):
+        for ti in range(0, nx, side):
+            i1, j1 = min(ti + side, nx), min(tj + side, ny)
+            if circle is not None:
+                dx = max(xmin + ti * step - cx, 0.0, cx - (xmin + (i1 - 1) * step))
+                dy = max(ymin + tj * step - cy, 0.0, cy - (ymin + (j1 - 1) * step))
+                if dx * dx + dy * dy > r * r:
+                    continue
+            blocks.append((ti, i1, tj, j1))
+    return (xmin, ymin), blocks
+
+
+def tile_grid(xmin, ymin, xmax, ymax, step, circle=None, tile=MAX_POINTS):
+    """The ``extent_grid`` lattice (clipped to ``circle`` = cx, cy, r if
+    given) cut into square tiles of at most ``tile`` points. Yields the
+    tiles one at a time, each a list of (x, y), row of tiles by row; a tile
+    on the circle's edge may hold no point."""
+    step = max(float(step), 1.0)
+    (x0, y0), blocks = _tile_blocks(xmin, ymin, xmax, ymax, step, circle, tile)
+    for i0, i1, j0, j1 in blocks:
+        yield _lattice(x0, y0, step, i0, i1, j0, j1, circle)
+
+
+def grid_size(xmin, ymin, xmax, ymax, step, circle=None):
+    """How many points ``tile_grid`` makes for the same arguments, counted
+    row by row without building them (a point exactly on the circle may be
+    counted differently)."""
+    step = max(float(step), 1.0)
+    if circle is None:
+        return _count(xmax - xmin, step) * _count(ymax - ymin, step)
+    cx, cy, r = circle
+    x0, y0 = cx - r, cy - r
+    n = _count(2 * r, step)
+    total = 0
+    for j in range(n):
+        dy = y0 + j * step - cy
+        if dy * dy > r * r:
+            continue
+        w = math.sqrt(r * r - dy * dy)
+        i0 = max(0, math.ceil((cx - w - x0) / step))
+        i1 = min(n - 1, math.floor((cx + w - x0) / step))
+        total += max(0, i1 - i0 + 1)
+    return total
+
+
+class AreaGrid:
+    """The uniform sampling grid of an area job, described rather than built.
+
+    ``bounds`` (xmin, ymin, xmax, ymax) and ``circle`` (cx, cy, r) are in the
+    northern UTM ``zone``'s metres; points are ``step`` metres apart, at the
+    step the user asked for whatever the area. ``size()`` and
+    ``tile_count()`` are counted without generating a point; ``tiles()``
+    generates one tile at a time, already converted to (lon, lat), so memory
+    stays at one tile however large the grid is. The walk order is fixed, so
+    a point's running index names it in the journal across runs.
+    """
+
+    def __init__(self, bounds, step, zone, circle=None, tile=MAX_POINTS):
+        self.bounds = tuple(float(v) for v in bounds)
+        self.step = max(float(step), 1.0)
+        self.zone = int(zone)
+        self.circle = tuple(float(v) for v in circle) if circle else None
+        self.tile = int(tile)
+
+    def size(self):
+        return grid_size(*self.bounds, self.step, circle=self.circle)
+
+    def tile_count(self):
+        return len(_tile_blocks(*self.bounds, self.step, self.circle,
+                                self.tile)[1])
+
+    def tiles(self):
+        """Yield the tiles as lists of (lon, lat), in walk order."""
+        for tile in tile_grid(*self.bounds, self.step, circle=self.circle,
+                              tile=self.tile):
+            # One closed-form batch conversion, not a transform per point.
+            yield crs_mod.utm_to_wgs84(tile, self.zone)
+
+
+def format_eta(seconds):
+    """``h:mm:ss`` / ``m:ss`` for a duration in seconds."""
+    seconds = int(round(max(seconds, 0)))
+    h, rest = divmod(seconds, 3600)
+    m, s = divmod(rest, 60)
+    return "{}:{:02d}:{:02d}".format(h, m, s) if h else "{}:{:02d}".format(m, s)
+
+
+class AdaptiveSampler:
+    """Quadtree sampling of a projected area (metres, e.g. UTM).
+
+    The area (``bounds`` = xmin, ymin, xmax, ymax, optionally clipped to a
+    ``circle`` = cx, cy, r) is tiled with square cells of ``min_step * 2**k``
+    metres, the smallest such size giving at most ~4 cells across. Each cell
+    is probed once at its centre with a radius covering the whole cell; it is
+    split into four only if that probe returned a parcel not seen before, or
+    as many parcels as the lookup limit (so some may have been cut off).
+    Splitting stops at ``min_step`` — the spacing of the equivalent uniform
+    grid. Cells are visited breadth-first, so hitting ``max_points`` still
+    leaves an even, if coarser, coverage. One breadth-first wave of cells can
+    be probed concurrently; split decisions are still taken in cell order, so
+    the result does not depend on ``workers``.
+    """
+
+    def __init__(self, bounds, min_step, circle=None, max_points=MAX_POINTS):
+        self.bounds = tuple(float(v) for v in bounds)
+        self.min_step = max(float(min_step), 1.0)
+        self.circle = circle
+        self.max_points = max(1, int(max_points))
+        xmin, ymin, xmax, ymax = self.bounds
+        span = max(xmax - xmin, ymax - ymin, self.min_step)
+        size = self.min_step
+        while size * 4 < span:
+            size *= 2
+        self.start_size = size
+
+    def initial_cells(self):
+        """Top-level cells as (x0, y0, size) tuples."""
+        xmin, ymin, xmax, ymax = self.bounds
+        size = self.start_size
+        nx = max(1, int(math.ceil((xmax - xmin) / size - 1e-9)))
+        ny = max(1, int(math.ceil((ymax - ymin) / size - 1e-9)))
+        cells = [(xmin + i * size, ymin + j * size, size)
+                 for j in range(ny) for i in range(nx)]
+        return [c for c in cells if self._wanted(c)]
+
+    def split(self, cell):
+        x0, y0, size = cell
+        half = size / 2.0
+        if half < self.min_step - 1e-6:
+            return []
+        kids = [(x0, y0, half), (x0 + half, y0, half),
+                (x0, y0 + half, half), (x0 + half, y0 + half, half)]
+        return [c for c in kids if self._wanted(c)]
+
+    def _wanted(self, cell):
+        """Does the cell overlap the circle (always true without one)?"""
+        if self.circle is None:
+            return True
+        cx, cy, r = self.circle
+        x0, y0, size = cell
+        dx = max(x0 - cx, 0.0, cx - (x0 + size))
+        dy = max(y0 - cy, 0.0, cy - (y0 + size))
+        return dx * dx + dy * dy <= r * r
+
+    def uniform_points(self):
+        """How many points the uniform grid at ``min_step`` would have."""
+        xmin, ymin, xmax, ymax = self.bounds
+        if self.circle is not None:
+            r = self.circle[2]
+            return int(math.pi * r * r / (self.min_step ** 2)) + 1
+        return ((int((xmax - xmin) / self.min_step) + 1)
+                * (int((ymax - ymin) / self.min_step) + 1))
+
+    def run(self, lookup, judge, should_stop=None, progress=None, workers=1):
+        """Probe the quadtree: ``lookup(x, y, radius)`` (may run on up to
+        ``workers`` threads) returns matches, ``judge(matches) -> split?``
+        (called in order) is True when they hold new parcels or hit the
+        limit. ``progress(done, known)`` follows each probe. Returns
+        (probes, splits); stops early on ``should_stop()`` or after
+        ``max_points`` probes."""
+        stop = should_stop or (lambda: False)
+        queue = deque(self.initial_cells())
+        probes = splits = 0
+
+        def _lookup(cell):
+            x0, y0, size = cell
+            half = size / 2.0
+            return lookup(x0 + half, y0 + half, half * math.sqrt(2.0))
+
+        while queue and probes < self.max_points and not stop():
+            wave = [queue.popleft()
+                    for _ in range(min(len(queue), self.max_points - probes))]
+            for i, cell, ok, matches in concurrency.run_ordered(
+                    _lookup, wave, workers, stop):
+                probes += 1
+                if judge(matches if ok else []):
+                    kids = self.split(cell)
+                    if kids:
+                        splits += 1
+                        queue.extend(kids)
+                if progress is not None:
+                    progress(probes, probes + len(queue) + len(wave) - i - 1)
+        return probes, splits
+
+
 # --------------------------------------------------------------------------- #
 # Result layer
 # --------------------------------------------------------------------------- #
@@ -95,46 +342,109 @@ def ensure_parcels_layer(project, zone, name="cadastre_parcels"):
     return layer
 
 
+class ParcelInserter:
+    """Bulk-insert fetched parcels into one results layer.
+
+    Keeps what ``add_parcels`` would otherwise rebuild per call or per
+    parcel: the set of LEGAL_DOC codes already in the layer (rescanned only
+    when the layer's features or fields changed behind its back), one
+    coordinate transform per source CRS, one area calculator and the field
+    indices.
+    """
+
+    def __init__(self, layer, project):
+        self.layer = layer
+        self._project = project
+        self._dst = layer.crs()
+        self._da = crs_mod.area_calculator(self._dst)
+        self._transforms = {}
+        self._fields = None
+        self._codes = set()
+        self._count = None
+
+    def _sync(self):
+        """Pick up field or feature changes made to the layer meanwhile."""
+        fields = self.layer.fields()
+        if fields != self._fields:
+            self._fields = fields
+            self._code_idx = fields.indexOf("LEGAL_DOC")
+            self._address_idx = fields.indexOf("ADDRESS")
+            self._area_idx = fields.indexOf("Shape_Area")
+            self._count = None
+        count = self.layer.featureCount()
+        if count != self._count:
+            self._codes = (set(self.layer.uniqueValues(self._code_idx))
+                           if self._code_idx >= 0 else set())
+            self._count = count
+
+    def _transform(self, src):
+        """Transform from ``src`` (e.g. "EPSG:4326") or None if it is the
+        layer CRS."""
+        if src not in self._transforms:
+            crs = QgsCoordinateReferenceSystem(src)
+            self._transforms[src] = (
+                None if crs == self._dst
+                else QgsCoordinateTransform(crs, self._dst, self._project))
+        return self._transforms[src]
+
+    def add(self, parcels):
+        """Add ``parcels`` not yet in the layer (by code). Returns how many."""
+        self._sync()
+        feats = []
+        for p in parcels:
+            code = p.get("code", "")
+            if code and code in self._codes:
+                continue
+            try:
+                geom = geometry_from_row(p)
+            except ValueError:
+                continue
+            tr = self._transform(p.get("epsg") or WGS84)
+            if tr is not None:
+                geom.transform(tr)
+            f = QgsFeature(self._fields)
+            f.setGeometry(geom)
+            if self._code_idx >= 0:
+                f.setAttribute(self._code_idx, code)
+            if self._address_idx >= 0:
+                f.setAttribute(self._address_idx, p.get("address", ""))
+            if self._area_idx >= 0:
+                f.setAttribute(self._area_idx, round(
+                    crs_mod.polygon_area_m2(geom, self._dst, da=self._da), 2))
+            feats.append(f)
+            self._codes.add(code)
+        if feats:
+            self.layer.dataProvider().addFeatures(feats)
+            self._count = self.layer.featureCount()
+            self.layer.updateExtents()
+            self.layer.triggerRepaint()
+        return len(feats)
+
+
+# layer id -> ParcelInserter, so streamed chunks share one code index.
+_INSERTERS = {}
+
+
 def add_parcels(project, zone, parcels, name="cadastre_parcels"):
-    """Add fetched parcels (list of {code,address,wkt,epsg}) to the layer.
+    """Add fetched parcels (list of {code,address,wkt|wkb,epsg}) to the layer.
 
     Skips duplicates already present (by LEGAL_DOC). Returns (added, layer).
+    Repeated calls for the same layer reuse its ``ParcelInserter``.
     """
     layer = ensure_parcels_layer(project, zone, name)
-    dst = crs_mod.zone_crs(zone)
-    names = layer.fields().names()
-    existing = set()
-    if "LEGAL_DOC" in names:
-        idx = layer.fields().indexOf("LEGAL_DOC")
-        existing = set(layer.uniqueValues(idx))
-
-    feats = []
-    added_codes = set()
-    for p in parcels:
-        code = p.get("code", "")
-        if code and (code in existing or code in added_codes):
-            continue
-        geom = QgsGeometry.fromWkt(p["wkt"])
-        if geom is None or geom.isEmpty():
-            continue
-        src = QgsCoordinateReferenceSystem(p.get("epsg") or WGS84)
-        if src != dst:
-            geom.transform(QgsCoordinateTransform(src, dst, project))
-        f = QgsFeature(layer.fields())
-        f.setGeometry(geom)
-        if "LEGAL_DOC" in names:
-            f["LEGAL_DOC"] = code
-        if "ADDRESS" in names:
-            f["ADDRESS"] = p.get("address", "")
-        if "Shape_Area" in names:
-            f["Shape_Area"] = round(crs_mod.polygon_area_m2(geom, dst), 2)
-        feats.append(f)
-        added_codes.add(code)
-    if feats:
-        layer.dataProvider().addFeatures(feats)
-        layer.updateExtents()
-        layer.triggerRepaint()
-    return len(feats), layer
+    live = project.mapLayers()
+    for layer_id in [k for k in _INSERTERS if k not in live]:
+        del _INSERTERS[layer_id]
+    inserter = _INSERTERS.get(layer.id())
+    if inserter is None:
+        inserter = _INSERTERS[layer.id()] = ParcelInserter(layer, project)
+    return inserter.add(parcels), layer
+
+
+def _covered(index, shapes, pt):
+    """Is the WGS84 point inside any indexed parcel?"""
+    hits = index.intersects(QgsRectangle(pt.x(), pt.y(), pt.x(), pt.y()))
+    return any(shapes[i].contains(pt) for i in hits)
 
 
 # --------------------------------------------------------------------------- #
@@ -143,12 +453,38 @@ def add_parcels(project, zone, parcels, name="cadastre_parcels"):
 class AreaFetchTask(QgsTask):
     """Reverse-lookup a set of WGS84 points, then fetch each unique parcel.
 
-    ``points`` is a list of (lon, lat) in EPSG:4326. ``result`` ends up a list
-    of {code, address, wkt, epsg}. Cancel via the standard QgsTask cancel;
+    ``points`` is a list of (lon, lat) in EPSG:4326. With a ``grid``
+    (AreaGrid) the points are generated tile by tile as the walk reaches
+    them, and with a ``sampler`` (AdaptiveSampler over projected ``epsg``
+    coordinates) probe by probe; ``points`` is then ignored. With
+    ``skip_covered`` (grid points only) reverse and geometry fetching are
+    interleaved and points inside an already fetched parcel are skipped
+    (``stats["skipped"]``; that walk stays sequential). Otherwise the run is
+    a pipeline: ``workers`` reverse lookups produce labels, one tile after
+    the other, and each new one goes onto a queue served by ``workers``
+    geometry fetchers while sampling continues. At most ``workers`` requests are in flight across both pools,
+    and all of them draw from the plugin-wide request-rate bucket
+    (``concurrency.shared_bucket()``); pause/resume holds every worker. Cancel via the standard QgsTask cancel;
     pause/resume via pause()/resume().
+
+    ``result`` ends up a list of {code, address, wkt|wkb, epsg}. With
+    ``stream=True`` rows are not kept there but emitted through
+    ``chunkReady(list)`` every ``chunk`` rows (the last partial chunk on the
+    GUI thread in ``finished``). ``stats`` also reports ``wall_time``,
+    ``time_to_first_parcel`` (seconds) and ``tiles`` / ``tiles_done``;
+    ``eta()`` estimates the seconds left. ``endpoint_stats`` holds the run's
+    per-endpoint request numbers, logged on finish when ``log_stats``.
+
+    ``journal`` (an ``AreaJournal``) checkpoints each finished lookup and
+    parcel, and answers the ones it already holds without a request
+    (``stats["resumed"]``); it is marked done when the run completes.
     """
 
-    def __init__(self, points, per_radius, limit=15):
+    chunkReady = pyqtSignal(list)
+
+    def __init__(self, points, per_radius, limit=15, log_stats=None,
+                 sampler=None, epsg=None, skip_covered=False, workers=1,
+                 stream=False, chunk=CHUNK, journal=None, grid=None):
         super().__init__("Georgian Cadastre: area fetch", QgsTask.CanCancel)
         self._points = points
         self._per_radius = per_radius
@@ -156,7 +492,35 @@ class AreaFetchTask(QgsTask):
         self._paused = False
         self.result = []
         self.error = None
-        self.stats = {"points": len(points), "parcels": 0}
+        self._sampler = sampler
+        self._epsg = epsg
+        self._skip_covered = skip_covered and sampler is None
+        self._workers = max(1, int(workers or 1))
+        self._fetch = qgis_fetch
+        self._stream = stream
+        self._chunk = max(1, int(chunk))
+        self._pending = []
+        self._queue = []
+        self._queued = self._fetched = 0
+        self._started = None
+        self._shown = 0.0
+        self._journal = journal
+        self._grid = grid
+        npts, ntiles = ((grid.size(), grid.tile_count()) if grid is not None
+                        else (len(points), 1))
+        self.stats = {"points": npts, "parcels": 0, "retries": 0,
+                      "wall_time": None, "time_to_first_parcel": None,
+                      "resumed": 0, "tiles": ntiles, "tiles_done": 0}
+        if self._skip_covered:
+            self.stats["skipped"] = 0
+        if sampler is not None:
+            self.stats.update(points=0, splits=0,
+                              grid_points=sampler.uniform_points())
+        self.endpoint_stats = {}
+        self._metrics = napr_metrics.EndpointMetrics()
+        self._stats_lock = threading.Lock()   # pool threads count "resumed"
+        self._log_stats = (napr_tasks.log_stats_enabled() if log_stats is None
+                           else log_stats)
 
     # pause/resume (checked from the worker loop) --------------------------
     def pause(self):
@@ -174,41 +538,277 @@ class AreaFetchTask(QgsTask):
             time.sleep(0.12)
         return self.isCanceled()
 
+    def eta(self):
+        """Estimated seconds left (from the progress so far), or None."""
+        if self._started is None or self.progress() < 1.0:
+            return None
+        elapsed = time.monotonic() - self._started
+        return elapsed * (100.0 - self.progress()) / self.progress()
+
     def run(self):  # worker thread
+        self._started = time.monotonic()
+        ok = False
+        try:
+            ok = self._run()
+            return ok
+        finally:
+            if ok and self._journal is not None:
+                self._journal.finish()
+            self.stats["retries"] = self._metrics.retries()
+            self.endpoint_stats = self._metrics.snapshot()
+            self.stats["wall_time"] = round(time.monotonic() - self._started, 3)
+
+    def finished(self, result):  # GUI thread
+        if self._journal is not None:
+            self._journal.close()
+        if self._pending:
+            chunk, self._pending = self._pending, []
+            self.chunkReady.emit(chunk)
+        if self._log_stats:
+            napr_tasks.log_endpoint_stats(u"{} — {} points, {} parcels".format(
+                self.description(), self.stats["points"], self.stats["parcels"]),
+                self.endpoint_stats)
+
+    def _run(self):
+        # An outage (circuit breaker open) pauses the run instead of silently
+        # dropping the points / parcels that would fail meanwhile.
+        reverse = concurrency.when_up(napr_client.reverse, self.isCanceled)
+        fetch_features = concurrency.when_up(napr_client.fetch_features,
+                                             self.isCanceled)
+        # Reverse and geometry pools each have ``workers`` threads; the cap
+        # keeps their requests in flight at ``workers`` in total.
+        # metered outermost: this task's requests and cache hits only.
+        self._fetch = napr_client.metered(concurrency.capped(
+            concurrency.shared(qgis_fetch, self.isCanceled),
+            self._workers, self.isCanceled), self._metrics)
+        try:
+            if self._skip_covered:
+                return self._run_covering(reverse, fetch_features)
+            return self._run_pipeline(reverse, fetch_features)
+        except Exception as exc:  # noqa: BLE001
+            self.error = exc
+            return False
+
+    def _run_pipeline(self, reverse, fetch_features):
+        """Reverse lookups on this thread's pool (producer), geometry on a
+        second pool fed as labels turn up (consumer)."""
+        seen = {}
+        pool = ThreadPoolExecutor(max_workers=self._workers,
+                                  thread_name_prefix="georgian-cadastre-geom")
+
+        def _geometry(m):
+            if self._blocked():
+                raise concurrency.Cancelled()
+            return self._fetch_parcel(m, fetch_features)
+
+        def _discover(matches):
+            fresh = 0
+            for m in matches:
+                if m["lbl"] not in seen:
+                    seen[m["lbl"]] = m
+                    self._queue.append(pool.submit(_geometry, m))
+                    self._queued += 1
+                    fresh += 1
+            self._collect()
+            return fresh
+
         try:
-            seen = {}
-            npts = len(self._points) or 1
-            for i, (lon, lat) in enumerate(self._points):
+            if self._sampler is not None:
+                if not self._sample_adaptive(reverse, _discover):
+                    return False
+            else:
+                npts = self.stats["points"] or 1
+                for tile in self._tiles():
+                    # One sub-job per tile; the geometry queue and ``seen``
+                    # carry over, so a parcel on a tile edge is fetched once.
+                    for _j, pt, ok, matches in concurrency.run_ordered(
+                            lambda pt: self._reverse(reverse, pt[0], pt[1],
+                                                     self._per_radius, key=pt[2]),
+                            tile, self._workers, self._blocked):
+                        _discover(matches if ok else ())
+                        self._progress(min(1.0, (int(pt[2]) + 1) / npts))
+                    if self.isCanceled():
+                        return False
+                    self.stats["tiles_done"] += 1
+            self._found(seen)
+
+            # Sampling is done: drain the geometry queue.
+            while self._queue:
                 if self._blocked():
                     return False
-                try:
-                    matches = napr_client.reverse(
-                        lon, lat, radius=self._per_radius, limit=self._limit,
-                        fetch=qgis_fetch)
-                except Exception:  # noqa: BLE001 — one bad point shouldn't stop all
-                    matches = []
-                for m in matches:
-                    seen.setdefault(m["lbl"], m)
-                self.setProgress(60.0 * (i + 1) / npts)
-
-            matches = list(seen.values())
-            self.stats["parcels"] = len(matches)
-            nl = len(matches) or 1
-            for j, m in enumerate(matches):
+                wait(self._queue, timeout=0.1, return_when=FIRST_COMPLETED)
+                self._collect()
+                self._progress(1.0)
+            return not self.isCanceled()
+        finally:
+            for fut in self._queue:
+                fut.cancel()
+            pool.shutdown(wait=False)
+
+    def _tiles(self):
+        """Yield the grid tile by tile as lists of (lon, lat, key); ``key``
+        is the point's running index over the whole walk (its journal
+        name). Plain ``points`` are one tile."""
+        tiles = self._grid.tiles() if self._grid is not None else [self._points]
+        start = 0
+        for tile in tiles:
+            yield [(lon, lat, str(i))
+                   for i, (lon, lat) in enumerate(tile, start)]
+            start += len(tile)
+
+    def _collect(self):
+        """Hand on the geometry fetches that have finished (task thread)."""
+        if not any(fut.done() for fut in self._queue):
+            return
+        waiting = []
+        for fut in self._queue:
+            if not fut.done():
+                waiting.append(fut)
+                continue
+            self._fetched += 1
+            if not fut.cancelled() and fut.exception() is None:
+                self._deliver(fut.result())
+        self._queue = waiting
+
+    def _deliver(self, rows):
+        """Rows of one parcel: into ``result`` or the next streamed chunk."""
+        if not rows:
+            return
+        if self.stats["time_to_first_parcel"] is None:
+            self.stats["time_to_first_parcel"] = round(
+                time.monotonic() - self._started, 3)
+        if not self._stream:
+            self.result.extend(rows)
+            return
+        self._pending.extend(rows)
+        if len(self._pending) >= self._chunk:
+            chunk, self._pending = self._pending, []
+            self.chunkReady.emit(chunk)
+
+    def _progress(self, sampled):
+        """60% for sampling (``sampled`` = its done fraction), 40% for the
+        geometry of the parcels found so far; never moves backwards."""
+        fetched = self._fetched / self._queued if self._queued else 1.0
+        self._shown = max(self._shown, 60.0 * sampled + 40.0 * sampled * fetched)
+        self.setProgress(self._shown)
+
+    def _found(self, seen):
+        matches = list(seen.values())
+        self.stats["parcels"] = len(matches)
+        # Later lookups of these codes can skip the search request.
+        napr_client.index_matches(matches)
+        return matches
+
+    def _reverse(self, reverse, lon, lat, radius, key=None):
+        """Matches around one point; ``key`` names the point in the journal."""
+        journal = self._journal if key is not None else None
+        if journal is not None:
+            matches = journal.matches(key)
+            if matches is not None:
+                self._count_resumed()
+                return matches
+        try:
+            matches = reverse(lon, lat, radius=radius, limit=self._limit,
+                              fetch=self._fetch)
+        except concurrency.Cancelled:
+            raise
+        except Exception:  # noqa: BLE001 — one bad point shouldn't stop all
+            return []
+        if journal is not None:
+            journal.record_reverse(key, matches)
+        return matches
+
+    def _count_resumed(self):
+        with self._stats_lock:
+            self.stats["resumed"] += 1
+
+    def _fetch_parcel(self, m, fetch_features):
+        """One match's geometry rows (``[]`` if it could not be fetched)."""
+        if self._journal is not None:
+            rows = self._journal.rows(m["lbl"])
+            if rows is not None:
+                self._count_resumed()
+                return rows
+        try:
+            feats = fetch_features(m["lbl"], fetch=self._fetch)
+        except concurrency.Cancelled:
+            raise
+        except Exception:  # noqa: BLE001
+            return []
+        rows = [copy_geometry(f, {
+            "code": m.get("code", ""),
+            "address": m.get("address", ""),
+            "epsg": f["epsg"],
+        }) for f in feats]
+        if self._journal is not None:
+            self._journal.record_parcel(m["lbl"], rows)
+        return rows
+
+    def _run_covering(self, reverse, fetch_features):
+        """Grid walk with reverse and geometry interleaved. Every fetched
+        parcel goes into a spatial index; a later point inside one of them
+        is skipped — its lookup would mostly return that parcel and the
+        neighbours already found from the points around it.
+
+        Whether a point is skipped depends on every parcel found before it,
+        so this walk is sequential: one request at a time whatever
+        ``workers`` is (the shared rate limit still applies). Tiles are
+        walked in order, one after the other."""
+        seen = {}
+        shapes = []
+        index = QgsSpatialIndex()
+        npts = self.stats["points"] or 1
+        for tile in self._tiles():
+            for lon, lat, key in tile:
                 if self._blocked():
                     return False
-                try:
-                    feats = napr_client.fetch_features(m["lbl"], fetch=qgis_fetch)
-                    for f in feats:
-                        self.result.append({
-                            "code": m.get("code", ""),
-                            "address": m.get("address", ""),
-                            "wkt": f["wkt"], "epsg": f["epsg"],
-                        })
-                except Exception:  # noqa: BLE001
-                    pass
-                self.setProgress(60.0 + 40.0 * (j + 1) / nl)
-            return True
-        except Exception as exc:  # noqa: BLE001
-            self.error = exc
-            return False
+                pt = QgsPointXY(lon, lat)
+                if _covered(index, shapes, pt):
+                    self.stats["skipped"] += 1
+                else:
+                    matches = self._reverse(reverse, lon, lat,
+                                            self._per_radius, key=key)
+                    for m in matches:
+                        if m["lbl"] in seen:
+                            continue
+                        seen[m["lbl"]] = m
+                        rows = self._fetch_parcel(m, fetch_features)
+                        self._deliver(rows)
+                        for row in rows:
+                            if (row.get("epsg") or WGS84) != WGS84:
+                                continue
+                            try:
+                                geom = geometry_from_row(row)
+                            except ValueError:
+                                continue
+                            shapes.append(geom)
+                            index.addFeature(len(shapes) - 1,
+                                             geom.boundingBox())
+                self.setProgress(min(100.0, 100.0 * (int(key) + 1) / npts))
+            self.stats["tiles_done"] += 1
+        self._found(seen)
+        return True
+
+    def _sample_adaptive(self, reverse, discover):
+        """Reverse phase driven by the quadtree sampler (projected -> WGS84
+        per probe); ``discover(matches)`` queues the new parcels and returns
+        how many there were. Returns False if cancelled."""
+
+        def _lookup(x, y, radius):
+            # transformer() is per thread: safe from the pool workers.
+            p = transformer(self._epsg, 4326).transform(QgsPointXY(x, y))
+            return self._reverse(reverse, p.x(), p.y(),
+                                 max(radius, self._per_radius),
+                                 key="{:.2f},{:.2f},{:.2f}".format(x, y, radius))
+
+        def _judge(matches):
+            return discover(matches) > 0 or len(matches) >= self._limit
+
+        def _progress(done, known):
+            # The tree only grows; _progress keeps the bar from moving back.
+            self._progress(done / max(known, 1))
+
+        probes, splits = self._sampler.run(_lookup, _judge, self._blocked,
+                                           _progress, self._workers)
+        self.stats.update(points=probes, splits=splits)
+        return not self.isCanceled()
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""On-disk checkpoint journal for area downloads (JSON lines).
+
+An area job records everything it completes as it goes, one JSON object per
+line, so a cancelled or crashed run can be resumed without repeating work:
+
+    {"job": {...}}                          the parameters to rebuild the task
+    {"rev": "<point key>", "m": [...]}      one finished reverse lookup
+    {"lbl": "<lbl>", "rows": [...]}         one parcel's fetched geometry
+    {"done": true}                          the job ran to completion
+
+On resume AreaFetchTask answers journaled lookups and geometry from here
+instead of the service, so the job walks the same points and finds the same
+parcels, and only the missing requests go out. Lines are appended and flushed
+one at a time; a torn last line (crash mid-write) is ignored on load and cut
+off before appending resumes.
+
+Pure standard library.
+"""
+import base64
+import json
+import os
+import threading
+
+from ...napr_geom import GeomRow
+
+_DONE = {"done": True}
+
+
+def _dumps(entry):
+    return json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+
+
+def _encode_row(row):
+    out = dict(row)
+    if isinstance(out.get("wkb"), bytes):
+        out["wkb"] = base64.b64encode(out["wkb"]).decode("ascii")
+        out["wkb64"] = True
+    return out
+
+
+def _decode_row(row):
+    if row.pop("wkb64", False):
+        row["wkb"] = base64.b64decode(row["wkb"])
+    return GeomRow(row)
+
+
+def _trim_torn_tail(path, block=4096):
+    """Cut the file back to its last newline, so the next entry does not get
+    glued onto a line a crash left half-written."""
+    with open(path, "rb+") as fh:
+        end = fh.seek(0, os.SEEK_END)
+        pos = end
+        while pos > 0:
+            start = max(0, pos - block)
+            fh.seek(start)
+            chunk = fh.read(pos - start)
+            nl = chunk.rfind(b"\n")
+            if nl >= 0:
+                keep = start + nl + 1
+                if keep < end:
+                    fh.truncate(keep)
+                return
+            pos = start
+        fh.truncate(0)
+
+
+class AreaJournal:
+    """Replay state of one area job plus an append handle for new entries.
+    Thread-safe: the task's worker threads record into it concurrently."""
+
+    def __init__(self, path, job, reversed_=None, parcels=None, complete=False):
+        self.path = path
+        self.job = job
+        self.complete = complete
+        self._reversed = reversed_ or {}
+        self._parcels = parcels or {}
+        self._lock = threading.Lock()
+        self._fh = None
+
+    @classmethod
+    def create(cls, path, job):
+        """Start a new journal at ``path`` (replacing any previous one)."""
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        journal = cls(path, job)
+        journal._fh = open(path, "w", encoding="utf-8")
+        journal._write({"job": job})
+        return journal
+
+    @classmethod
+    def load(cls, path):
+        """Read the journal at ``path`` for resuming; ``None`` if there is
+        none or it has no job header."""
+        job, reversed_, parcels, complete = None, {}, {}, False
+        try:
+            with open(path, encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue          # torn write
+                    if "rev" in entry:
+                        reversed_[entry["rev"]] = entry["m"]
+                    elif "lbl" in entry:
+                        parcels[entry["lbl"]] = entry["rows"]
+                    elif "job" in entry:
+                        job = entry["job"]
+                    elif entry.get("done"):
+                        complete = True
+        except OSError:
+            return None
+        if job is None:
+            return None
+        journal = cls(path, job, reversed_, parcels, complete)
+        try:
+            _trim_torn_tail(path)
+            journal._fh = open(path, "a", encoding="utf-8")
+        except OSError:
+            return None
+        return journal
+
+    @staticmethod
+    def pending(path):
+        """Is there an unfinished job at ``path``? Reads only the file's tail."""
+        try:
+            with open(path, "rb") as fh:
+                fh.seek(0, os.SEEK_END)
+                size = fh.tell()
+                if not size:
+                    return False
+                fh.seek(max(0, size - 64))
+                tail = fh.read().decode("utf-8", "ignore").strip()
+        except OSError:
+            return False
+        return not tail.endswith(_dumps(_DONE))
+
+    # -- replay -------------------------------------------------------------
+    def matches(self, key):
+        """Matches of the journaled lookup ``key``, or ``None``."""
+        return self._reversed.get(key)
+
+    def rows(self, lbl):
+        """Journaled geometry rows of ``lbl``, or ``None``."""
+        rows = self._parcels.get(lbl)
+        if rows is None:
+            return None
+        return [_decode_row(dict(r)) for r in rows]
+
+    def stats(self):
+        return {"lookups": len(self._reversed), "parcels": len(self._parcels)}
+
+    # -- record -------------------------------------------------------------
+    def record_reverse(self, key, matches):
+        entry = {"rev": key, "m": [{k: m.get(k) for k in ("code", "lbl", "address")}
+                                   for m in matches]}
+        self._write(entry)
+
+    def record_parcel(self, lbl, rows):
+        self._write({"lbl": lbl, "rows": [_encode_row(r) for r in rows]})
+
+    def finish(self):
+        self.complete = True
+        self._write(_DONE)
+
+    def close(self):
+        with self._lock:
+            if self._fh is not None:
+                try:
+                    self._fh.close()
+                except OSError:
+                    pass
+                self._fh = None
+
+    def _write(self, entry):
+        line = _dumps(entry)
+        with self._lock:
+            if self._fh is None:
+                return
+            try:
+                self._fh.write(line + "\n")
+                self._fh.flush()
+            except OSError:
+                pass   # a full disk costs the checkpoint, not the download
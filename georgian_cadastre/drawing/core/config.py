@@ -40,6 +40,11 @@ ZONES = {
 }
 DEFAULT_ZONE = 38
 
+# Area download: HTTP requests in flight, reverse lookups and geometry fetches
+# together. The requests-per-second limit is plugin-wide (tasks.request_rate).
+# Overridable in Settings.
+AREA_WORKERS = 4
+
 # --------------------------------------------------------------------------- #
 # Template layer schemas.
 # NOTE: shapefile DBF field names are limited to 10 characters — every name
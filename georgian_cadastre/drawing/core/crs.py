@@ -1,6 +1,13 @@
 # -*- coding: utf-8 -*-
 """CRS helpers for UTM zones 37N / 38N."""
 
+import math
+
+try:
+    import numpy as np
+except ImportError:  # utm_to_wgs84 then loops in plain Python
+    np = None
+
 from qgis.core import (
     QgsCoordinateReferenceSystem,
     QgsCoordinateTransform,
@@ -28,15 +35,24 @@ def set_project_crs(zone):
     QgsProject.instance().setCrs(zone_crs(zone))
 
 
-def polygon_area_m2(geometry, layer_crs, zone=None):
+def area_calculator(layer_crs):
+    """A QgsDistanceArea set up for ``layer_crs`` on the project ellipsoid —
+    build one and pass it as ``da`` when measuring many geometries."""
+    da = QgsDistanceArea()
+    da.setSourceCrs(layer_crs, QgsProject.instance().transformContext())
+    da.setEllipsoid(QgsProject.instance().ellipsoid() or "WGS84")
+    return da
+
+
+def polygon_area_m2(geometry, layer_crs, zone=None, da=None):
     """True planimetric area (m²) of a geometry.
 
     Measured with QgsDistanceArea on the ellipsoid so the value is correct
     regardless of the layer's CRS — matches how the service reports official areas.
+    ``da`` (from ``area_calculator(layer_crs)``) is reused instead of a new one.
     """
-    da = QgsDistanceArea()
-    da.setSourceCrs(layer_crs, QgsProject.instance().transformContext())
-    da.setEllipsoid(QgsProject.instance().ellipsoid() or "WGS84")
+    if da is None:
+        da = area_calculator(layer_crs)
     area = da.measureArea(geometry)
     return da.convertAreaMeasurement(area, QgsUnitTypes.AreaSquareMeters)
 
@@ -46,3 +62,59 @@ def transform(geometry, src_crs, dst_crs):
     g = QgsGeometry(geometry)
     g.transform(tr)
     return g
+
+
+# --------------------------------------------------------------------------- #
+# Closed-form UTM -> WGS84 (Krüger series to n⁴, sub-millimetre in a zone).
+# Lets a whole sampling grid be converted at once instead of one
+# QgsCoordinateTransform call per point.
+# --------------------------------------------------------------------------- #
+_A = 6378137.0
+_F = 1 / 298.257223563
+_N = _F / (2 - _F)
+_K0 = 0.9996
+_FALSE_EASTING = 500000.0
+_RECT = _A / (1 + _N) * (1 + _N ** 2 / 4 + _N ** 4 / 64)
+_BETA = (
+    _N / 2 - 2 * _N ** 2 / 3 + 37 * _N ** 3 / 96 - _N ** 4 / 360,
+    _N ** 2 / 48 + _N ** 3 / 15 - 437 * _N ** 4 / 1440,
+    17 * _N ** 3 / 480 - 37 * _N ** 4 / 840,
+    4397 * _N ** 4 / 161280,
+)
+_DELTA = (
+    2 * _N - 2 * _N ** 2 / 3 - 2 * _N ** 3 + 116 * _N ** 4 / 45,
+    7 * _N ** 2 / 3 - 8 * _N ** 3 / 5 - 227 * _N ** 4 / 45,
+    56 * _N ** 3 / 15 - 136 * _N ** 4 / 35,
+    4279 * _N ** 4 / 630,
+)
+
+
+def _utm_inverse(x, y, lon0, m, asin, atan2):
+    """(lon, lat) in degrees. ``m`` is the math module or numpy; ``asin`` /
+    ``atan2`` its spelling of those (they differ between the two)."""
+    xi = y / (_K0 * _RECT)
+    eta = (x - _FALSE_EASTING) / (_K0 * _RECT)
+    xi_, eta_ = xi, eta
+    for j, b in enumerate(_BETA, 1):
+        xi_ = xi_ - b * m.sin(2 * j * xi) * m.cosh(2 * j * eta)
+        eta_ = eta_ - b * m.cos(2 * j * xi) * m.sinh(2 * j * eta)
+    chi = asin(m.sin(xi_) / m.cosh(eta_))
+    lat = chi
+    for j, d in enumerate(_DELTA, 1):
+        lat = lat + d * m.sin(2 * j * chi)
+    return lon0 + m.degrees(atan2(m.sinh(eta_), m.cos(xi_))), m.degrees(lat)
+
+
+def utm_to_wgs84(points, zone):
+    """Convert (x, y) points of a northern UTM ``zone`` to (lon, lat) in
+    one go — vectorised with NumPy when available."""
+    if not points:
+        return []
+    lon0 = int(zone) * 6 - 183.0
+    if np is not None:
+        xy = np.asarray(points, dtype=float)
+        lon, lat = _utm_inverse(xy[:, 0], xy[:, 1], lon0, np,
+                                np.arcsin, np.arctan2)
+        return list(zip(lon.tolist(), lat.tolist()))
+    return [_utm_inverse(x, y, lon0, math, math.asin, math.atan2)
+            for x, y in points]
@@ -2,14 +2,13 @@
 """Drop a cadastre parcel (fetched by cadastral code or map click) into the
 drawing's ``nakveti`` layer.
 
-Reuses the plugin's existing cadastre client (code → WKT in EPSG:4326); this module
+Reuses the plugin's existing cadastre client (code → geometry in EPSG:4326); this module
 only handles the QGIS side: reproject to the chosen UTM zone, create the
 nakveti layer if it is missing, and append the parcel with its code, address
 and computed area.
 """
 
 from qgis.core import (
-    QgsGeometry,
     QgsFeature,
     QgsVectorLayer,
     QgsProject,
@@ -48,9 +47,9 @@ def ensure_nakveti(project, zone):
     return layer
 
 
-def add_parcel(project, zone, wkt, code="", address="", src_epsg=WGS84):
-    """Insert one parcel geometry into nakveti. Returns (area_m2, layer)."""
-    geom = QgsGeometry.fromWkt(wkt)
+def add_parcel(project, zone, geom, code="", address="", src_epsg=WGS84):
+    """Insert one parcel geometry (a QgsGeometry, e.g. from
+    ``cadastre_core.geometry_from_row``) into nakveti. Returns (area_m2, layer)."""
     if geom is None or geom.isEmpty():
         raise ValueError("empty geometry")
     src = QgsCoordinateReferenceSystem(src_epsg)
@@ -78,6 +78,31 @@ STRINGS = {
     "area_running": {"ka": "მიმდინარეობს…", "en": "Running…"},
     "area_done": {"ka": "ჩამოიწერა {n} ნაკვეთი", "en": "Fetched {n} parcels"},
     "area_cancelled": {"ka": "გაუქმდა ({n} ნაკვეთი)", "en": "Cancelled ({n} parcels)"},
+    "sampling": {"ka": "შერჩევა:", "en": "Sampling:"},
+    "sampling_grid": {"ka": "თანაბარი ბადე", "en": "Uniform grid"},
+    "sampling_coverage": {"ka": "ბადე, დაფარული წერტილების გამოტოვებით",
+                          "en": "Grid, skip covered points"},
+    "sampling_coverage_tip": {
+        "ka": "წერტილები მოწმდება თანმიმდევრობით, თითო მოთხოვნა ერთდროულად: "
+              "პარალელური მოთხოვნების პარამეტრი აქ არ მოქმედებს "
+              "(მოთხოვნა/წმ ლიმიტი მოქმედებს).",
+        "en": "Points are checked one after another, one request at a time: "
+              "the parallel-requests setting does not apply here (the "
+              "requests-per-second limit does)."},
+    "sampling_adaptive": {"ka": "ადაპტური (quadtree)", "en": "Adaptive (quadtree)"},
+    "area_requests": {"ka": "— {pts} მოთხოვნა ბადის ~{grid}-ის ნაცვლად",
+                      "en": "— {pts} lookups instead of ~{grid} on the grid"},
+    "area_skipped": {"ka": "— გამოტოვდა {n} / {pts} წერტილი (უკვე დაფარული)",
+                     "en": "— skipped {n} of {pts} points (already covered)"},
+    "area_resume_job": {"ka": "ბოლო დავალების გაგრძელება", "en": "Resume last area job"},
+    "area_no_job": {"ka": "დაუსრულებელი დავალება არ არის.", "en": "There is no unfinished area job."},
+    "area_resuming": {"ka": "გრძელდება: {pts} წერტილი და {n} ნაკვეთი უკვე შენახულია",
+                      "en": "Resuming: {pts} lookups and {n} parcels already saved"},
+    "area_large": {"ka": "{pts} წერტილი {tiles} ფილაში — დაახლ. {eta} მოთხოვნების მიმდინარე ლიმიტით. გავაგრძელოთ? (ბადის უფრო დიდი ბიჯი ნაკლებ წერტილს იძლევა.)",
+                   "en": "{pts} points in {tiles} tiles — about {eta} at the current request limit. Continue? (A larger grid step makes fewer points.)"},
+    "eta": {"ka": "დარჩა", "en": "ETA"},
+    "area_timing": {"ka": "— პირველი ნაკვეთი {first} წმ-ში, სულ {wall} წმ",
+                    "en": "— first parcel after {first} s, {wall} s in total"},
     "need_map": {"ka": "საჭიროა გახსნილი რუკა.", "en": "An open map canvas is required."},
 
     # --- merged single/batch/export -----------------------------------------
@@ -90,12 +115,23 @@ STRINGS = {
     "batch_empty": {"ka": "ჩაწერეთ ერთი მაინც კოდი.", "en": "Enter at least one code."},
     "batch_done": {"ka": "ჩამოიწერა {ok}/{total} კოდი, {n} ნაკვეთი",
                     "en": "Fetched {ok}/{total} codes, {n} parcels"},
-    "export_group": {"ka": "ექსპორტი (SHP / DXF / CSV)", "en": "Export (SHP / DXF / CSV)"},
+    "export_group": {"ka": "ექსპორტი (SHP / DXF / CSV / GPKG / FGB)",
+                     "en": "Export (SHP / DXF / CSV / GPKG / FGB)"},
     "export_layer_lbl": {"ka": "შრე:", "en": "Layer:"},
     "extra_info": {"ka": "დამატებითი ინფო (ფართობი, ტიპი, სტატუსი)",
                     "en": "Extra info (area, type, status)"},
     "no_export_layer": {"ka": "აირჩიე შრე ექსპორტისთვის.", "en": "Pick a layer to export."},
     "saved": {"ka": "შენახულია: {path}", "en": "Saved: {path}"},
+    "exporting": {"ka": "ექსპორტი: {path}…", "en": "Exporting: {path}…"},
+    "export_cancelled": {"ka": "ექსპორტი გაუქმდა.", "en": "Export cancelled."},
+    "stats_group": {"ka": "ქსელის სტატისტიკა (endpoint-ების მიხედვით)",
+                    "en": "Network statistics (per endpoint)"},
+    "stats_refresh": {"ka": "განახლება", "en": "Refresh"},
+    "stats_reset": {"ka": "განულება", "en": "Reset"},
+    "stats_log": {"ka": "ლოგში ჩაწერა ყოველი batch / არეალის ბოლოს",
+                  "en": "Log after every batch / area fetch"},
+    "stats_index": {"ka": "კოდების ინდექსი: {n} კოდი, {hits} მოხვედრა, {stale} მოძველებული",
+                    "en": "Code index: {n} codes, {hits} hits, {stale} stale"},
     "open_codes": {"ka": "კოდების ფაილი (txt/csv)", "en": "Codes file (txt/csv)"},
 
     # --- services tab ------------------------------------------------------
@@ -141,6 +177,11 @@ STRINGS = {
     "auth_id": {"ka": "საიდენტიფიკაციო მონაცემები", "en": "Identification data"},
     "auth_contact": {"ka": "საკონტაქტო ინფორმაცია", "en": "Contact information"},
     "auth_person": {"ka": "უფლებამოსილი პირი", "en": "Authorised person"},
+    "area_workers": {"ka": "ფართობის ჩამოტვირთვა: პარალელური მოთხოვნები",
+                     "en": "Area download: parallel requests"},
+    "request_rate": {"ka": "მოთხოვნა/წმ ყველა ჩამოტვირთვისთვის (ლიმიტი)",
+                     "en": "Requests per second, all downloads (limit)"},
+    "area_rate_off": {"ka": "შეუზღუდავი", "en": "Unlimited"},
     "save": {"ka": "შენახვა", "en": "Save"},
 
     # --- generic messages --------------------------------------------------
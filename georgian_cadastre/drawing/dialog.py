@@ -9,15 +9,16 @@ import os
 import webbrowser
 
 from qgis.PyQt.QtCore import Qt, QDate
+from qgis.PyQt.QtGui import QFontDatabase
 from qgis.PyQt.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QGridLayout,
     QTabWidget, QWidget, QLabel, QPushButton, QLineEdit, QComboBox,
     QFileDialog, QCheckBox, QSpinBox, QDateEdit, QListWidget, QListWidgetItem,
     QTableWidget, QTableWidgetItem, QMessageBox, QApplication, QGroupBox,
-    QRadioButton, QProgressBar, QPlainTextEdit, QScrollArea,
+    QRadioButton, QProgressBar, QPlainTextEdit, QScrollArea, QDoubleSpinBox,
 )
 from qgis.core import (
-    QgsProject, QgsSettings, Qgis, QgsApplication, QgsGeometry,
+    QgsProject, QgsSettings, Qgis, QgsApplication,
     QgsCoordinateReferenceSystem, QgsCoordinateTransform,
 )
 
@@ -34,9 +35,12 @@ from .core import export as export_mod
 from .core import repo_assets as repo_mod
 from .core import fetch as fetch_mod
 from .core import area_fetch as area_mod
+from .core import area_journal
 from .. import napr_client
+from .. import napr_metrics
 from .. import tasks as napr_tasks
 from .. import cadastre_core as napr_core
+from ..napr_geom import copy_geometry
 
 _tr = i18n.tr
 
@@ -294,6 +298,14 @@ class CadastralDialog(QDialog):
         self.step_spin.setSingleStep(5)
         self.step_spin.setValue(40)
         prow.addWidget(self.step_spin)
+        prow.addWidget(QLabel(_tr("sampling")))
+        self.area_sampling = QComboBox()
+        self.area_sampling.addItem(_tr("sampling_grid"), "grid")
+        self.area_sampling.addItem(_tr("sampling_coverage"), "coverage")
+        self.area_sampling.setItemData(1, _tr("sampling_coverage_tip"),
+                                       Qt.ToolTipRole)
+        self.area_sampling.addItem(_tr("sampling_adaptive"), "adaptive")
+        prow.addWidget(self.area_sampling)
         prow.addStretch(1)
         gl.addLayout(prow)
 
@@ -309,16 +321,21 @@ class CadastralDialog(QDialog):
         self.area_pause_btn.clicked.connect(self._on_area_pause)
         self.area_cancel_btn = QPushButton(_tr("cancel"))
         self.area_cancel_btn.clicked.connect(self._on_area_cancel)
+        self.area_resume_btn = QPushButton(_tr("area_resume_job"))
+        self.area_resume_btn.clicked.connect(self._on_area_resume)
         self.area_pause_btn.setEnabled(False)
         self.area_cancel_btn.setEnabled(False)
+        self.area_resume_btn.setEnabled(
+            area_journal.AreaJournal.pending(self._area_journal_path()))
         brow.addWidget(self.area_start_btn)
         brow.addWidget(self.area_pause_btn)
         brow.addWidget(self.area_cancel_btn)
+        brow.addWidget(self.area_resume_btn)
         gl.addLayout(brow)
         gl.addWidget(self._hint(_tr("area_hint")))
         lay.addWidget(gb)
 
-        # --- export (SHP / DXF / CSV) --------------------------------------
+        # --- export (SHP / DXF / CSV / GPKG / FGB) -------------------------
         gb_e = QGroupBox(_tr("export_group"))
         el = QVBoxLayout(gb_e)
         erow = QHBoxLayout()
@@ -331,7 +348,7 @@ class CadastralDialog(QDialog):
         erow.addWidget(btn_ref)
         el.addLayout(erow)
         xrow = QHBoxLayout()
-        for fmt in ("SHP", "DXF", "CSV"):
+        for fmt in ("SHP", "DXF", "CSV", "GPKG", "FGB"):
             b = QPushButton(fmt)
             b.clicked.connect(lambda _=False, f=fmt: self._on_export(f))
             xrow.addWidget(b)
@@ -341,13 +358,50 @@ class CadastralDialog(QDialog):
         lay.addWidget(gb_e)
         self._refresh_export_layers()
 
+        # --- network statistics (per endpoint) -----------------------------
+        gb_n = QGroupBox(_tr("stats_group"))
+        nl = QVBoxLayout(gb_n)
+        self.stats_view = QPlainTextEdit()
+        self.stats_view.setReadOnly(True)
+        self.stats_view.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.stats_view.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        self.stats_view.setMaximumHeight(110)
+        nl.addWidget(self.stats_view)
+        nrow = QHBoxLayout()
+        btn_sref = QPushButton("↻ " + _tr("stats_refresh"))
+        btn_sref.clicked.connect(self._refresh_stats)
+        btn_sreset = QPushButton(_tr("stats_reset"))
+        btn_sreset.clicked.connect(self._on_stats_reset)
+        self.stats_log_cb = QCheckBox(_tr("stats_log"))
+        self.stats_log_cb.setChecked(napr_tasks.log_stats_enabled())
+        self.stats_log_cb.toggled.connect(napr_tasks.set_log_stats)
+        nrow.addWidget(btn_sref)
+        nrow.addWidget(btn_sreset)
+        nrow.addWidget(self.stats_log_cb, 1)
+        nl.addLayout(nrow)
+        lay.addWidget(gb_n)
+        self._refresh_stats()
+
         lay.addStretch(1)
         self._map_tool = None
         self._area_task = None
         self._batch_task = None
+        self._export_task = None
         scroll.setWidget(inner)
         return scroll
 
+    def _refresh_stats(self):
+        if hasattr(self, "stats_view"):
+            idx = napr_client.code_index_stats()
+            self.stats_view.setPlainText("{}\n{}".format(
+                napr_metrics.format_table(napr_client.endpoint_stats()),
+                _tr("stats_index", n=idx["entries"], hits=idx["hits"],
+                    stale=idx["stale"])))
+
+    def _on_stats_reset(self):
+        napr_client.reset_endpoint_stats()
+        self._refresh_stats()
+
     def _fetch_zone(self):
         if hasattr(self, "zone_combo"):
             return self.zone_combo.currentData()
@@ -362,7 +416,8 @@ class CadastralDialog(QDialog):
             if not epsg.upper().startswith("EPSG:"):
                 epsg = "EPSG:" + epsg
             area, layer = fetch_mod.add_parcel(
-                QgsProject.instance(), zone, f["wkt"], code, address, src_epsg=epsg)
+                QgsProject.instance(), zone, napr_core.geometry_from_row(f),
+                code, address, src_epsg=epsg)
         if layer is not None and self.iface is not None:
             self.iface.mapCanvas().setExtent(layer.extent())
             self.iface.mapCanvas().refresh()
@@ -450,9 +505,14 @@ class CadastralDialog(QDialog):
         self._batch_total = len(codes)
         with_info = self.extra_info_cb.isChecked()
         crs_mod.set_project_crs(zone)
-        task = napr_tasks.BatchTask(codes, with_info=with_info)
+        self._batch_added = 0
+        self._batch_layer = None
+        task = napr_tasks.BatchTask(codes, with_info=with_info,
+                                    workers=napr_tasks.BATCH_WORKERS,
+                                    stream=True)
         task.progressChanged.connect(
             lambda p: self.batch_progress.setValue(int(task.progress())))
+        task.chunkReady.connect(self._on_batch_chunk)
         task.taskCompleted.connect(lambda: self._batch_finished(task, False))
         task.taskTerminated.connect(lambda: self._batch_finished(task, True))
         self._batch_task = task
@@ -466,25 +526,31 @@ class CadastralDialog(QDialog):
         if self._batch_task is not None:
             self._batch_task.cancel()
 
-    def _batch_finished(self, task, cancelled):
-        self.batch_run_btn.setEnabled(True)
-        self.batch_cancel_btn.setEnabled(False)
-        self._batch_task = None
-        ok_results = [r for r in (task.result or []) if r.get("ok")]
+    def _on_batch_chunk(self, results):
+        """Append one streamed chunk of batch results to the parcels layer."""
         parcels = []
-        for r in ok_results:
+        for r in results:
             data = r.get("data") or {}
             for f in data.get("features", []):
-                parcels.append({"code": data.get("code", ""),
-                                "address": data.get("address", ""),
-                                "wkt": f["wkt"], "epsg": f["epsg"]})
-        added, layer = area_mod.add_parcels(
+                parcels.append(copy_geometry(f, {"code": data.get("code", ""),
+                                                 "address": data.get("address", ""),
+                                                 "epsg": f["epsg"]}))
+        added, self._batch_layer = area_mod.add_parcels(
             QgsProject.instance(), getattr(self, "_batch_zone", self._fetch_zone()),
             parcels)
+        self._batch_added += added
+
+    def _batch_finished(self, task, cancelled):
+        self.batch_run_btn.setEnabled(True)
+        self.batch_cancel_btn.setEnabled(False)
+        self._batch_task = None
+        ok_results = [r for r in (task.result or []) if r.get("ok")]
+        added, layer = self._batch_added, self._batch_layer
         if self.iface is not None and layer is not None and added:
             self.iface.mapCanvas().setExtent(layer.extent())
             self.iface.mapCanvas().refresh()
         self._refresh_export_layers()
+        self._refresh_stats()
         if not cancelled:
             self.batch_progress.setValue(100)
         self._msg(_tr("batch_done", ok=len(ok_results),
@@ -508,7 +574,9 @@ class CadastralDialog(QDialog):
         layer = QgsProject.instance().mapLayer(layer_id)
         if layer is None:
             return self._msg(_tr("no_export_layer"), Qgis.Warning)
-        ext = {"SHP": "shp", "DXF": "dxf", "CSV": "csv"}[fmt]
+        if self._export_task is not None:
+            return
+        ext = napr_core.EXTENSIONS[fmt]
         path, _ = QFileDialog.getSaveFileName(
             self, fmt, f"{layer.name()}.{ext}", f"{fmt} (*.{ext})")
         if not path:
@@ -516,54 +584,72 @@ class CadastralDialog(QDialog):
         if not path.lower().endswith("." + ext):
             path += "." + ext
         try:
-            err = (napr_core.export_csv_vertices(layer, path) if fmt == "CSV"
-                   else napr_core.export_layer(layer, fmt, path))
+            task = napr_tasks.ExportTask(layer, fmt, path)
         except Exception as exc:  # noqa: BLE001
             return self._error(exc)
+        task.taskCompleted.connect(lambda: self._export_finished(task))
+        task.taskTerminated.connect(lambda: self._export_finished(task))
+        self._export_task = task
+        QgsApplication.taskManager().addTask(task)
+        self._msg(_tr("exporting", path=path))
+
+    def _export_finished(self, task):
+        self._export_task = None
+        if task.error is not None:
+            return self._error(task.error)
+        self._export_done(task.result, task.path)
+
+    def _export_done(self, err, path):
+        if err == "err_cancelled":
+            return self._msg(_tr("export_cancelled"), Qgis.Warning)
         if err:
             return self._msg(f"{_tr('error')}: {err}", Qgis.Critical)
         self._msg(_tr("saved", path=path), Qgis.Success)
 
     # --- area (bulk) fetch ------------------------------------------------
-    def _compute_points(self, zone):
-        """Return (points_4326, per_radius_m, error_key_or_None)."""
-        from qgis.core import QgsPointXY
+    def _compute_region(self, zone):
+        """Return (bounds, circle_or_None, error_key_or_None) in the zone's
+        UTM metres: the code + radius circle, or the map extent."""
         utm = crs_mod.zone_crs(zone)
         wgs = QgsCoordinateReferenceSystem("EPSG:4326")
         proj = QgsProject.instance()
-        to_wgs = QgsCoordinateTransform(utm, wgs, proj)
-        step = self.step_spin.value()
-
         if self.area_mode_radius.isChecked():
             code = self.code_edit.text().strip()
             if not code:
-                return [], step, "no_code"
+                return None, None, "no_code"
             result = napr_client.lookup(code)          # quick single call
-            g = QgsGeometry.fromWkt(result["features"][0]["wkt"])
+            g = napr_core.geometry_from_row(result["features"][0])
             c = g.centroid().asPoint()                 # WGS84
-            to_utm = QgsCoordinateTransform(wgs, utm, proj)
-            cu = to_utm.transform(c)
-            grid = area_mod.circle_grid(cu.x(), cu.y(), self.radius_spin.value(), step)
-        else:
-            if self.iface is None:
-                return [], step, "need_map"
-            canvas = self.iface.mapCanvas()
-            src = canvas.mapSettings().destinationCrs()
-            rect = canvas.extent()
-            if src != utm:
-                rect = QgsCoordinateTransform(src, utm, proj).transformBoundingBox(rect)
-            grid = area_mod.extent_grid(rect.xMinimum(), rect.yMinimum(),
-                                        rect.xMaximum(), rect.yMaximum(), step)
-
-        grid, _dropped = area_mod.cap_points(grid)
-        points = []
-        for x, y in grid:
-            p = to_wgs.transform(QgsPointXY(x, y))
-            points.append((p.x(), p.y()))
-        return points, step, None
+            cu = QgsCoordinateTransform(wgs, utm, proj).transform(c)
+            r = self.radius_spin.value()
+            return ((cu.x() - r, cu.y() - r, cu.x() + r, cu.y() + r),
+                    (cu.x(), cu.y(), r), None)
+        if self.iface is None:
+            return None, None, "need_map"
+        canvas = self.iface.mapCanvas()
+        src = canvas.mapSettings().destinationCrs()
+        rect = canvas.extent()
+        if src != utm:
+            rect = QgsCoordinateTransform(src, utm, proj).transformBoundingBox(rect)
+        return ((rect.xMinimum(), rect.yMinimum(),
+                 rect.xMaximum(), rect.yMaximum()), None, None)
+
+    def _compute_grid(self, zone):
+        """Return (AreaGrid, per_radius_m, error_key_or_None). The grid keeps
+        the chosen step and is only counted here; the task generates its
+        points tile by tile."""
+        step = self.step_spin.value()
+        bounds, circle, err = self._compute_region(zone)
+        if err:
+            return None, step, err
+        return area_mod.AreaGrid(bounds, step, zone, circle), step, None
 
     def _set_area_running(self, running):
+        self.area_progress.setFormat("%p%")
         self.area_start_btn.setEnabled(not running)
+        self.area_resume_btn.setEnabled(
+            not running
+            and area_journal.AreaJournal.pending(self._area_journal_path()))
         self.area_pause_btn.setEnabled(running)
         self.area_cancel_btn.setEnabled(running)
         if not running:
@@ -573,9 +659,14 @@ class CadastralDialog(QDialog):
         if self._area_task is not None:
             return
         zone = self._fetch_zone()
+        adaptive = self.area_sampling.currentData() == "adaptive"
         QApplication.setOverrideCursor(Qt.WaitCursor)
         try:
-            points, per_radius, err = self._compute_points(zone)
+            if adaptive:
+                bounds, circle, err = self._compute_region(zone)
+                per_radius = self.step_spin.value()
+            else:
+                grid, per_radius, err = self._compute_grid(zone)
         except napr_client.NaprError as exc:
             QApplication.restoreOverrideCursor()
             return self._msg(" ".join(str(a) for a in exc.args), Qgis.Warning)
@@ -585,21 +676,96 @@ class CadastralDialog(QDialog):
         QApplication.restoreOverrideCursor()
         if err:
             return self._msg(_tr(err), Qgis.Warning)
-        if not points:
+        if not adaptive and not grid.size():
             return self._msg(_tr("error"), Qgis.Warning)
+        if not adaptive and grid.tile_count() > 1 and not self._confirm_large(grid):
+            return
 
+        job = {"zone": zone, "sampling": self.area_sampling.currentData(),
+               "per_radius": per_radius, "limit": 15}
+        if adaptive:
+            job.update(bounds=list(bounds), circle=circle and list(circle),
+                       epsg=crs_mod.zone_crs(zone).postgisSrid())
+        else:
+            # The grid's description, not its points: resuming rebuilds the
+            # same walk from it.
+            job.update(bounds=list(grid.bounds),
+                       circle=grid.circle and list(grid.circle),
+                       step=grid.step)
+        try:
+            journal = area_journal.AreaJournal.create(self._area_journal_path(), job)
+        except OSError as exc:
+            journal = None
+            self._msg(str(exc), Qgis.Warning)
+        self._start_area_job(job, journal)
+
+    def _confirm_large(self, grid):
+        """Ask before a tiled job, at the chosen step (a smaller job is the
+        user's call: a wider step); the estimate counts reverse lookups
+        only."""
+        _workers, rate = self._area_limits()
+        count = grid.size()
+        eta = area_mod.format_eta(count / rate) if rate else "?"
+        return QMessageBox.question(
+            self, _tr("area_group"),
+            _tr("area_large", pts=count, tiles=grid.tile_count(), eta=eta),
+            QMessageBox.Yes | QMessageBox.No) == QMessageBox.Yes
+
+    def _on_area_progress(self, task):
+        self.area_progress.setValue(int(task.progress()))
+        eta = task.eta()
+        self.area_progress.setFormat(
+            "%p%" if eta is None else f"%p% — {_tr('eta')} {area_mod.format_eta(eta)}")
+
+    def _on_area_resume(self):
+        """Continue the last unfinished area job from its journal."""
+        if self._area_task is not None:
+            return
+        journal = area_journal.AreaJournal.load(self._area_journal_path())
+        if journal is None or journal.complete:
+            self.area_resume_btn.setEnabled(False)
+            return self._msg(_tr("area_no_job"), Qgis.Warning)
+        done = journal.stats()
+        self._start_area_job(journal.job, journal)
+        self._msg(_tr("area_resuming", pts=done["lookups"], n=done["parcels"]))
+
+    def _area_journal_path(self):
+        from ..plugin import profile_data_dir   # plugin imports the dialogs
+        return os.path.join(profile_data_dir(), "area_job.jsonl")
+
+    def _start_area_job(self, job, journal):
+        zone = job["zone"]
         crs_mod.set_project_crs(zone)
-        task = area_mod.AreaFetchTask(points, per_radius=per_radius, limit=15)
+        workers, _rate = self._area_limits()
+        if job["sampling"] == "adaptive":
+            sampler = area_mod.AdaptiveSampler(
+                job["bounds"], job["per_radius"], job["circle"],
+                max_points=area_mod.MAX_TILED_POINTS)
+            task = area_mod.AreaFetchTask(
+                [], per_radius=job["per_radius"], limit=job["limit"],
+                sampler=sampler, epsg=job["epsg"], workers=workers,
+                stream=True, journal=journal)
+            running = f"{_tr('area_running')} ({_tr('sampling_adaptive')})"
+        else:
+            grid = area_mod.AreaGrid(job["bounds"], job["step"], zone,
+                                     job["circle"])
+            task = area_mod.AreaFetchTask(
+                [], per_radius=job["per_radius"], limit=job["limit"],
+                skip_covered=job["sampling"] == "coverage",
+                workers=workers, stream=True, journal=journal, grid=grid)
+            running = f"{_tr('area_running')} ({task.stats['points']} pts)"
         self._area_zone = zone
-        task.progressChanged.connect(
-            lambda p: self.area_progress.setValue(int(task.progress())))
+        self._area_added = 0
+        self._area_layer = None
+        task.progressChanged.connect(lambda p: self._on_area_progress(task))
+        task.chunkReady.connect(self._on_area_chunk)
         task.taskCompleted.connect(lambda: self._area_finished(task, False))
         task.taskTerminated.connect(lambda: self._area_finished(task, True))
         self._area_task = task
         self.area_progress.setValue(0)
         self._set_area_running(True)
         QgsApplication.taskManager().addTask(task)
-        self._msg(f"{_tr('area_running')} ({len(points)} pts)")
+        self._msg(running)
 
     def _on_area_pause(self):
         task = self._area_task
@@ -616,14 +782,20 @@ class CadastralDialog(QDialog):
         if self._area_task is not None:
             self._area_task.cancel()
 
+    def _on_area_chunk(self, parcels):
+        """Add one streamed chunk of area parcels while the task runs."""
+        added, self._area_layer = area_mod.add_parcels(
+            QgsProject.instance(), getattr(self, "_area_zone", self._fetch_zone()),
+            parcels)
+        self._area_added += added
+
     def _area_finished(self, task, cancelled):
         self._set_area_running(False)
         self._area_task = None
+        self._refresh_stats()
         if task.error is not None:
             return self._error(task.error)
-        added, layer = area_mod.add_parcels(
-            QgsProject.instance(), getattr(self, "_area_zone", self._fetch_zone()),
-            task.result)
+        added, layer = self._area_added, self._area_layer
         if self.iface is not None and layer is not None and added:
             self.iface.mapCanvas().setExtent(layer.extent())
             self.iface.mapCanvas().refresh()
@@ -631,7 +803,18 @@ class CadastralDialog(QDialog):
             self._msg(_tr("area_cancelled", n=added), Qgis.Warning)
         else:
             self.area_progress.setValue(100)
-            self._msg(_tr("area_done", n=added), Qgis.Success)
+            msg = _tr("area_done", n=added)
+            if "grid_points" in task.stats:
+                msg += " " + _tr("area_requests", pts=task.stats["points"],
+                                 grid=task.stats["grid_points"])
+            elif "skipped" in task.stats:
+                msg += " " + _tr("area_skipped", n=task.stats["skipped"],
+                                 pts=task.stats["points"])
+            if task.stats.get("time_to_first_parcel") is not None:
+                msg += " " + _tr("area_timing",
+                                 first=task.stats["time_to_first_parcel"],
+                                 wall=task.stats["wall_time"])
+            self._msg(msg, Qgis.Success)
 
     # -------------------------------------------------------- Services tab #
     def _tab_services(self):
@@ -989,6 +1172,18 @@ class CadastralDialog(QDialog):
         form.addRow(_tr("auth_id"), self.set_id)
         form.addRow(_tr("auth_contact"), self.set_contact)
         form.addRow(_tr("auth_person"), self.set_person)
+        workers, rate = self._area_limits()
+        self.set_area_workers = QSpinBox()
+        self.set_area_workers.setRange(1, 16)
+        self.set_area_workers.setValue(workers)
+        self.set_area_rate = QDoubleSpinBox()
+        self.set_area_rate.setRange(0.0, 50.0)
+        self.set_area_rate.setDecimals(1)
+        self.set_area_rate.setSingleStep(0.5)
+        self.set_area_rate.setSpecialValueText(_tr("area_rate_off"))
+        self.set_area_rate.setValue(rate)
+        form.addRow(_tr("area_workers"), self.set_area_workers)
+        form.addRow(_tr("request_rate"), self.set_area_rate)
         btn = QPushButton(_tr("save"))
         btn.clicked.connect(self._save_settings)
         form.addRow(btn)
@@ -1000,8 +1195,21 @@ class CadastralDialog(QDialog):
         self._settings.setValue(f"{g}/auth_id", self.set_id.text())
         self._settings.setValue(f"{g}/auth_contact", self.set_contact.text())
         self._settings.setValue(f"{g}/auth_person", self.set_person.text())
+        self._settings.setValue(f"{g}/area_workers", self.set_area_workers.value())
+        napr_tasks.set_request_rate(self.set_area_rate.value())
         self._msg(_tr("done"))
 
+    def _area_limits(self):
+        """(workers, requests/second; 0 = unlimited) for area downloads. The
+        rate is the plugin-wide one every download shares."""
+        g = config.SETTINGS_GROUP
+        try:
+            workers = int(self._settings.value(f"{g}/area_workers",
+                                               config.AREA_WORKERS))
+        except (TypeError, ValueError):
+            workers = config.AREA_WORKERS
+        return max(1, workers), max(0.0, napr_tasks.request_rate())
+
     # -------------------------------------------------------------- helpers #
     @staticmethod
     def _wrap(layout):
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""Keep-alive connection pooling for the stdlib cadastre fetcher.
+
+``napr_client._urllib_fetch`` opens a fresh ``urlopen`` connection per call, so
+every search / getinfo.alpha / getinfo2 request pays a new TCP + TLS
+handshake to the same host. ``PooledFetcher`` keeps persistent
+``http.client`` connections per (scheme, host, port) and reuses them:
+
+    fetch = PooledFetcher(max_per_host=8)
+    napr_client.lookup("38.10.42.107", fetch=fetch)
+
+It is a drop-in for the ``fetch=`` contract (``fetch(url, data, headers,
+timeout) -> text``, plus ``fetch.stream`` yielding text chunks so parsers
+that stop early leave the rest unread), thread-safe, and transparently
+retries once on a fresh socket when a reused connection turns out to be stale
+(server closed it while idle). HTTP errors raise ``urllib.error.HTTPError``
+exactly like the default fetcher. Pure standard library — meant for CLI / test / headless bulk runs;
+inside QGIS the proxy-aware ``qgis_net.qgis_fetch`` stays the default.
+"""
+import codecs
+import gzip
+import http.client
+import ssl
+import threading
+import time
+import zlib
+from urllib.error import HTTPError
+from urllib.parse import urljoin, urlsplit
+
+# Errors that mean "the kept-alive socket was already dead" — safe to redo the
+# request once on a brand-new connection.
+_STALE_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    ConnectionAbortedError,
+    BrokenPipeError,
+)
+
+_MAX_REDIRECTS = 5
+_REDIRECTS = (301, 302, 303, 307, 308)
+_BLOCK = 8192
+
+
+class PooledFetcher:
+    """Thread-safe keep-alive fetcher. ``max_per_host`` caps open connections
+    per host (callers beyond it wait); idle sockets older than
+    ``idle_timeout`` seconds are discarded instead of reused."""
+
+    def __init__(self, max_per_host=8, idle_timeout=30.0, context=None):
+        self.max_per_host = max(1, int(max_per_host))
+        self.idle_timeout = float(idle_timeout)
+        self._context = context or ssl.create_default_context()
+        self._lock = threading.Lock()
+        self._idle = {}      # (scheme, host, port) -> [(conn, last_used)]
+        self._slots = {}     # (scheme, host, port) -> BoundedSemaphore
+        self.stats = {"requests": 0, "connections": 0, "reused": 0, "stale": 0}
+
+    # ------------------------------------------------------------- contract
+    def __call__(self, url, data, headers, timeout):
+        for _ in range(_MAX_REDIRECTS + 1):
+            status, reason, resp_headers, body = self._request(
+                url, data, headers, timeout)
+            if status in _REDIRECTS and resp_headers.get("Location"):
+                url = urljoin(url, resp_headers["Location"])
+                if status == 303:
+                    data = None
+                continue
+            if status >= 400:
+                raise HTTPError(url, status, reason, resp_headers, None)
+            return body.decode("utf-8", "replace")
+        raise HTTPError(url, status, "Too many redirects", resp_headers, None)
+
+    def stream(self, url, data, headers, timeout):
+        """Streaming twin of ``__call__``: yields the body as text chunks,
+        decompressed and decoded as they arrive. A connection whose body was
+        not read to the end (the consumer stopped early) is closed, not
+        reused."""
+        for _ in range(_MAX_REDIRECTS + 1):
+            key, slot, conn, resp = self._open(url, data, headers, timeout)
+            drained = False
+            try:
+                status, location = resp.status, resp.getheader("Location")
+                if status in _REDIRECTS and location:
+                    resp.read()
+                    drained = True
+                elif status >= 400:
+                    resp.read()
+                    drained = True
+                    raise HTTPError(url, status, resp.reason, resp.headers, None)
+                else:
+                    yield from _text_chunks(resp)
+                    drained = True
+                    return
+            finally:
+                self._release(key, slot, conn, resp, drained)
+            url = urljoin(url, location)
+            if status == 303:
+                data = None
+        raise HTTPError(url, status, "Too many redirects", resp.headers, None)
+
+    def close(self):
+        """Close every idle connection (in-flight ones close when returned)."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn, _ in conns:
+                conn.close()
+
+    # ------------------------------------------------------------ internals
+    def _request(self, url, data, headers, timeout):
+        key, slot, conn, resp = self._open(url, data, headers, timeout)
+        drained = False
+        try:
+            body = _decode(resp.read(), resp.getheader("Content-Encoding"))
+            drained = True
+        finally:
+            self._release(key, slot, conn, resp, drained)
+        return resp.status, resp.reason, resp.headers, body
+
+    def _open(self, url, data, headers, timeout):
+        """Take a slot and a connection and send the request. Returns
+        ``(key, slot, conn, response)``; hand them back via ``_release``."""
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname, port)
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        hdrs = dict(headers or {})
+        hdrs.setdefault("Connection", "keep-alive")
+        hdrs.setdefault("Accept-Encoding", "gzip, deflate")
+        method = "GET" if data is None else "POST"
+
+        slot = self._slot(key)
+        slot.acquire()
+        try:
+            conn, reused = self._checkout(key, timeout)
+            try:
+                resp = self._send(conn, method, target, data, hdrs)
+            except _STALE_ERRORS:
+                conn.close()
+                if not reused:
+                    raise
+                self._count("stale")
+                conn, reused = self._connect(key, timeout), False
+                try:
+                    resp = self._send(conn, method, target, data, hdrs)
+                except Exception:
+                    conn.close()
+                    raise
+            except Exception:
+                conn.close()
+                raise
+        except BaseException:
+            slot.release()
+            raise
+        return key, slot, conn, resp
+
+    def _release(self, key, slot, conn, resp, drained):
+        """Return the connection to the pool if its response was read to the
+        end and the server keeps it open; else close it. Frees the slot."""
+        try:
+            if drained and not resp.will_close:
+                self._checkin(key, conn)
+            else:
+                conn.close()
+        finally:
+            slot.release()
+
+    @staticmethod
+    def _send(conn, method, target, data, headers):
+        conn.request(method, target, body=data, headers=headers)
+        return conn.getresponse()
+
+    def _slot(self, key):
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._slots[key] = threading.BoundedSemaphore(
+                    self.max_per_host)
+            return slot
+
+    def _checkout(self, key, timeout):
+        now = time.monotonic()
+        with self._lock:
+            self.stats["requests"] += 1
+            conns = self._idle.get(key) or []
+            while conns:
+                conn, last_used = conns.pop()
+                if now - last_used <= self.idle_timeout:
+                    self.stats["reused"] += 1
+                    conn.timeout = timeout
+                    if conn.sock is not None:
+                        conn.sock.settimeout(timeout)
+                    return conn, True
+                conn.close()
+        return self._connect(key, timeout), False
+
+    def _checkin(self, key, conn):
+        with self._lock:
+            self._idle.setdefault(key, []).append((conn, time.monotonic()))
+
+    def _connect(self, key, timeout):
+        scheme, host, port = key
+        self._count("connections")
+        if scheme == "https":
+            return http.client.HTTPSConnection(
+                host, port, timeout=timeout, context=self._context)
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+
+def _text_chunks(resp):
+    """Read ``resp`` in blocks; yield them decompressed and decoded (UTF-8)."""
+    encoding = (resp.getheader("Content-Encoding") or "").lower()
+    inflate = None
+    if encoding == "gzip":
+        inflate = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    elif encoding == "deflate":
+        inflate = zlib.decompressobj()
+    decoder = codecs.getincrementaldecoder("utf-8")("replace")
+    first = True
+    while True:
+        block = resp.read(_BLOCK)
+        if not block:
+            break
+        if inflate is not None:
+            try:
+                block = inflate.decompress(block)
+            except zlib.error:
+                if not (first and encoding == "deflate"):
+                    raise
+                inflate = zlib.decompressobj(-zlib.MAX_WBITS)   # raw deflate
+                block = inflate.decompress(block)
+        first = False
+        text = decoder.decode(block)
+        if text:
+            yield text
+    tail = decoder.decode(inflate.flush() if inflate is not None else b"",
+                          final=True)
+    if tail:
+        yield tail
+
+
+def _decode(raw, encoding):
+    encoding = (encoding or "").lower()
+    if encoding == "gzip":
+        return gzip.decompress(raw)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(raw)
+        except zlib.error:
+            return zlib.decompress(raw, -zlib.MAX_WBITS)
+    return raw
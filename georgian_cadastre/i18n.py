@@ -17,6 +17,7 @@ _S = {
     # tabs
     "tab_single":     {"ka": u"ერთი კოდი",                      "en": u"Single code"},
     "tab_batch":      {"ka": u"სია (batch)",                    "en": u"Batch"},
+    "tab_stats":      {"ka": u"ქსელი",                          "en": u"Network"},
 
     # single search
     "code_label":     {"ka": u"საკადასტრო კოდი:",              "en": u"Cadastral code:"},
@@ -39,6 +40,8 @@ _S = {
     "shp_btn":        {"ka": u"გადმოწერა (SHP)",                "en": u"Download (SHP)"},
     "dxf_btn":        {"ka": u"გადმოწერა (DXF)",                "en": u"Download (DXF)"},
     "csv_btn":        {"ka": u"გადმოწერა (CSV)",                "en": u"Download (CSV)"},
+    "gpkg_btn":       {"ka": u"გადმოწერა (GeoPackage)",         "en": u"Download (GeoPackage)"},
+    "fgb_btn":        {"ka": u"გადმოწერა (FlatGeobuf)",         "en": u"Download (FlatGeobuf)"},
 
     # batch
     "batch_label":    {"ka": u"საკადასტრო კოდები (თითო ხაზზე):",
@@ -51,10 +54,19 @@ _S = {
     "batch_layer_name":{"ka": u"კადასტრი (batch)",             "en": u"Cadastre (batch)"},
     "batch_empty":    {"ka": u"ჩაწერეთ ერთი მაინც კოდი.",      "en": u"Enter at least one code."},
 
+    # network statistics
+    "stats_refresh":  {"ka": u"განახლება",                      "en": u"Refresh"},
+    "stats_reset":    {"ka": u"განულება",                       "en": u"Reset"},
+    "stats_log":      {"ka": u"სტატისტიკის ჩაწერა QGIS-ის ლოგში ყოველი batch-ის ბოლოს",
+                       "en": u"Write the statistics to the QGIS log after every batch"},
+    "stats_index":    {"ka": u"კოდების ინდექსი: {} კოდი, {} მოხვედრა (ძებნის გარეშე), {} მოძველებული",
+                       "en": u"Code index: {} codes, {} hits (search skipped), {} stale"},
+
     # status / misc
     "source":         {"ka": u"წყარო: საჯარო საკადასტრო სერვისი", "en": u"Source: public cadastre service"},
     "added":          {"ka": u"დაემატა რუკაზე: {}",            "en": u"Added to map: {}"},
     "saved":          {"ka": u"შენახულია: {}",                  "en": u"Saved: {}"},
+    "exporting":      {"ka": u"ექსპორტი…",                      "en": u"Exporting…"},
     "no_address":     {"ka": u"(მისამართი უცნობია)",           "en": u"(no address)"},
     "area_line":      {"ka": u"ფართობი: {} მ² · ტიპი: {} · {}","en": u"Area: {} m² · type: {} · {}"},
 
@@ -69,6 +81,9 @@ _S = {
     "err_no_geom":    {"ka": u"გეომეტრია ვერ მოიძებნა.",       "en": u"No geometry returned for this parcel."},
     "err_empty_geom": {"ka": u"ცარიელი გეომეტრია.",            "en": u"Empty geometry."},
     "err_not_found":  {"ka": u"კოდი ვერ მოიძებნა: {}",         "en": u"Code not found: {}"},
+    "err_cancelled":  {"ka": u"გაუქმდა.",                       "en": u"Cancelled."},
+    "err_service_down":{"ka": u"საკადასტრო სერვისი არ პასუხობს; ხელახლა ვცდით {} წმ-ში.",
+                       "en": u"The cadastre service is not responding; retrying in {} s."},
     "err_write":      {"ka": u"ჩაწერა ვერ მოხერხდა: {}",       "en": u"Write failed: {}"},
     "err_empty_layer":{"ka": u"ცარიელი ფენა.",                 "en": u"Empty layer."},
 }
@@ -0,0 +1,348 @@
+# -*- coding: utf-8 -*-
+"""asyncio variant of the cadastre service client, for high fan-out jobs.
+
+Coroutine twins of ``napr_client.search`` / ``fetch_features`` /
+``fetch_info`` / ``reverse`` / ``lookup``. Request building, parsing
+(``_extract_lbl``, the ``_REV_*`` regexes, ``_INFO_PATTERNS``), errors, the
+retry / backoff and circuit-breaker policy and the result cache are all
+napr_client's own — only the I/O differs, so the two clients can never drift
+apart. Identical requests in flight at once are coalesced per event loop,
+like napr_client's single-flight.
+
+The fetcher is injectable like the sync one, but awaitable::
+
+    async def fetch(url, data, headers, timeout) -> str
+
+The default, ``asyncio_fetch``, is a small stdlib HTTP/1.1 client on
+``asyncio.open_connection``. ``AsyncClient`` bounds the number of requests in
+flight with a semaphore, so one headless process can keep hundreds of lookups
+going without a thread per request::
+
+    client = AsyncClient(concurrency=200)
+    results = asyncio.run(client.lookup_many(codes))
+
+Pure standard library; not used inside QGIS (QgsTask + qgis_fetch is).
+"""
+import asyncio
+import ssl
+import time
+import weakref
+from urllib.error import HTTPError
+from urllib.parse import urljoin, urlsplit
+
+from . import napr_client
+from .http_pool import _decode
+from .napr_cache import MISS
+from .napr_client import NaprError
+
+_MAX_REDIRECTS = 5
+_SSL = None
+
+
+def _ssl_context():
+    global _SSL
+    if _SSL is None:
+        _SSL = ssl.create_default_context()
+    return _SSL
+
+
+# --------------------------------------------------------------------------- #
+# Default async fetcher (stdlib HTTP/1.1, one connection per request)
+# --------------------------------------------------------------------------- #
+async def asyncio_fetch(url, data, headers, timeout):
+    """Async fetcher contract: returns the response body as text."""
+    for _ in range(_MAX_REDIRECTS + 1):
+        status, reason, resp_headers, body = await asyncio.wait_for(
+            _http_request(url, data, headers), timeout)
+        location = resp_headers.get("location")
+        if status in (301, 302, 303, 307, 308) and location:
+            url = urljoin(url, location)
+            if status == 303:
+                data = None
+            continue
+        if status >= 400:
+            raise HTTPError(url, status, reason, resp_headers, None)
+        return body.decode("utf-8", "replace")
+    raise HTTPError(url, status, "Too many redirects", resp_headers, None)
+
+
+async def _http_request(url, data, headers):
+    parts = urlsplit(url)
+    https = parts.scheme.lower() == "https"
+    host = parts.hostname
+    port = parts.port or (443 if https else 80)
+    target = (parts.path or "/") + ("?" + parts.query if parts.query else "")
+
+    reader, writer = await asyncio.open_connection(
+        host, port, ssl=_ssl_context() if https else None)
+    try:
+        lines = ["{} {} HTTP/1.1".format("GET" if data is None else "POST", target),
+                 "Host: {}".format(parts.netloc),
+                 "Connection: close",
+                 "Accept-Encoding: gzip, deflate"]
+        lines += ["{}: {}".format(k, v) for k, v in (headers or {}).items()]
+        if data is not None:
+            lines.append("Content-Length: {}".format(len(data)))
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("utf-8") + (data or b""))
+        await writer.drain()
+
+        status_line = (await reader.readline()).decode("latin-1").split(" ", 2)
+        if len(status_line) < 2 or not status_line[1].isdigit():
+            raise ConnectionError("Malformed HTTP status line")
+        status = int(status_line[1])
+        reason = status_line[2].strip() if len(status_line) > 2 else ""
+        resp_headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            key, _, value = line.partition(":")
+            resp_headers[key.strip().lower()] = value.strip()
+
+        if resp_headers.get("transfer-encoding", "").lower() == "chunked":
+            body = await _read_chunked(reader)
+        elif "content-length" in resp_headers:
+            body = await reader.readexactly(int(resp_headers["content-length"]))
+        else:
+            body = await reader.read()
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except (OSError, ssl.SSLError):
+            pass
+    return status, reason, resp_headers, _decode(
+        body, resp_headers.get("content-encoding"))
+
+
+async def _read_chunked(reader):
+    out = bytearray()
+    while True:
+        size = int((await reader.readline()).split(b";", 1)[0].strip() or b"0", 16)
+        if size == 0:
+            while (await reader.readline()).strip():   # trailers
+                pass
+            return bytes(out)
+        out += await reader.readexactly(size)
+        await reader.readline()                        # CRLF after the chunk
+
+
+async def _get_text(url, data=None, fetch=None, endpoint=None):
+    """Async twin of napr_client._get_text: the same retries with jittered
+    backoff, circuit breaker (``err_service_down``) and ``endpoint_stats``."""
+    fetch = fetch or asyncio_fetch
+    metrics = napr_client._metrics_of(fetch)
+    body = data.encode("utf-8") if data is not None else None
+    headers = napr_client._request_headers(body)
+    attempt = 0
+    while True:
+        napr_client._admit()
+        started = time.perf_counter()
+        try:
+            text = await fetch(url, body, headers, napr_client.TIMEOUT)
+        except asyncio.CancelledError:
+            napr_client._BREAKER.release_probe()
+            raise
+        except Exception as exc:  # noqa: BLE001 — surface any network/HTTP issue
+            delay = napr_client._failed(exc, attempt, endpoint,
+                                        time.perf_counter() - started, 0,
+                                        metrics)
+            attempt += 1
+            await asyncio.sleep(delay)
+            continue
+        napr_client._succeeded(endpoint, time.perf_counter() - started,
+                               napr_client._nbytes(text), metrics)
+        return text
+
+
+async def wait_for_service():
+    """Async ``napr_client.wait_for_service``: sleep, without blocking the
+    loop, until the circuit breaker lets a request through again. Cancel the
+    awaiting task to give up."""
+    breaker = napr_client._BREAKER
+    while not breaker.ready():
+        await asyncio.sleep(min(0.25, max(0.05, breaker.remaining())))
+
+
+async def _when_up(call):
+    """Await ``call()``; on ``err_service_down`` wait for the service and
+    call it again, like ``concurrency.when_up`` for the thread pool."""
+    while True:
+        try:
+            return await call()
+        except NaprError as exc:
+            if exc.key != "err_service_down":
+                raise
+        await wait_for_service()
+
+
+async def _get_json(url, data=None, fetch=None, endpoint=None):
+    return napr_client._parse_json(
+        await _get_text(url, data=data, fetch=fetch, endpoint=endpoint))
+
+
+# Per event loop: (kind, key) -> the task filling it.
+_FLIGHTS = weakref.WeakKeyDictionary()
+
+
+async def _cached(kind, key, load, use_cache=True, metrics=None):
+    """Async ``napr_client._cached``: serve (kind, key) from the cache, else
+    run ``load()`` — once across the coroutines asking at the same time — and
+    store the result. A caller cancelled while waiting leaves the load running
+    for the others."""
+    if not use_cache:
+        return await load()
+    hit = napr_client._cache_get(kind, key, metrics)
+    if hit is not MISS:
+        return hit
+    flights = _FLIGHTS.setdefault(asyncio.get_running_loop(), {})
+    task = flights.get((kind, key))
+    if task is None:
+        async def _fill():
+            value = napr_client._CACHE.peek(kind, key)
+            if value is MISS:
+                value = await load()
+                napr_client._CACHE.put(kind, key, value)
+            else:
+                napr_client._hit(kind, metrics)
+            return value
+
+        task = flights[(kind, key)] = asyncio.ensure_future(_fill())
+        task.add_done_callback(lambda _t: flights.pop((kind, key), None))
+    return await asyncio.shield(task)
+
+
+# --------------------------------------------------------------------------- #
+# Coroutine API (mirrors napr_client)
+# --------------------------------------------------------------------------- #
+async def search(code, fetch=None, use_cache=True):
+    """Async ``napr_client.search``."""
+    code = (code or "").strip()
+    if not code:
+        raise NaprError("err_empty_code")
+
+    async def _load():
+        data = await _get_json(napr_client.SEARCH_URL,
+                               data=napr_client._search_payload(code),
+                               fetch=fetch, endpoint="search")
+        matches = napr_client._parse_search(data, code)
+        napr_client._INDEX.put_many(matches)
+        return matches
+
+    return await _cached("search", code, _load, use_cache,
+                         napr_client._metrics_of(fetch))
+
+
+async def fetch_features(lbl, fetch=None, use_cache=True):
+    """Async ``napr_client.fetch_features``."""
+    async def _load():
+        return napr_client._parse_features(
+            await _get_json(napr_client._features_url(lbl), fetch=fetch,
+                            endpoint="features"))
+
+    return napr_client._geom_rows(
+        await _cached("features", lbl, _load, use_cache,
+                      napr_client._metrics_of(fetch)))
+
+
+async def fetch_info(lbl, fetch=None, use_cache=True):
+    """Async ``napr_client.fetch_info`` (non-personal attributes only)."""
+    async def _load():
+        return napr_client._parse_info(
+            await _get_text(napr_client._info_url(lbl), fetch=fetch,
+                            endpoint="info"))
+
+    return await _cached("info", lbl, _load, use_cache,
+                         napr_client._metrics_of(fetch))
+
+
+async def reverse(lon, lat, radius=50, limit=8, fetch=None):
+    """Async ``napr_client.reverse``."""
+    raw = await _get_text(napr_client._reverse_url(lon, lat, radius),
+                          fetch=fetch, endpoint="reverse")
+    return napr_client._parse_reverse(raw, limit)
+
+
+async def lookup(code, fetch=None, with_info=False, use_index=True):
+    """Async ``napr_client.lookup`` (code index included)."""
+    code = (code or "").strip()
+    first = (napr_client._indexed(code, napr_client._metrics_of(fetch))
+             if use_index and code else None)
+    if first is not None:
+        try:
+            features = await fetch_features(first["lbl"], fetch=fetch)
+        except NaprError as exc:
+            if exc.key not in napr_client._STALE_KEYS:
+                raise
+            napr_client._INDEX.forget(code)
+            first = None
+    if first is None:
+        matches = await search(code, fetch=fetch)
+        if not matches:
+            raise NaprError("err_not_found", code)
+        first = matches[0]
+        features = await fetch_features(first["lbl"], fetch=fetch)
+    result = napr_client._lookup_result(first, features)
+    if with_info:
+        try:
+            result["info"] = await fetch_info(first["lbl"], fetch=fetch)
+        except NaprError:
+            result["info"] = None
+    return result
+
+
+# --------------------------------------------------------------------------- #
+# Bounded client
+# --------------------------------------------------------------------------- #
+class AsyncClient:
+    """Holds an async fetcher and caps requests in flight at ``concurrency``.
+
+    The cap is per HTTP request (a lookup is two or three), enforced by one
+    semaphore shared by every coroutine started through this client.
+    ``lookup`` and ``reverse`` ride out an outage: once the circuit breaker
+    trips they wait for it to close and retry, so ``lookup_many`` pauses
+    instead of failing every code in flight.
+    """
+
+    def __init__(self, fetch=None, concurrency=100):
+        self._inner = fetch or asyncio_fetch
+        self.concurrency = max(1, int(concurrency))
+        self._sem = None
+
+    async def _fetch(self, url, data, headers, timeout):
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.concurrency)
+        async with self._sem:
+            return await self._inner(url, data, headers, timeout)
+
+    async def search(self, code, use_cache=True):
+        return await search(code, fetch=self._fetch, use_cache=use_cache)
+
+    async def fetch_features(self, lbl, use_cache=True):
+        return await fetch_features(lbl, fetch=self._fetch, use_cache=use_cache)
+
+    async def fetch_info(self, lbl, use_cache=True):
+        return await fetch_info(lbl, fetch=self._fetch, use_cache=use_cache)
+
+    async def reverse(self, lon, lat, radius=50, limit=8):
+        return await _when_up(lambda: reverse(lon, lat, radius=radius,
+                                              limit=limit, fetch=self._fetch))
+
+    async def lookup(self, code, with_info=False):
+        return await _when_up(lambda: lookup(code, fetch=self._fetch,
+                                             with_info=with_info))
+
+    async def lookup_many(self, codes, with_info=False):
+        """Resolve many codes concurrently. Returns ``{code, ok, data|error}``
+        dicts in input order — the same shape as tasks.BatchTask.result."""
+        codes = [c.strip() for c in codes if (c or "").strip()]
+        outcomes = await asyncio.gather(
+            *(self.lookup(c, with_info=with_info) for c in codes),
+            return_exceptions=True)
+        out = []
+        for code, res in zip(codes, outcomes):
+            if isinstance(res, Exception):
+                out.append({"code": code, "ok": False, "error": str(res)})
+            else:
+                out.append({"code": code, "ok": True, "data": res})
+        return out
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""Cache backends for the cadastre service client.
+
+napr_client keeps ``search`` / ``fetch_features`` / ``fetch_info`` results in a
+cache so the same parcel is not downloaded twice. The backend is pluggable;
+both stores share one small interface (``get`` / ``peek`` / ``put`` /
+``clear`` / ``stats`` / ``close``):
+
+  * ``MemoryCache`` — the original per-process dict. Default; no persistence.
+  * ``SqliteCache`` — one SQLite file (the plugin puts it under the QGIS
+    profile) that survives restarts, expires entries per kind and evicts the
+    least-recently-used rows to stay under a byte budget.
+
+Pure standard library, like napr_client, so it works in tests / a CLI.
+"""
+import base64
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Returned by ``get`` on a miss. A cached value may legitimately be falsy
+# (an empty search result is cached too), so None cannot mean "miss".
+MISS = object()
+
+# Per-kind time-to-live in seconds (None = never expires). Code -> label id
+# mappings are stable; geometry / attributes change only on re-registration.
+DEFAULT_TTL = {
+    "search": 7 * 24 * 3600,
+    "features": 3 * 24 * 3600,
+    "info": 3 * 24 * 3600,
+}
+
+# Default on-disk budget. Evicting stops at the low-water mark so a full cache
+# does not evict on every single put.
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+_LOW_WATER = 0.9
+
+
+class MemoryCache:
+    """Per-process dict cache (no TTL, no size limit) — the historical default."""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, kind, key):
+        with self._lock:
+            value = self._data.get((kind, key), MISS)
+            if value is MISS:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def peek(self, kind, key):
+        """Like ``get`` but without touching the hit/miss counters."""
+        with self._lock:
+            return self._data.get((kind, key), MISS)
+
+    def put(self, kind, key, value):
+        with self._lock:
+            self._data[(kind, key)] = value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"backend": "memory", "hits": self.hits,
+                    "misses": self.misses, "entries": len(self._data),
+                    "bytes": None, "evictions": 0}
+
+    def close(self):
+        pass
+
+
+class SqliteCache:
+    """Persistent cache in a single SQLite file with per-kind TTL + LRU budget.
+
+    Values are stored as JSON (bytes, e.g. compressed WKB geometry, as
+    base64). One connection is shared across threads behind a
+    lock (QgsTask workers call in concurrently). Any SQLite failure — locked or
+    corrupt file, full disk — degrades to a cache miss rather than an error.
+    """
+
+    def __init__(self, path, ttl=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttl = dict(DEFAULT_TTL)
+        self.ttl.update(ttl or {})
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False,
+                                   isolation_level=None)
+        try:
+            self._db.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.Error:
+            pass
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " kind TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+            " size INTEGER NOT NULL, created REAL NOT NULL,"
+            " accessed REAL NOT NULL, PRIMARY KEY (kind, key))")
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS cache_accessed ON cache(accessed)")
+        row = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()
+        self._bytes = int(row[0])
+
+    # ------------------------------------------------------------------ API
+    def get(self, kind, key):
+        return self._lookup(kind, key, count=True)
+
+    def peek(self, kind, key):
+        """Like ``get`` but without touching the counters or the LRU order."""
+        return self._lookup(kind, key, count=False)
+
+    def _lookup(self, kind, key, count):
+        now = time.time()
+        with self._lock:
+            try:
+                row = self._db.execute(
+                    "SELECT value, size, created FROM cache WHERE kind=? AND key=?",
+                    (kind, key)).fetchone()
+                if row is None:
+                    self.misses += count
+                    return MISS
+                value, size, created = row
+                ttl = self.ttl.get(kind)
+                if ttl is not None and now - created > ttl:
+                    self._delete(kind, key, size)
+                    self.misses += count
+                    return MISS
+                if count:
+                    self._db.execute(
+                        "UPDATE cache SET accessed=? WHERE kind=? AND key=?",
+                        (now, kind, key))
+                decoded = json.loads(value, object_hook=_from_json)
+            except (sqlite3.Error, ValueError):
+                self.errors += 1
+                self.misses += count
+                return MISS
+            self.hits += count
+            return decoded
+
+    def put(self, kind, key, value):
+        try:
+            text = json.dumps(value, ensure_ascii=False, separators=(",", ":"),
+                              default=_to_json)
+        except (TypeError, ValueError):
+            return
+        size = len(text.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            try:
+                old = self._db.execute(
+                    "SELECT size FROM cache WHERE kind=? AND key=?",
+                    (kind, key)).fetchone()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO cache"
+                    " (kind, key, value, size, created, accessed)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (kind, key, text, size, now, now))
+                self._bytes += size - (old[0] if old else 0)
+                if self._bytes > self.max_bytes:
+                    self._evict(int(self.max_bytes * _LOW_WATER))
+            except sqlite3.Error:
+                self.errors += 1
+
+    def clear(self):
+        with self._lock:
+            try:
+                self._db.execute("DELETE FROM cache")
+                self._bytes = 0
+            except sqlite3.Error:
+                self.errors += 1
+
+    def stats(self):
+        with self._lock:
+            try:
+                entries = self._db.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            except sqlite3.Error:
+                entries = None
+            return {"backend": "sqlite", "hits": self.hits,
+                    "misses": self.misses, "entries": entries,
+                    "bytes": self._bytes, "evictions": self.evictions,
+                    "errors": self.errors}
+
+    def close(self):
+        with self._lock:
+            try:
+                self._db.close()
+            except sqlite3.Error:
+                pass
+
+    # ------------------------------------------------------------ internals
+    def _delete(self, kind, key, size):
+        self._db.execute("DELETE FROM cache WHERE kind=? AND key=?", (kind, key))
+        self._bytes -= size
+
+    def _evict(self, target):
+        """Drop least-recently-accessed rows until the total is <= target."""
+        rows = self._db.execute(
+            "SELECT kind, key, size FROM cache ORDER BY accessed").fetchall()
+        self._db.execute("BEGIN")
+        try:
+            for kind, key, size in rows:
+                if self._bytes <= target:
+                    break
+                self._delete(kind, key, size)
+                self.evictions += 1
+            self._db.execute("COMMIT")
+        except sqlite3.Error:
+            self._db.execute("ROLLBACK")
+            row = self._db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()
+            self._bytes = int(row[0])
+            raise
+
+
+def _to_json(obj):
+    if isinstance(obj, (bytes, bytearray)):
+        return {"$b64": base64.b64encode(obj).decode("ascii")}
+    raise TypeError("{} is not JSON serializable".format(type(obj).__name__))
+
+
+def _from_json(obj):
+    if len(obj) == 1 and "$b64" in obj:
+        return base64.b64decode(obj["$b64"])
+    return obj
@@ -14,7 +14,10 @@ Public endpoints of the cadastre map portal:
 
 This module is pure standard library so it can run in tests / a CLI without
 QGIS. The network call is injectable (``fetch=``) so the QGIS layer can supply
-a proxy-aware, background-thread-friendly implementation.
+a proxy-aware, background-thread-friendly implementation; headless bulk runs
+can pass ``http_pool.PooledFetcher()`` to reuse keep-alive connections.
+Every request attempt and cache hit is counted per endpoint (see
+``endpoint_stats`` and napr_metrics).
 
 Gotchas learned the hard way:
   * The ``:`` in the label id must be sent literally — percent-encoding it to
@@ -24,14 +27,28 @@ Gotchas learned the hard way:
   * ``getinfo2`` JSON is occasionally malformed (unescaped quotes in Georgian
     text), so reverse lookup parses it leniently.
 """
+import codecs
+import http.client
 import json
+import random
 import re
+import socket
+import threading
+import time
+from html.parser import HTMLParser
+from urllib.error import HTTPError, URLError
 from urllib.parse import urlencode
 from urllib.request import Request, urlopen
 
-SEARCH_URL = "https://maps.gov.ge/map/portal/search"
-GETINFO_URL = "https://maps.gov.ge/lr/bo/mg/getinfo.alpha"
-GETINFO2_URL = "https://maps.gov.ge/lr/bo/mg/getinfo2"
+from .napr_cache import MISS, MemoryCache
+from .napr_geom import GeomRow, compact_row, copy_geometry
+from .napr_index import CodeIndex
+from .napr_metrics import EndpointMetrics
+
+BASE_URL = "https://maps.gov.ge"
+SEARCH_URL = BASE_URL + "/map/portal/search"
+GETINFO_URL = BASE_URL + "/lr/bo/mg/getinfo.alpha"
+GETINFO2_URL = BASE_URL + "/lr/bo/mg/getinfo2"
 
 _HEADERS = {
     "User-Agent": "QGIS-GeorgianCadastre/0.2 (+https://github.com/kapangio)",
@@ -41,8 +58,29 @@ _HEADERS = {
 
 TIMEOUT = 20
 
-# Simple per-process cache: {(kind, key): value}. Cleared via clear_cache().
-_CACHE = {}
+# Bytes per read when a response is consumed as a stream.
+STREAM_BLOCK = 8192
+
+# Transient failures (timeouts, resets, 5xx / 429) are retried with jittered
+# exponential backoff: after failed attempt n (0-based) the client sleeps
+# uniform(0, min(MAX, BASE * 2**(n + 1))), in short slices so a cancelled
+# task stops waiting (see _backoff).
+RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+
+# After this many consecutive transient failures the circuit opens: requests
+# fail fast with err_service_down for BREAKER_COOLDOWN seconds, then a single
+# probe decides whether to close it again.
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 30.0
+
+# Result cache keyed by (kind, key). A per-process dict by default; the plugin
+# swaps in a persistent SqliteCache via set_cache(). Cleared via clear_cache().
+_CACHE = MemoryCache()
+
+# code -> lbl mappings learned from searches / area fetches (see napr_index).
+_INDEX = CodeIndex()
 
 
 class NaprError(Exception):
@@ -55,11 +93,15 @@ class NaprError(Exception):
         "err_no_geom": "No geometry returned for this parcel.",
         "err_empty_geom": "Empty geometry.",
         "err_not_found": "Code not found: {}",
+        "err_cancelled": "Cancelled.",
+        "err_service_down": "The cadastre service is not responding; retrying in {} s.",
     }
 
-    def __init__(self, key, detail=""):
+    def __init__(self, key, detail="", retryable=False):
         self.key = key
         self.detail = detail
+        # True for transient failures worth retrying (set by fetchers).
+        self.retryable = retryable
         msg = self._EN.get(key, key)
         if detail and "{}" in msg:
             msg = msg.format(detail)
@@ -76,33 +118,496 @@ def _urllib_fetch(url, data, headers, timeout):
         return resp.read().decode("utf-8", "replace")
 
 
-def _get_text(url, data=None, fetch=None):
-    """Fetch a URL and return raw text, raising NaprError on network failure."""
-    fetch = fetch or _urllib_fetch
-    body = data.encode("utf-8") if data is not None else None
+def _urllib_stream(url, data, headers, timeout):
+    """Streaming twin of ``_urllib_fetch``: yields the body as text chunks.
+    Closing the generator early drops the connection unread."""
+    req = Request(url, data=data, headers=headers)
+    decoder = codecs.getincrementaldecoder("utf-8")("replace")
+    with urlopen(req, timeout=timeout) as resp:
+        while True:
+            block = resp.read(STREAM_BLOCK)
+            if not block:
+                break
+            yield decoder.decode(block)
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+# Fetchers may offer ``fetch.stream(url, data, headers, timeout)`` -> iterator
+# of text chunks; parsers that can stop early read through it. A fetcher's
+# ``fetch.should_stop()`` (set by the concurrency wrappers) cuts a retry
+# backoff short once its task is cancelled.
+_urllib_fetch.stream = _urllib_stream
+
+
+def _request_headers(body):
     headers = dict(_HEADERS)
     if body is not None:
         headers["Content-Type"] = "application/x-www-form-urlencoded"
+    return headers
+
+
+def _is_transient(exc):
+    """Is this failure worth retrying (timeout, reset, 5xx / 429)?"""
+    if isinstance(exc, NaprError):
+        return exc.retryable
+    if isinstance(exc, HTTPError):
+        return exc.code >= 500 or exc.code in (408, 429)
+    if isinstance(exc, URLError):
+        return isinstance(exc.reason, (OSError, socket.timeout))
+    return isinstance(exc, (socket.timeout, TimeoutError, ConnectionError,
+                            http.client.HTTPException))
+
+
+class CircuitBreaker:
+    """Closed -> (threshold consecutive transient failures) -> open for
+    ``cooldown`` s -> half-open: one probe request; success closes it, failure
+    re-opens it. Shared by every caller in the process."""
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.trips = 0
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probing or time.monotonic() - self._opened_at < self.cooldown:
+                return False
+            self._probing = True
+            return True
+
+    def remaining(self):
+        """Seconds until the next probe is allowed (0 when closed)."""
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(0.0, self.cooldown - (time.monotonic() - self._opened_at))
+
+    def is_open(self):
+        with self._lock:
+            return self._opened_at is not None
+
+    def ready(self):
+        """Closed, or open with the cooldown over and no probe in flight."""
+        with self._lock:
+            return self._opened_at is None or (
+                not self._probing
+                and time.monotonic() - self._opened_at >= self.cooldown)
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.threshold:
+                if not self._probing:
+                    self.trips += 1
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+    def release_probe(self):
+        """The probe ended without telling us anything (e.g. cancelled)."""
+        with self._lock:
+            self._probing = False
+
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "half-open" if self._probing else "open"
+
+
+_BREAKER = CircuitBreaker()
+_NET_LOCK = threading.Lock()
+_NET = {"retries": 0}
+
+
+def _count_retry():
+    with _NET_LOCK:
+        _NET["retries"] += 1
+
+
+def net_stats():
+    """Process-wide retry / circuit-breaker counters."""
+    with _NET_LOCK:
+        out = dict(_NET)
+    out["breaker_state"] = _BREAKER.state()
+    out["breaker_trips"] = _BREAKER.trips
+    return out
+
+
+_METRICS = EndpointMetrics()
+
+
+def endpoint_stats():
+    """Per-endpoint counters since start-up / the last reset: requests,
+    errors, bytes, cache hits and a latency histogram (see napr_metrics)."""
+    return _METRICS.snapshot()
+
+
+def reset_endpoint_stats():
+    _METRICS.reset()
+
+
+def wait_for_service(should_stop=None):
+    """Block while the circuit is open (the service looks down). Returns False
+    if ``should_stop()`` became true meanwhile, else True once a request may
+    be attempted again."""
+    while not _BREAKER.ready():
+        if should_stop is not None and should_stop():
+            return False
+        time.sleep(min(0.25, max(0.05, _BREAKER.remaining())))
+    return True
+
+
+def _get_text(url, data=None, fetch=None, endpoint=None):
+    """Fetch a URL and return raw text, raising NaprError on network failure.
+
+    Transient failures are retried with jittered exponential backoff; while
+    the circuit breaker is open this fails fast with ``err_service_down``.
+    Each attempt is recorded under ``endpoint`` in ``endpoint_stats``.
+    """
+    return _request(url, data, fetch, None, endpoint)
+
+
+def _get_streamed(url, consume, fetch=None, endpoint=None):
+    """Like ``_get_text`` but hands ``consume`` an iterator of text chunks and
+    returns its result. ``consume`` may stop reading early; the rest of the
+    response is then never downloaded. Fetchers without a ``stream`` method
+    yield the whole body as one chunk."""
+    return _request(url, None, fetch, consume, endpoint)
+
+
+def _request(url, data, fetch, consume, endpoint=None):
+    fetch = fetch or _urllib_fetch
+    metrics = _metrics_of(fetch)
+    body = data.encode("utf-8") if data is not None else None
+    headers = _request_headers(body)
+    attempt = 0
+    while True:
+        _admit()
+        received = [0]
+        started = time.perf_counter()
+        try:
+            if consume is None:
+                value = fetch(url, body, headers, TIMEOUT)
+                received[0] = _nbytes(value)
+            else:
+                value = _consume(fetch, url, body, headers, consume, received)
+        except Exception as exc:  # noqa: BLE001 — surface any network/HTTP issue
+            delay = _failed(exc, attempt, endpoint,
+                            time.perf_counter() - started, received[0], metrics)
+            attempt += 1
+            _backoff(delay, getattr(fetch, "should_stop", None))
+            continue
+        _succeeded(endpoint, time.perf_counter() - started, received[0], metrics)
+        return value
+
+
+def _backoff(delay, should_stop=None):
+    """Sleep ``delay`` seconds between retries, in slices of at most 0.1 s.
+    Raises ``err_cancelled`` as soon as ``should_stop()`` turns true, so a
+    cancelled task does not sit out a multi-second backoff."""
+    deadline = time.monotonic() + delay
+    while True:
+        if should_stop is not None and should_stop():
+            raise NaprError("err_cancelled")
+        left = deadline - time.monotonic()
+        if left <= 0:
+            return
+        time.sleep(min(left, 0.1))
+
+
+# The retry / breaker / metrics policy of one attempt, shared with napr_async.
+def _service_down():
+    return NaprError("err_service_down", int(_BREAKER.remaining()) or 1,
+                     retryable=True)
+
+
+def _admit():
+    """Fail fast with ``err_service_down`` while the circuit is open."""
+    if not _BREAKER.allow():
+        raise _service_down()
+
+
+def _failed(exc, attempt, endpoint, elapsed, nbytes, metrics=None):
+    """Book failed attempt number ``attempt`` (0-based). Returns the backoff
+    delay before the next one, or raises the error to give up with.
+
+    A transient failure that leaves the circuit open (this one tripped it, a
+    half-open probe failed, or another caller tripped it meanwhile) raises
+    ``err_service_down``, so ``concurrency.when_up`` waits for the service
+    and retries the item instead of dropping it."""
+    if getattr(exc, "key", None) == "err_cancelled":
+        _BREAKER.release_probe()
+        raise exc
+    _METRICS.record(endpoint, elapsed, nbytes, ok=False)
+    if metrics is not None:
+        metrics.record(endpoint, elapsed, nbytes, ok=False)
+    transient = _is_transient(exc)
+    if transient:
+        _BREAKER.record_failure()
+    else:
+        _BREAKER.record_success()   # it answered, just not usefully
+    if transient and _BREAKER.is_open():
+        raise _service_down() from exc
+    if not transient or attempt >= RETRIES:
+        if isinstance(exc, NaprError):
+            raise exc
+        raise NaprError("err_network", str(exc), retryable=transient) from exc
+    _count_retry()
+    _METRICS.retry(endpoint)
+    if metrics is not None:
+        metrics.retry(endpoint)
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt + 1)))
+
+
+def _succeeded(endpoint, elapsed, nbytes, metrics=None):
+    _METRICS.record(endpoint, elapsed, nbytes)
+    if metrics is not None:
+        metrics.record(endpoint, elapsed, nbytes)
+    _BREAKER.record_success()
+
+
+def _metrics_of(fetch):
+    return getattr(fetch, "metrics", None)
+
+
+def _hit(kind, metrics=None):
+    _METRICS.cache_hit(kind)
+    if metrics is not None:
+        metrics.cache_hit(kind)
+
+
+def metered(fetch=None, metrics=None):
+    """Wrap a fetcher so the calls made with it are also counted in its own
+    ``metrics`` (an EndpointMetrics, new by default): requests, retries and
+    cache hits, exactly as in ``endpoint_stats`` but for this caller alone.
+    ``.stream`` and ``.should_stop`` are passed through. Must be the outermost
+    wrapper."""
+    inner = fetch or _urllib_fetch
+
+    def _fetch(url, data, headers, timeout):
+        return inner(url, data, headers, timeout)
+
+    for name in ("stream", "should_stop"):
+        attr = getattr(inner, name, None)
+        if attr is not None:
+            setattr(_fetch, name, attr)
+    _fetch.metrics = metrics if metrics is not None else EndpointMetrics()
+    return _fetch
+
+
+def _nbytes(text):
+    return len(text.encode("utf-8")) if isinstance(text, str) else len(text or b"")
+
+
+def _consume(fetch, url, body, headers, consume, received):
+    stream = getattr(fetch, "stream", None)
+    if stream is None:
+        text = fetch(url, body, headers, TIMEOUT)
+        received[0] = _nbytes(text)
+        return consume(iter((text,)))
+    chunks = stream(url, body, headers, TIMEOUT)
     try:
-        return fetch(url, body, headers, TIMEOUT)
-    except NaprError:
-        raise
-    except Exception as exc:  # noqa: BLE001 — surface any network/HTTP issue
-        raise NaprError("err_network", str(exc))
+        return consume(_counted(chunks, received))
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
 
 
-def _get_json(url, data=None, fetch=None):
-    raw = _get_text(url, data=data, fetch=fetch)
+def _counted(chunks, received):
+    """Pass chunks through, adding their size to ``received[0]``."""
+    for chunk in chunks:
+        received[0] += _nbytes(chunk)
+        yield chunk
+
+
+def _parse_json(raw):
     try:
         return json.loads(raw)
     except ValueError as exc:
         raise NaprError("err_invalid", str(exc))
 
 
+def _get_json(url, data=None, fetch=None, endpoint=None):
+    return _parse_json(_get_text(url, data=data, fetch=fetch, endpoint=endpoint))
+
+
+def set_base_url(base=None):
+    """Send every request to ``base`` (same paths) instead of maps.gov.ge —
+    e.g. the local replay server in ``benchmarks/``. ``None`` restores the
+    real service. Clears the result cache, which is not keyed by host."""
+    global SEARCH_URL, GETINFO_URL, GETINFO2_URL
+    base = (base or BASE_URL).rstrip("/")
+    SEARCH_URL = base + "/map/portal/search"
+    GETINFO_URL = base + "/lr/bo/mg/getinfo.alpha"
+    GETINFO2_URL = base + "/lr/bo/mg/getinfo2"
+    clear_cache()
+
+
 def clear_cache():
     _CACHE.clear()
 
 
+def set_cache(backend=None):
+    """Install a cache backend (see napr_cache); ``None`` restores the
+    in-memory default. The previous backend is closed."""
+    global _CACHE
+    old, _CACHE = _CACHE, backend if backend is not None else MemoryCache()
+    if old is not _CACHE:
+        old.close()
+
+
+def cache_stats():
+    """Hit/miss counters and size of the active cache backend."""
+    return _CACHE.stats()
+
+
+def set_code_index(index=None):
+    """Install a code index (see napr_index); ``None`` restores an empty
+    in-memory one. The previous index is closed."""
+    global _INDEX
+    old, _INDEX = _INDEX, index if index is not None else CodeIndex()
+    if old is not _INDEX:
+        old.close()
+
+
+def code_index_stats():
+    return _INDEX.stats()
+
+
+def index_matches(matches):
+    """Remember the code -> lbl of search / reverse matches (bulk import, e.g.
+    everything an area fetch found). Returns how many were stored."""
+    return _INDEX.put_many(matches)
+
+
+# A remembered lbl that now yields these no longer points at the parcel.
+_STALE_KEYS = ("err_no_geom", "err_empty_geom")
+
+
+def _indexed(code, metrics=None):
+    hit = _INDEX.get(code)
+    if hit is not None:
+        _hit("search", metrics)   # a search answered locally
+    return hit
+
+
+class _SingleFlight:
+    """Coalesce concurrent identical requests: the first caller for a key runs
+    the load, later callers block until it finishes and share its outcome.
+
+    Needed because several QgsTasks (area fetch, batch, map-click reverse then
+    features) can ask for the same lbl at once, and a cache check-then-fill is
+    not atomic across worker threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = {"done": threading.Event()}
+                    self.leaders += 1
+                else:
+                    self.coalesced += 1
+            if leader:
+                try:
+                    call["value"] = fn()
+                    return call["value"]
+                except BaseException as exc:
+                    call["error"] = exc
+                    raise
+                finally:
+                    with self._lock:
+                        self._calls.pop(key, None)
+                    call["done"].set()
+            call["done"].wait()
+            err = call.get("error")
+            if err is None:
+                return call["value"]
+            # The leader's task was cancelled — that says nothing about ours.
+            if getattr(err, "key", None) != "err_cancelled":
+                raise err
+            with self._lock:
+                self.coalesced -= 1
+
+    def stats(self):
+        with self._lock:
+            return {"leaders": self.leaders, "coalesced": self.coalesced,
+                    "in_flight": len(self._calls)}
+
+
+_FLIGHTS = _SingleFlight()
+
+
+def singleflight_stats():
+    """How many requests ran (``leaders``) and how many were saved because an
+    identical one was already in flight (``coalesced``)."""
+    return _FLIGHTS.stats()
+
+
+def cache_peek(kind, key):
+    """The cached result for (kind, key) or ``None`` — never touches the
+    network. Lets the GUI show an already prefetched parcel instantly."""
+    value = _CACHE.peek(kind, key)
+    if value is MISS:
+        return None
+    _METRICS.cache_hit(kind)
+    return _geom_rows(value) if kind == "features" else value
+
+
+def _cache_get(kind, key, metrics=None):
+    """``_CACHE.get`` that counts hits per endpoint (``kind`` doubles as the
+    endpoint name)."""
+    hit = _CACHE.get(kind, key)
+    if hit is not MISS:
+        _hit(kind, metrics)
+    return hit
+
+
+def _cached(kind, key, load, use_cache=True, metrics=None):
+    """Serve (kind, key) from the cache, else ``load()`` it — once across all
+    concurrent callers — and store the result."""
+    if not use_cache:
+        return load()
+    hit = _cache_get(kind, key, metrics)
+    if hit is not MISS:
+        return hit
+
+    def _fill():
+        # A previous leader may have filled the cache after our miss above.
+        value = _CACHE.peek(kind, key)
+        if value is MISS:
+            value = load()
+            _CACHE.put(kind, key, value)
+        else:
+            _hit(kind, metrics)
+        return value
+
+    return _FLIGHTS.do((kind, key), _fill)
+
+
 # --------------------------------------------------------------------------- #
 # Search (code -> matches)
 # --------------------------------------------------------------------------- #
@@ -126,13 +631,22 @@ def search(code, fetch=None, use_cache=True):
     if not code:
         raise NaprError("err_empty_code")
 
-    ckey = ("search", code)
-    if use_cache and ckey in _CACHE:
-        return _CACHE[ckey]
+    def _load():
+        data = _get_json(SEARCH_URL, data=_search_payload(code), fetch=fetch,
+                         endpoint="search")
+        matches = _parse_search(data, code)
+        _INDEX.put_many(matches)
+        return matches
+
+    return _cached("search", code, _load, use_cache, _metrics_of(fetch))
 
-    payload = urlencode({"keyword": code, "keyword_description": ""})
-    data = _get_json(SEARCH_URL, data=payload, fetch=fetch)
 
+def _search_payload(code):
+    return urlencode({"keyword": code, "keyword_description": ""})
+
+
+def _parse_search(data, code):
+    """Search JSON -> [{lbl, code, address}], exact code matches first."""
     out = []
     for r in data.get("result", []):
         lbl = _extract_lbl(r)
@@ -144,8 +658,6 @@ def search(code, fetch=None, use_cache=True):
             "address": r.get("descript") or r.get("resulttext") or "",
         })
     out.sort(key=lambda r: 0 if r["code"] == code else 1)
-    if use_cache:
-        _CACHE[ckey] = out
     return out
 
 
@@ -156,15 +668,23 @@ def fetch_features(lbl, fetch=None, use_cache=True):
     """Fetch ALL geometry rows for a label id.
 
     Returns a list of {id, code, wkt, epsg}. A parcel may return several rows
-    (e.g. the parcel plus buildings on it), so callers get all of them.
+    (e.g. the parcel plus buildings on it), so callers get all of them. The
+    geometry is held as compressed WKB (``"wkb"``); ``row["wkt"]`` still works
+    and ``cadastre_core.geometry_from_row`` decodes it without text parsing.
     """
-    ckey = ("features", lbl)
-    if use_cache and ckey in _CACHE:
-        return _CACHE[ckey]
+    return _geom_rows(_cached(
+        "features", lbl,
+        lambda: _parse_features(_get_json(_features_url(lbl), fetch=fetch,
+                                          endpoint="features")),
+        use_cache, _metrics_of(fetch)))
+
+
+def _features_url(lbl):
+    return "{}?lbl={}&lang=ka&res=shp".format(GETINFO_URL, lbl)
 
-    url = "{}?lbl={}&lang=ka&res=shp".format(GETINFO_URL, lbl)
-    data = _get_json(url, fetch=fetch)
 
+def _parse_features(data):
+    """getinfo.alpha (res=shp) JSON -> [{id, code, wkt, epsg}]."""
     rows = data.get("data") or []
     if not rows:
         raise NaprError("err_no_geom")
@@ -174,19 +694,27 @@ def fetch_features(lbl, fetch=None, use_cache=True):
         wkt = row.get("shape")
         if not wkt:
             continue
-        out.append({
-            "id": row.get("id"),
-            "code": row.get("name", ""),
-            "wkt": wkt,
-            "epsg": row.get("proj", "EPSG:4326"),
-        })
+        try:
+            out.append(compact_row({
+                "id": row.get("id"),
+                "code": row.get("name", ""),
+                "wkt": wkt,
+                "epsg": row.get("proj", "EPSG:4326"),
+            }))
+        except ValueError as exc:
+            raise NaprError("err_invalid", str(exc))
     if not out:
         raise NaprError("err_empty_geom")
-    if use_cache:
-        _CACHE[ckey] = out
     return out
 
 
+def _geom_rows(rows):
+    """Rows read back from a persistent cache are plain dicts; re-wrap them."""
+    if all(isinstance(r, GeomRow) for r in rows):
+        return rows
+    return [r if isinstance(r, GeomRow) else GeomRow(r) for r in rows]
+
+
 def fetch_wkt(lbl, fetch=None):
     """Backwards-compatible helper: first feature's (wkt, epsg)."""
     feats = fetch_features(lbl, fetch=fetch)
@@ -196,7 +724,6 @@ def fetch_wkt(lbl, fetch=None):
 # --------------------------------------------------------------------------- #
 # Attributes (lbl -> property info)  — no personal data
 # --------------------------------------------------------------------------- #
-_TAG_RE = re.compile(r"<[^>]+>")
 _WS_RE = re.compile(r"\s+")
 
 # Georgian labels on the service info card. We deliberately read only
@@ -206,44 +733,120 @@ _INFO_PATTERNS = {
     "parcel_type": re.compile(r"ნაკვეთის ტიპი\s+(.+?)\s+მისამართი"),
     "status": re.compile(r"საკადასტრო კოდი\s+[\d.]+\s+ფართობი"),  # presence check
 }
+_REGISTERED = u"რეგისტრირებულია"
+
+# Characters of already-scanned card text kept in front of each new chunk, so
+# a value split across two chunks is still matched. Far longer than any of the
+# three matches (label + value + unit).
+_INFO_OVERLAP = 256
 
 
 def fetch_info(lbl, fetch=None, use_cache=True):
     """Fetch non-personal property attributes for a label id.
 
     Returns {area_official, parcel_type, status}. Owner names and document
-    references are intentionally NOT extracted (personal data).
+    references are intentionally NOT extracted (personal data). The card is
+    read as a stream and the download stops once all three are found.
     """
-    ckey = ("info", lbl)
-    if use_cache and ckey in _CACHE:
-        return _CACHE[ckey]
-
-    url = "{}?lbl={}&lang=ka".format(GETINFO_URL, lbl)
-    html = _get_text(url, fetch=fetch)
-    text = _WS_RE.sub(" ", _TAG_RE.sub(" ", html)).strip()
-
-    info = {"area_official": None, "parcel_type": "", "status": ""}
-    m = _INFO_PATTERNS["area_official"].search(text)
-    if m:
-        num = m.group(1).replace(" ", "").replace(",", ".")
-        try:
-            info["area_official"] = float(num)
-        except ValueError:
-            pass
-    m = _INFO_PATTERNS["parcel_type"].search(text)
-    if m:
-        info["parcel_type"] = m.group(1).strip()
-    if u"რეგისტრირებულია" in text:
-        info["status"] = u"რეგისტრირებულია"
+    return _cached(
+        "info", lbl,
+        lambda: _get_streamed(_info_url(lbl), _read_info, fetch=fetch,
+                              endpoint="info"),
+        use_cache, _metrics_of(fetch))
+
+
+def _info_url(lbl):
+    return "{}?lbl={}&lang=ka".format(GETINFO_URL, lbl)
+
+
+def _parse_info(html):
+    """HTML info card -> {area_official, parcel_type, status} (no personal data)."""
+    return _read_info((html,))
 
-    if use_cache:
-        _CACHE[ckey] = info
-    return info
+
+def _read_info(chunks):
+    reader = _InfoReader()
+    for chunk in chunks:
+        reader.feed(chunk)
+        if reader.done:
+            break
+    else:
+        reader.close()
+    return reader.info
+
+
+class _InfoReader(HTMLParser):
+    """Incremental info-card extractor.
+
+    Turns the card into text with tags replaced by spaces and whitespace
+    collapsed (the same text the patterns were always matched against). After
+    every fed chunk only the new text, behind the last ``_INFO_OVERLAP``
+    characters already scanned, is checked against the patterns still
+    missing, so a long card costs linear time. ``done`` turns true once the
+    official area, the parcel type and the registration status have all been
+    seen. Only those three values ever leave the reader.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.info = {"area_official": None, "parcel_type": "", "status": ""}
+        self.done = False
+        self._parts = []
+        self._tail = ""
+        self._found = set()
+
+    def handle_starttag(self, tag, attrs):
+        self._parts.append(" ")
+
+    def handle_endtag(self, tag):
+        self._parts.append(" ")
+
+    def handle_data(self, data):
+        self._parts.append(data)
+
+    def handle_comment(self, data):
+        self._parts.append(" ")
+
+    def feed(self, data):
+        super().feed(data)
+        self._scan()
+
+    def close(self):
+        super().close()
+        self._scan()
+
+    def _scan(self):
+        new = _WS_RE.sub(" ", "".join(self._parts))
+        self._parts = []
+        if new[:1] == " " and self._tail[-1:] == " ":
+            new = new[1:]
+        text = self._tail + new
+        self._tail = text[-_INFO_OVERLAP:]
+        if "area" not in self._found:
+            m = _INFO_PATTERNS["area_official"].search(text)
+            if m:
+                self._found.add("area")
+                num = m.group(1).replace(" ", "").replace(",", ".")
+                try:
+                    self.info["area_official"] = float(num)
+                except ValueError:
+                    pass
+        if "type" not in self._found:
+            m = _INFO_PATTERNS["parcel_type"].search(text)
+            if m:
+                self._found.add("type")
+                self.info["parcel_type"] = m.group(1).strip()
+        if "status" not in self._found and _REGISTERED in text:
+            self._found.add("status")
+            self.info["status"] = _REGISTERED
+        self.done = len(self._found) == 3
 
 
 # --------------------------------------------------------------------------- #
 # Reverse lookup (lon/lat -> nearest parcels)
 # --------------------------------------------------------------------------- #
+# Record boundaries, then the fields searched inside each record's window.
+_REV_ID = re.compile(r'"id"\s*:')
 _REV_NAME = re.compile(r'"name"\s*:\s*"([^"]*)"')
 _REV_DESC = re.compile(r'"descript"\s*:\s*"([^"]*)"')
 _REV_LBL = re.compile(r'lbl=([A-Za-z0-9_:]+)')
@@ -254,56 +857,117 @@ def reverse(lon, lat, radius=50, limit=8, fetch=None):
     """Find parcels near a WGS84 point. Returns [{code, address, lbl, distance}].
 
     The getinfo2 payload is sometimes invalid JSON (unescaped quotes), so we
-    parse the fields we need with tolerant regexes rather than json.loads.
+    pull the fields we need with tolerant regexes rather than json.loads.
     """
+    raw = _get_text(_reverse_url(lon, lat, radius), fetch=fetch,
+                    endpoint="reverse")
+    return _parse_reverse(raw, limit)
+
+
+def _reverse_url(lon, lat, radius):
     query = urlencode({
         "LON": lon, "LAT": lat, "C": radius,
         "FRAME_NAME": "BY_COORDS_AND_COMPASS.GETINFO.MAPGOV",
     })
-    raw = _get_text("{}?{}".format(GETINFO2_URL, query), fetch=fetch)
+    return "{}?{}".format(GETINFO2_URL, query)
 
-    # Split into per-result chunks on the "id" key to keep fields aligned.
-    chunks = re.split(r'"id"\s*:', raw)[1:]
-    out = []
-    for chunk in chunks[:limit]:
-        name = _REV_NAME.search(chunk)
-        lbl = _REV_LBL.search(chunk)
-        if not name or not lbl:
-            continue
-        desc = _REV_DESC.search(chunk)
-        dist = _REV_DIST.search(chunk)
-        out.append({
-            "code": name.group(1),
-            "address": desc.group(1) if desc else "",
-            "lbl": lbl.group(1),
-            "distance": float(dist.group(1)) if dist else None,
-        })
-    return out
+
+def _parse_reverse(raw, limit):
+    """Tolerant getinfo2 parse -> [{code, address, lbl, distance}].
+
+    Records start at each ``"id":``; each field is searched only inside its
+    record. The payload is split at most ``limit + 1`` times, so records past
+    ``limit`` are never scanned or copied one by one. Records without a name
+    or lbl are skipped, so fewer than ``limit`` rows may come back.
+    """
+    if limit <= 0:
+        return []
+    rows = (_reverse_row(chunk)
+            for chunk in _REV_ID.split(raw, limit + 1)[1:limit + 1])
+    return [row for row in rows if row is not None]
+
+
+def _reverse_row(chunk):
+    name = _REV_NAME.search(chunk)
+    lbl = _REV_LBL.search(chunk) if name else None
+    if lbl is None:
+        return None
+    desc = _REV_DESC.search(chunk)
+    dist = _REV_DIST.search(chunk)
+    return {
+        "code": name.group(1),
+        "address": desc.group(1) if desc else "",
+        "lbl": lbl.group(1),
+        "distance": float(dist.group(1)) if dist else None,
+    }
 
 
 # --------------------------------------------------------------------------- #
 # High-level convenience
 # --------------------------------------------------------------------------- #
-def lookup(code, fetch=None, with_info=False):
-    """code -> {code, address, features:[...], info:{...}?}. Uses first match."""
-    matches = search(code, fetch=fetch)
-    if not matches:
-        raise NaprError("err_not_found", code)
-    first = matches[0]
-    features = fetch_features(first["lbl"], fetch=fetch)
-    result = {
-        "code": first["code"],
-        "address": first["address"],
-        "lbl": first["lbl"],
-        "features": features,
-        # Kept for backward compatibility with earlier callers/tests:
-        "wkt": features[0]["wkt"],
-        "epsg": features[0]["epsg"],
-        "info": None,
-    }
+def lookup(code, fetch=None, with_info=False, use_index=True):
+    """code -> {code, address, features:[...], info:{...}?}. Uses first match.
+
+    A code already in the code index skips the search request; if its lbl no
+    longer returns geometry the entry is dropped and a live search is made.
+    """
+    code = (code or "").strip()
+    first = _indexed(code, _metrics_of(fetch)) if use_index and code else None
+    if first is not None:
+        try:
+            features = fetch_features(first["lbl"], fetch=fetch)
+        except NaprError as exc:
+            if exc.key not in _STALE_KEYS:
+                raise
+            _INDEX.forget(code)
+            first = None
+    if first is None:
+        matches = search(code, fetch=fetch)
+        if not matches:
+            raise NaprError("err_not_found", code)
+        first = matches[0]
+        features = fetch_features(first["lbl"], fetch=fetch)
+    result = _lookup_result(first, features)
+    if with_info:
+        try:
+            result["info"] = fetch_info(first["lbl"], fetch=fetch)
+        except NaprError:
+            result["info"] = None
+    return result
+
+
+def lookup_match(match, fetch=None, with_info=False, cache_only=False):
+    """Like ``lookup`` for a match ``search`` already returned (no search
+    request). With ``cache_only`` nothing is fetched: the result is built from
+    the cache alone, or ``None`` if the geometry (or the info card, when
+    wanted) is not cached yet."""
+    first = dict(match, address=match.get("address", ""))
+    if cache_only:
+        features = cache_peek("features", first["lbl"])
+        info = cache_peek("info", first["lbl"]) if with_info else None
+        if features is None or (with_info and info is None):
+            return None
+        result = _lookup_result(first, features)
+        result["info"] = info
+        return result
+    result = _lookup_result(first, fetch_features(first["lbl"], fetch=fetch))
     if with_info:
         try:
             result["info"] = fetch_info(first["lbl"], fetch=fetch)
         except NaprError:
             result["info"] = None
     return result
+
+
+def _lookup_result(first, features):
+    result = GeomRow({
+        "code": first["code"],
+        "address": first["address"],
+        "lbl": first["lbl"],
+        "features": features,
+        # Kept for backward compatibility with earlier callers/tests
+        # (``result["wkt"]`` decodes on demand):
+        "epsg": features[0]["epsg"],
+        "info": None,
+    })
+    return copy_geometry(features[0], result)
@@ -0,0 +1,344 @@
+# -*- coding: utf-8 -*-
+"""Compact geometry storage for cached cadastre features.
+
+The service returns parcel geometry as WKT text, which is several times larger
+than the same geometry as WKB and has to be re-parsed on every use. Feature
+rows are therefore cached with the geometry as zlib-compressed ISO WKB
+(``"wkb"``) next to the row's EPSG code, and turned into a QgsGeometry straight
+from the binary (``cadastre_core.geometry_from_row``).
+
+``GeomRow`` keeps the historical ``row["wkt"]`` / ``row.get("wkt")`` access
+working: the service's own text is packed into the same compressed blob, after
+the WKB, and returned verbatim on demand (never stored back on the row). Blobs
+written without it decode to a WKT rebuilt from the WKB.
+
+Malformed WKT raises ``ValueError``; a geometry type the codec does not know
+raises ``UnsupportedGeometry`` and such rows simply keep their WKT.
+
+Pure standard library, like napr_client.
+"""
+import math
+import re
+import struct
+import zlib
+
+_TYPES = {
+    "POINT": 1, "LINESTRING": 2, "POLYGON": 3, "MULTIPOINT": 4,
+    "MULTILINESTRING": 5, "MULTIPOLYGON": 6, "GEOMETRYCOLLECTION": 7,
+}
+_NAMES = {v: k for k, v in _TYPES.items()}
+# ISO WKB type offsets and ordinate counts per dimension flag.
+_DIM_OFFSET = {"": 0, "Z": 1000, "M": 2000, "ZM": 3000}
+_DIM_SIZE = {"": 2, "Z": 3, "M": 3, "ZM": 4}
+
+_TOKEN_RE = re.compile(
+    r"[A-Za-z]+|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?|[(),]")
+_SRID_RE = re.compile(r"^\s*SRID=\d+\s*;", re.I)
+
+_COMPRESS_LEVEL = 6
+
+# First byte of an unpacked blob that carries the source WKT: the WKB length
+# follows, then the WKB, then the text. Plain WKB starts with 0 or 1.
+_WITH_TEXT = 2
+
+
+class UnsupportedGeometry(ValueError):
+    """Well-formed WKT of a type the codec does not encode."""
+
+
+# --------------------------------------------------------------------------- #
+# Row helpers
+# --------------------------------------------------------------------------- #
+class GeomRow(dict):
+    """Feature row whose ``"wkt"`` is decoded from the compact ``"wkb"``.
+
+    ``"wkt" in row`` is False for a compact row; use ``row["wkt"]`` or
+    ``row.get("wkt")``.
+    """
+
+    __slots__ = ()
+
+    def __missing__(self, key):
+        if key == "wkt" and "wkb" in self:
+            return unpack_wkt(self["wkb"])
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+def compact_row(row):
+    """Return ``row`` as a GeomRow with its ``"wkt"`` replaced by packed WKB
+    (the text itself rides along in the blob).
+
+    Geometry of a type the codec does not encode stays as WKT (still a valid
+    row); malformed WKT raises ValueError."""
+    out = GeomRow(row)
+    wkt = out.get("wkt")
+    if isinstance(wkt, str) and "wkb" not in out:
+        try:
+            out["wkb"] = pack(wkt_to_wkb(wkt), wkt)
+        except UnsupportedGeometry:
+            return out
+        del out["wkt"]
+    return out
+
+
+def copy_geometry(src, dst):
+    """Copy whichever geometry ``src`` carries (``wkb`` or ``wkt``) into ``dst``."""
+    if "wkb" in src:
+        dst["wkb"] = src["wkb"]
+    else:
+        dst["wkt"] = src["wkt"]
+    return dst
+
+
+def pack(wkb, wkt=None):
+    """Compress ``wkb``, with the ``wkt`` it came from if given."""
+    if wkt is not None:
+        wkb = (struct.pack("<BI", _WITH_TEXT, len(wkb)) + wkb
+               + wkt.encode("utf-8"))
+    return zlib.compress(wkb, _COMPRESS_LEVEL)
+
+
+def unpack(blob):
+    """The WKB inside a ``pack`` blob."""
+    return _split(zlib.decompress(blob))[0]
+
+
+def unpack_wkt(blob):
+    """The WKT a ``pack`` blob was made from (rebuilt if it was not kept)."""
+    wkb, wkt = _split(zlib.decompress(blob))
+    return wkt if wkt is not None else wkb_to_wkt(wkb)
+
+
+def _split(data):
+    if data[0] != _WITH_TEXT:
+        return data, None
+    (size,) = struct.unpack_from("<I", data, 1)
+    return data[5:5 + size], data[5 + size:].decode("utf-8")
+
+
+# --------------------------------------------------------------------------- #
+# WKT -> WKB
+# --------------------------------------------------------------------------- #
+class _Tokens:
+    def __init__(self, text):
+        self.items = _TOKEN_RE.findall(_SRID_RE.sub("", text))
+        self.pos = 0
+
+    def peek(self):
+        return self.items[self.pos] if self.pos < len(self.items) else ""
+
+    def next(self):
+        tok = self.peek()
+        if not tok:
+            raise ValueError("Unexpected end of WKT")
+        self.pos += 1
+        return tok
+
+    def expect(self, tok):
+        if self.next() != tok:
+            raise ValueError("Malformed WKT near token {}".format(self.pos))
+
+
+def wkt_to_wkb(wkt):
+    """Little-endian ISO WKB for a (2D/Z/M/ZM) OGC WKT string."""
+    tok = _Tokens(wkt)
+    geom = _parse_geometry(tok)
+    if tok.peek():
+        raise ValueError("Trailing data after WKT geometry")
+    buf = bytearray()
+    _write(geom, buf)
+    return bytes(buf)
+
+
+def _parse_geometry(tok):
+    name = tok.next().upper()
+    if name not in _TYPES:
+        raise UnsupportedGeometry("Unsupported WKT type: {}".format(name))
+    flag = ""
+    if tok.peek().upper() in ("Z", "M", "ZM"):
+        flag = tok.next().upper()
+    if tok.peek().upper() == "EMPTY":
+        tok.next()
+        return [name, flag, []]
+    if name == "GEOMETRYCOLLECTION":
+        body = _parse_list(tok, _parse_geometry)
+    else:
+        body = _BODY[name](tok)
+    if not flag:
+        flag = _infer_flag(name, body)
+    return [name, flag, body]
+
+
+def _parse_list(tok, item):
+    tok.expect("(")
+    out = [item(tok)]
+    while tok.peek() == ",":
+        tok.next()
+        out.append(item(tok))
+    tok.expect(")")
+    return out
+
+
+def _parse_coord(tok):
+    coord = []
+    while tok.peek() not in ("", ",", ")", "("):
+        coord.append(float(tok.next()))
+    if not 2 <= len(coord) <= 4:
+        raise ValueError("Bad WKT coordinate")
+    return tuple(coord)
+
+
+def _parse_points(tok):
+    return _parse_list(tok, _parse_coord)
+
+
+def _parse_point(tok):
+    tok.expect("(")
+    coord = _parse_coord(tok)
+    tok.expect(")")
+    return [coord]
+
+
+def _parse_multipoint_item(tok):
+    # Both "MULTIPOINT((1 2), (3 4))" and "MULTIPOINT(1 2, 3 4)" are in use.
+    if tok.peek() == "(":
+        return _parse_point(tok)[0]
+    return _parse_coord(tok)
+
+
+_BODY = {
+    "POINT": _parse_point,
+    "LINESTRING": _parse_points,
+    "POLYGON": lambda tok: _parse_list(tok, _parse_points),
+    "MULTIPOINT": lambda tok: _parse_list(tok, _parse_multipoint_item),
+    "MULTILINESTRING": lambda tok: _parse_list(tok, _parse_points),
+    "MULTIPOLYGON": lambda tok: _parse_list(
+        tok, lambda t: _parse_list(t, _parse_points)),
+}
+
+
+def _first_coord(body):
+    while isinstance(body, list):
+        if not body:
+            return None
+        body = body[0]
+    return body
+
+
+def _infer_flag(name, body):
+    if name == "GEOMETRYCOLLECTION":
+        return ""
+    coord = _first_coord(body)
+    return {2: "", 3: "Z", 4: "ZM"}[len(coord)] if coord else ""
+
+
+def _write(geom, buf):
+    name, flag, body = geom
+    buf += struct.pack("<BI", 1, _TYPES[name] + _DIM_OFFSET[flag])
+    n = _DIM_SIZE[flag]
+    if name == "POINT":
+        _write_coords(body or [(math.nan,) * n], n, buf, counted=False)
+    elif name == "LINESTRING":
+        _write_coords(body, n, buf)
+    elif name == "POLYGON":
+        _write_rings(body, n, buf)
+    elif name == "GEOMETRYCOLLECTION":
+        buf += struct.pack("<I", len(body))
+        for part in body:
+            _write(part, buf)
+    else:
+        child = {"MULTIPOINT": "POINT", "MULTILINESTRING": "LINESTRING",
+                 "MULTIPOLYGON": "POLYGON"}[name]
+        buf += struct.pack("<I", len(body))
+        for part in body:
+            _write([child, flag, [part] if child == "POINT" else part], buf)
+
+
+def _write_rings(rings, n, buf):
+    buf += struct.pack("<I", len(rings))
+    for ring in rings:
+        _write_coords(ring, n, buf)
+
+
+def _write_coords(coords, n, buf, counted=True):
+    flat = []
+    for c in coords:
+        if len(c) != n:
+            raise ValueError("Mixed coordinate dimensions in WKT")
+        flat.extend(c)
+    if counted:
+        buf += struct.pack("<I", len(coords))
+    buf += struct.pack("<{}d".format(len(flat)), *flat)
+
+
+# --------------------------------------------------------------------------- #
+# WKB -> WKT
+# --------------------------------------------------------------------------- #
+def wkb_to_wkt(wkb):
+    """OGC WKT text for ISO (or 2D/EWKB-flagged) WKB."""
+    text, _ = _read(memoryview(wkb), 0)
+    return text
+
+
+def _read(buf, pos):
+    order = "<" if buf[pos] == 1 else ">"
+    (code,) = struct.unpack_from(order + "I", buf, pos + 1)
+    pos += 5
+    flag = ""
+    if code & 0x20000000:                   # EWKB SRID: skip it
+        pos += 4
+    if code & 0xE0000000:
+        flag = ("Z" if code & 0x80000000 else "") + ("M" if code & 0x40000000 else "")
+        code &= 0x0FFFFFFF
+    else:
+        flag = {0: "", 1: "Z", 2: "M", 3: "ZM"}.get(code // 1000, "")
+        code %= 1000
+    name = _NAMES.get(code)
+    if name is None:
+        raise ValueError("Unsupported WKB type: {}".format(code))
+    n = _DIM_SIZE[flag]
+    head = name + (" " + flag if flag else "")
+
+    if name == "POINT":
+        coords = struct.unpack_from(order + "{}d".format(n), buf, pos)
+        pos += 8 * n
+        if all(math.isnan(v) for v in coords):
+            return head + " EMPTY", pos
+        return "{}({})".format(head, _fmt(coords)), pos
+    (count,) = struct.unpack_from(order + "I", buf, pos)
+    pos += 4
+    if count == 0:
+        return head + " EMPTY", pos
+    if name == "LINESTRING":
+        body, pos = _read_coords(buf, pos, order, n, count)
+        return "{}({})".format(head, body), pos
+    if name == "POLYGON":
+        rings = []
+        for _ in range(count):
+            (npts,) = struct.unpack_from(order + "I", buf, pos)
+            ring, pos = _read_coords(buf, pos + 4, order, n, npts)
+            rings.append("(" + ring + ")")
+        return "{}({})".format(head, ", ".join(rings)), pos
+    parts = []
+    for _ in range(count):
+        part, pos = _read(buf, pos)
+        if name != "GEOMETRYCOLLECTION":     # strip the child type name
+            part = part[part.index("("):] if "(" in part else "EMPTY"
+        parts.append(part)
+    return "{}({})".format(head, ", ".join(parts)), pos
+
+
+def _read_coords(buf, pos, order, n, count):
+    values = struct.unpack_from(order + "{}d".format(n * count), buf, pos)
+    coords = [_fmt(values[i:i + n]) for i in range(0, len(values), n)]
+    return ", ".join(coords), pos + 8 * n * count
+
+
+def _fmt(coord):
+    return " ".join(repr(v) for v in coord)
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""Local cadastral code -> label id (lbl) index for the cadastre client.
+
+Turning a code into its ``lr_parcels:...`` lbl costs a search POST on every
+lookup, yet the mapping almost never changes. napr_client remembers it here
+from every search it makes, and area fetches add every parcel they reverse-
+looked-up in bulk, so later lookups of those codes go straight to the geometry
+request. Unlike the result cache (napr_cache) entries do not expire: a stale
+one is detected when its lbl no longer returns geometry, dropped, and the
+lookup falls back to a live search.
+
+``CodeIndex()`` keeps the index in memory; ``CodeIndex(path)`` in a SQLite
+file (the plugin puts it under the QGIS profile), or in memory after all if
+that file cannot be opened (``path`` is then ``None``). Like ``SqliteCache``,
+any SQLite failure degrades to a miss rather than an error.
+
+Pure standard library.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+
+class CodeIndex:
+    """code -> {code, lbl, address}. Thread-safe (one shared connection)."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        try:
+            self._db = self._open(path)
+        except (OSError, sqlite3.Error):
+            # Unwritable profile folder, locked or corrupt file: keep the
+            # index for this session only.
+            self.errors += 1
+            self.path = None
+            self._db = self._open(None)
+
+    @staticmethod
+    def _open(path):
+        folder = os.path.dirname(path) if path else ""
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        db = sqlite3.connect(path or ":memory:", check_same_thread=False,
+                             isolation_level=None)
+        try:
+            if path:
+                try:
+                    db.execute("PRAGMA journal_mode=WAL")
+                except sqlite3.Error:
+                    pass
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS codes ("
+                " code TEXT PRIMARY KEY, lbl TEXT NOT NULL,"
+                " address TEXT NOT NULL DEFAULT '', updated REAL NOT NULL)")
+        except sqlite3.Error:
+            db.close()
+            raise
+        return db
+
+    def get(self, code):
+        """The entry for ``code`` or ``None``."""
+        with self._lock:
+            try:
+                row = self._db.execute(
+                    "SELECT lbl, address FROM codes WHERE code=?",
+                    (code,)).fetchone()
+            except sqlite3.Error:
+                self.errors += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return {"code": code, "lbl": row[0], "address": row[1]}
+
+    def put_many(self, matches):
+        """Remember ``{code, lbl[, address]}`` rows (search / reverse matches)
+        in one transaction. Returns how many were written."""
+        now = time.time()
+        rows = [(m["code"], m["lbl"], m.get("address") or "", now)
+                for m in matches if m.get("code") and m.get("lbl")]
+        if not rows:
+            return 0
+        with self._lock:
+            try:
+                self._db.execute("BEGIN")
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO codes (code, lbl, address, updated)"
+                    " VALUES (?, ?, ?, ?)", rows)
+                self._db.execute("COMMIT")
+            except sqlite3.Error:
+                self.errors += 1
+                try:
+                    self._db.execute("ROLLBACK")
+                except sqlite3.Error:
+                    pass
+                return 0
+        return len(rows)
+
+    def forget(self, code):
+        """Drop a stale entry (its lbl no longer resolves)."""
+        with self._lock:
+            self.stale += 1
+            try:
+                self._db.execute("DELETE FROM codes WHERE code=?", (code,))
+            except sqlite3.Error:
+                self.errors += 1
+
+    def clear(self):
+        with self._lock:
+            try:
+                self._db.execute("DELETE FROM codes")
+            except sqlite3.Error:
+                self.errors += 1
+
+    def stats(self):
+        with self._lock:
+            try:
+                entries = self._db.execute("SELECT COUNT(*) FROM codes").fetchone()[0]
+            except sqlite3.Error:
+                entries = None
+            return {"backend": "sqlite" if self.path else "memory",
+                    "entries": entries, "hits": self.hits,
+                    "misses": self.misses, "stale": self.stale,
+                    "errors": self.errors}
+
+    def close(self):
+        with self._lock:
+            try:
+                self._db.close()
+            except sqlite3.Error:
+                pass
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""Per-endpoint request metrics for the cadastre service client.
+
+napr_client records every HTTP attempt (latency, bytes received, failure)
+and every result-cache hit under the endpoint it belongs to — ``search``,
+``features``, ``info`` or ``reverse`` — so a slow batch shows where its time
+went. Latencies go into a fixed histogram (``LATENCY_BUCKETS_MS``), which
+keeps recording O(1) and lets two snapshots be subtracted to get the numbers
+of an interval::
+
+    before = napr_client.endpoint_stats()
+    ...                                   # run the batch
+    print(format_table(diff(napr_client.endpoint_stats(), before)))
+
+Those are process-wide. For the numbers of one task while others run, give
+the task its own ``EndpointMetrics`` through ``napr_client.metered(fetch)``.
+
+Pure standard library.
+"""
+import threading
+
+ENDPOINTS = ("search", "features", "info", "reverse")
+
+# Upper bounds (ms) of the latency histogram; one overflow bucket follows.
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_COUNTERS = ("requests", "errors", "retries", "bytes", "cache_hits",
+             "latency_ms_total")
+
+
+def _empty():
+    row = dict.fromkeys(_COUNTERS, 0)
+    row["latency_ms_max"] = 0.0
+    row["histogram"] = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+    return row
+
+
+class EndpointMetrics:
+    """Thread-safe per-endpoint counters (request attempts, not lookups: a
+    retried request counts once per attempt)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows = {}
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._rows = {name: _empty() for name in ENDPOINTS}
+
+    def _row(self, endpoint):
+        row = self._rows.get(endpoint)
+        if row is None:
+            row = self._rows[endpoint] = _empty()
+        return row
+
+    def record(self, endpoint, seconds, nbytes, ok=True):
+        """One HTTP attempt took ``seconds`` and delivered ``nbytes``."""
+        ms = seconds * 1000.0
+        slot = len(LATENCY_BUCKETS_MS)
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if ms <= bound:
+                slot = i
+                break
+        with self._lock:
+            row = self._row(endpoint or "other")
+            row["requests"] += 1
+            row["bytes"] += nbytes
+            row["latency_ms_total"] += ms
+            row["latency_ms_max"] = max(row["latency_ms_max"], ms)
+            row["histogram"][slot] += 1
+            if not ok:
+                row["errors"] += 1
+
+    def retry(self, endpoint):
+        """A failed attempt is about to be repeated."""
+        with self._lock:
+            self._row(endpoint or "other")["retries"] += 1
+
+    def cache_hit(self, endpoint):
+        with self._lock:
+            self._row(endpoint)["cache_hits"] += 1
+
+    def retries(self):
+        with self._lock:
+            return sum(row["retries"] for row in self._rows.values())
+
+    def snapshot(self):
+        """``{endpoint: {requests, errors, retries, bytes, cache_hits,
+        latency_ms_total, latency_ms_max, histogram}}`` (a deep copy)."""
+        with self._lock:
+            return {name: dict(row, histogram=list(row["histogram"]))
+                    for name, row in self._rows.items()}
+
+
+def diff(after, before):
+    """``after - before`` for two snapshots. ``latency_ms_max`` cannot be
+    subtracted, so the later value is kept."""
+    out = {}
+    for name, row in after.items():
+        old = before.get(name) or _empty()
+        new = {key: row[key] - old[key] for key in _COUNTERS}
+        new["latency_ms_max"] = row["latency_ms_max"]
+        new["histogram"] = [a - b for a, b in zip(row["histogram"],
+                                                  old["histogram"])]
+        out[name] = new
+    return out
+
+
+def percentile_ms(row, pct):
+    """Upper bound (ms) of the histogram bucket holding the ``pct``-th
+    percentile; ``None`` with no requests, ``inf`` in the overflow bucket."""
+    total = sum(row["histogram"])
+    if not total:
+        return None
+    need = pct / 100.0 * total
+    seen = 0
+    for i, count in enumerate(row["histogram"]):
+        seen += count
+        if seen >= need:
+            break
+    return LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else float("inf")
+
+
+def format_table(stats, histogram=False):
+    """Fixed-width text table of a snapshot (for the QGIS log / the dialogs).
+    Percentiles are histogram bucket bounds, hence the ``≤``."""
+    lines = ["{:<9}{:>6}{:>5}{:>7}{:>9}{:>8}{:>8}{:>8}{:>8}".format(
+        "endpoint", "req", "err", "cache", "KiB", "mean", "p50", "p95", "max")]
+    for name, row in stats.items():
+        n = row["requests"]
+        lines.append("{:<9}{:>6}{:>5}{:>7}{:>9.1f}{:>8}{:>8}{:>8}{:>8}".format(
+            name, n, row["errors"], row["cache_hits"], row["bytes"] / 1024.0,
+            _ms(row["latency_ms_total"] / n if n else None),
+            _bound(percentile_ms(row, 50)), _bound(percentile_ms(row, 95)),
+            _ms(row["latency_ms_max"] if n else None)))
+    if histogram:
+        bounds = ["≤{}".format(b) for b in LATENCY_BUCKETS_MS] + [
+            ">{}".format(LATENCY_BUCKETS_MS[-1])]
+        lines.append("")
+        lines.append("{:<9}".format("ms") + "".join(
+            "{:>7}".format(b) for b in bounds))
+        for name, row in stats.items():
+            if row["requests"]:
+                lines.append("{:<9}".format(name) + "".join(
+                    "{:>7}".format(c) for c in row["histogram"]))
+    return "\n".join(lines)
+
+
+def _ms(value):
+    return "-" if value is None else "{:.0f}".format(value)
+
+
+def _bound(value):
+    if value is None:
+        return "-"
+    if value == float("inf"):
+        return ">{}".format(LATENCY_BUCKETS_MS[-1])
+    return "≤{}".format(value)
@@ -10,11 +10,18 @@ attachment and packaged export.
 """
 import os
 
+from qgis.core import QgsApplication, QgsMessageLog, QgsProject, Qgis
 from qgis.PyQt.QtGui import QIcon
 from qgis.PyQt.QtWidgets import QAction
 
 from .cadastre_dialog import _detect_lang
+from . import cadastre_core
+from . import concurrency
 from . import i18n
+from . import napr_cache
+from . import napr_client
+from . import napr_index
+from . import tasks
 
 # Menu/action label follows the QGIS UI locale; the dialog can still be switched
 # on the fly. Show both names so it is findable either way.
@@ -23,6 +30,11 @@ MENU = u"{} / {}".format(
 ) if _detect_lang() == "ka" else i18n.t("window_title", "en")
 
 
+def profile_data_dir():
+    """Per-profile folder for the plugin's persistent data (cache, journals)."""
+    return os.path.join(QgsApplication.qgisSettingsDirPath(), "georgian_cadastre")
+
+
 class GeorgianCadastrePlugin:
     def __init__(self, iface):
         self.iface = iface
@@ -38,6 +50,28 @@ class GeorgianCadastrePlugin:
         self.action.triggered.connect(self.run)
         self.iface.addPluginToWebMenu(MENU, self.action)
         self.iface.addWebToolBarIcon(self.action)
+        self._install_cache()
+        concurrency.set_rate(tasks.request_rate())
+        QgsProject.instance().transformContextChanged.connect(
+            cadastre_core.clear_transform_cache)
+
+    def _install_cache(self):
+        """Persist service results and the code -> lbl index across QGIS
+        restarts (falls back to memory if the profile folder is not writable)."""
+        path = os.path.join(profile_data_dir(), "napr_cache.sqlite")
+        try:
+            napr_client.set_cache(napr_cache.SqliteCache(path))
+        except Exception as exc:  # noqa: BLE001
+            QgsMessageLog.logMessage(
+                "Persistent cache disabled: {}".format(exc),
+                "Georgian Cadastre", Qgis.Warning)
+        path = os.path.join(profile_data_dir(), "napr_codes.sqlite")
+        try:
+            napr_client.set_code_index(napr_index.CodeIndex(path))
+        except Exception as exc:  # noqa: BLE001
+            QgsMessageLog.logMessage(
+                "Persistent code index disabled: {}".format(exc),
+                "Georgian Cadastre", Qgis.Warning)
 
     def unload(self):
         if self.action is not None:
@@ -47,6 +81,13 @@ class GeorgianCadastrePlugin:
         if self.dlg is not None:
             self.dlg.close()
             self.dlg = None
+        napr_client.set_cache(None)
+        napr_client.set_code_index(None)
+        try:
+            QgsProject.instance().transformContextChanged.disconnect(
+                cadastre_core.clear_transform_cache)
+        except TypeError:
+            pass
 
     def run(self):
         # Reuse a single hub dialog instance so state persists between opens.
@@ -8,10 +8,33 @@ plugin respects the user's QGIS network configuration.
 """
 from qgis.core import QgsBlockingNetworkRequest
 from qgis.PyQt.QtCore import QByteArray, QUrl
-from qgis.PyQt.QtNetwork import QNetworkRequest
+from qgis.PyQt.QtNetwork import QNetworkReply, QNetworkRequest
 
 from .napr_client import NaprError
 
+# Reply errors that are usually a passing hiccup rather than a real failure —
+# napr_client retries these with backoff (see napr_client._get_text).
+_TRANSIENT_REPLY_ERRORS = {
+    QNetworkReply.RemoteHostClosedError,
+    QNetworkReply.TimeoutError,
+    QNetworkReply.TemporaryNetworkFailureError,
+    QNetworkReply.NetworkSessionFailedError,
+    QNetworkReply.ProxyTimeoutError,
+    QNetworkReply.InternalServerError,
+    QNetworkReply.ServiceUnavailableError,
+    QNetworkReply.UnknownServerError,
+}
+
+
+def _is_transient(blocking, err):
+    if err == QgsBlockingNetworkRequest.TimeoutError:
+        return True
+    reply = blocking.reply()
+    status = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
+    if status is not None and (int(status) >= 500 or int(status) in (408, 429)):
+        return True
+    return reply.error() in _TRANSIENT_REPLY_ERRORS
+
 
 def qgis_fetch(url, data, headers, timeout):
     """Signature matches napr_client's fetcher contract. Returns body text."""
@@ -28,7 +51,8 @@ def qgis_fetch(url, data, headers, timeout):
         err = blocking.post(request, QByteArray(data), forceRefresh=True)
 
     if err != QgsBlockingNetworkRequest.NoError:
-        raise NaprError("err_network", blocking.errorMessage())
+        raise NaprError("err_network", blocking.errorMessage(),
+                        retryable=_is_transient(blocking, err))
 
     reply = blocking.reply()
     return bytes(reply.content()).decode("utf-8", "replace")
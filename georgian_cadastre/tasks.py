@@ -6,11 +6,72 @@ worker thread and stores ``result`` / ``error``. Connect to the standard
 ``taskCompleted`` / ``taskTerminated`` signals to read them back on the GUI
 thread.
 """
-from qgis.core import QgsTask
+import os
 
+from qgis.core import (
+    Qgis,
+    QgsCoordinateReferenceSystem,
+    QgsFields,
+    QgsMessageLog,
+    QgsProject,
+    QgsSettings,
+    QgsTask,
+    QgsVectorLayerFeatureSource,
+)
+from qgis.PyQt.QtCore import pyqtSignal
+
+from . import cadastre_core
+from . import concurrency
 from . import napr_client
+from . import napr_metrics
 from .qgis_net import qgis_fetch
 
+# Concurrent batch default: lookups in flight.
+BATCH_WORKERS = 4
+
+# The politeness limit in HTTP requests per second shared by every task (one
+# concurrency.shared_bucket()); 0 = unlimited. Stored in the QGIS settings.
+RATE_KEY = "georgian_cadastre/request_rate"
+BATCH_RATE = concurrency.DEFAULT_RATE
+
+# Successful lookups handed to the GUI per chunkReady emission when streaming.
+BATCH_CHUNK = 25
+
+# Search matches (besides the first, which loads right away) whose geometry is
+# prefetched while the user is still choosing in the picker.
+PREFETCH_TOP = 3
+
+# When true, BatchTask / AreaFetchTask write their per-endpoint request stats
+# to the QGIS message log when they finish (both dialogs expose the toggle).
+LOG_STATS_KEY = "georgian_cadastre/log_endpoint_stats"
+LOG_TAG = "Georgian Cadastre"
+
+
+def log_stats_enabled():
+    return QgsSettings().value(LOG_STATS_KEY, False, type=bool)
+
+
+def set_log_stats(enabled):
+    QgsSettings().setValue(LOG_STATS_KEY, bool(enabled))
+
+
+def request_rate():
+    return QgsSettings().value(RATE_KEY, BATCH_RATE, type=float)
+
+
+def set_request_rate(rate):
+    """Save the shared request rate and apply it to running tasks too."""
+    rate = max(0.0, float(rate or 0.0))
+    QgsSettings().setValue(RATE_KEY, rate)
+    concurrency.set_rate(rate)
+
+
+def log_endpoint_stats(title, stats):
+    """Write a napr_metrics table to the QGIS log (safe from any thread)."""
+    QgsMessageLog.logMessage(
+        u"{}\n{}".format(title, napr_metrics.format_table(stats, histogram=True)),
+        LOG_TAG, Qgis.Info)
+
 
 class CallTask(QgsTask):
     """Run ``fn()`` off the GUI thread. ``result``/``error`` set on finish."""
@@ -47,22 +108,15 @@ def search_task(code):
 
 
 def _resolve_match(match, with_info):
-    feats = napr_client.fetch_features(match["lbl"], fetch=qgis_fetch)
-    info = None
-    if with_info:
-        try:
-            info = napr_client.fetch_info(match["lbl"], fetch=qgis_fetch)
-        except napr_client.NaprError:
-            info = None
-    return {
-        "code": match["code"],
-        "address": match.get("address", ""),
-        "lbl": match["lbl"],
-        "features": feats,
-        "info": info,
-        "wkt": feats[0]["wkt"],
-        "epsg": feats[0]["epsg"],
-    }
+    return napr_client.lookup_match(match, fetch=qgis_fetch,
+                                    with_info=with_info)
+
+
+def cached_match(match, with_info=False):
+    """``_resolve_match`` answered from the result cache alone, or ``None`` if
+    the geometry (or the info card, when wanted) is not cached yet."""
+    return napr_client.lookup_match(match, with_info=with_info,
+                                    cache_only=True)
 
 
 def features_task(match, with_info=False):
@@ -83,31 +137,177 @@ def reverse_task(lon, lat, radius=50, limit=8):
 
 
 class BatchTask(QgsTask):
-    """Resolve many codes sequentially, reporting progress. ``result`` is a list
-    of ``{code, ok, data|error}`` dicts (one per input code)."""
+    """Resolve many codes, reporting progress. ``result`` is a list of
+    ``{code, ok, data|error}`` dicts (one per non-empty input code, in input
+    order).
 
-    def __init__(self, codes, with_info=False):
+    ``workers`` lookups run concurrently (1 = the old sequential mode) and all
+    of their HTTP requests draw from the process-wide request-rate bucket
+    (``concurrency.shared_bucket()``, see ``set_request_rate``) and request
+    slots (``concurrency.shared_slots()``), like every other task's.
+    While the service is down (circuit open) the batch pauses instead of
+    failing codes. ``stats`` counts codes, failures and network retries;
+    ``endpoint_stats`` holds the per-endpoint request numbers of the run
+    (logged on finish when ``log_stats``, default: the saved preference).
+
+    With ``stream=True`` successful results are not kept: they are emitted in
+    input order through ``chunkReady(list)`` every ``chunk`` lookups (the last
+    partial chunk on the GUI thread in ``finished``), and ``result`` keeps only
+    ``{code, ok}`` for them — so the GUI can append as they arrive and nothing
+    piles up in memory.
+    """
+
+    chunkReady = pyqtSignal(list)
+
+    def __init__(self, codes, with_info=False, workers=1,
+                 stream=False, chunk=BATCH_CHUNK, log_stats=None):
         super().__init__("Georgian Cadastre: batch ({})".format(len(codes)),
                          QgsTask.CanCancel)
         self._codes = codes
         self._with_info = with_info
+        self._workers = max(1, int(workers or 1))
+        self._stream = stream
+        self._chunk = max(1, int(chunk))
+        self._pending = []
         self.result = []
         self.error = None
+        self.stats = {"codes": 0, "ok": 0, "failed": 0, "retries": 0}
+        self.endpoint_stats = {}
+        self._metrics = napr_metrics.EndpointMetrics()
+        self._log_stats = log_stats_enabled() if log_stats is None else log_stats
 
     def run(self):
-        total = len(self._codes) or 1
-        for i, code in enumerate(self._codes):
-            if self.isCanceled():
-                return False
-            code = (code or "").strip()
-            if not code:
-                continue
-            try:
-                data = napr_client.lookup(code, fetch=qgis_fetch,
-                                          with_info=self._with_info)
-                self.result.append({"code": code, "ok": True, "data": data})
-            except Exception as exc:  # noqa: BLE001
+        try:
+            return self._run()
+        finally:
+            self.stats["retries"] = self._metrics.retries()
+            self.endpoint_stats = self._metrics.snapshot()
+
+    def _run(self):
+        codes = [c.strip() for c in self._codes if (c or "").strip()]
+        self.stats["codes"] = len(codes)
+        total = len(codes) or 1
+        fetch = napr_client.metered(
+            concurrency.shared(qgis_fetch, self.isCanceled), self._metrics)
+
+        def _lookup(code):
+            return napr_client.lookup(code, fetch=fetch,
+                                      with_info=self._with_info)
+
+        _lookup = concurrency.when_up(_lookup, self.isCanceled)
+
+        done = 0
+        for _i, code, ok, value in concurrency.run_ordered(
+                _lookup, codes, self._workers, self.isCanceled):
+            if ok and self._stream:
+                self.result.append({"code": code, "ok": True})
+                self._pending.append({"code": code, "ok": True, "data": value})
+                if len(self._pending) >= self._chunk:
+                    chunk, self._pending = self._pending, []
+                    self.chunkReady.emit(chunk)
+                self.stats["ok"] += 1
+            elif ok:
+                self.result.append({"code": code, "ok": True, "data": value})
+                self.stats["ok"] += 1
+            else:
                 self.result.append({"code": code, "ok": False,
-                                    "error": str(exc)})
-            self.setProgress(100.0 * (i + 1) / total)
-        return True
+                                    "error": str(value)})
+                self.stats["failed"] += 1
+            done += 1
+            self.setProgress(100.0 * done / total)
+        return not self.isCanceled()
+
+    def finished(self, result):  # GUI thread
+        if self._pending:
+            chunk, self._pending = self._pending, []
+            self.chunkReady.emit(chunk)
+        if self._log_stats:
+            log_endpoint_stats(u"{} — {} ok, {} failed".format(
+                self.description(), self.stats["ok"], self.stats["failed"]),
+                self.endpoint_stats)
+
+
+class PrefetchTask(QgsTask):
+    """Warm the result cache with the geometry (+info) of several search
+    matches, so picking one of them needs no round trip (see ``cached_match``).
+
+    Runs at most ``workers`` requests at once, and those take their slots and
+    tokens from the same process-wide limits as BatchTask and the area
+    download (``concurrency.shared``), so a prefetch started next to them
+    does not add to the requests in flight. Failures are ignored — the pick simply falls back
+    to a normal ``features_task``. ``result`` counts the matches warmed.
+    A request already in flight when the user picks is shared, not repeated
+    (napr_client coalesces identical requests).
+    """
+
+    def __init__(self, matches, with_info=False, workers=BATCH_WORKERS):
+        super().__init__("Georgian Cadastre: prefetch ({})".format(len(matches)),
+                         QgsTask.CanCancel)
+        self._lbls = [m["lbl"] for m in matches]
+        self._with_info = with_info
+        self._workers = max(1, min(int(workers or 1), len(self._lbls)))
+        self.result = 0
+        self.error = None
+
+    def run(self):  # worker thread
+        fetch = concurrency.shared(qgis_fetch, self.isCanceled)
+
+        def _warm(lbl):
+            napr_client.fetch_features(lbl, fetch=fetch)
+            if self._with_info:
+                try:
+                    napr_client.fetch_info(lbl, fetch=fetch)
+                except napr_client.NaprError:
+                    pass
+
+        total = len(self._lbls) or 1
+        done = 0
+        for _i, _lbl, ok, _value in concurrency.run_ordered(
+                _warm, self._lbls, self._workers, self.isCanceled):
+            self.result += ok
+            done += 1
+            self.setProgress(100.0 * done / total)
+        return not self.isCanceled()
+
+
+class ExportTask(QgsTask):
+    """Export a layer in the background (any ``cadastre_core.EXTENSIONS`` format).
+
+    The worker reads a QgsVectorLayerFeatureSource snapshot taken here on the
+    GUI thread, never the layer itself. ``result`` is what the cadastre_core
+    exporter returns: ``""`` on success, an i18n key (``err_empty_layer`` /
+    ``err_cancelled``) or the raw driver / OS error message.
+    """
+
+    def __init__(self, layer, fmt, path, decimals=3):
+        super().__init__("Georgian Cadastre: {} {}".format(
+            fmt, os.path.basename(path)), QgsTask.CanCancel)
+        self.fmt = fmt.upper()
+        self.path = path
+        self._decimals = decimals
+        self._source = QgsVectorLayerFeatureSource(layer)
+        self._fields = QgsFields(layer.fields())
+        self._wkb_type = layer.wkbType()
+        self._crs = QgsCoordinateReferenceSystem(layer.crs())
+        self._context = QgsProject.instance().transformContext()
+        self._total = layer.featureCount()
+        self.result = None
+        self.error = None
+
+    def run(self):  # worker thread
+        try:
+            if self.fmt == "CSV":
+                self.result = cadastre_core.export_csv_vertices(
+                    self._source, self.path, self._decimals,
+                    progress=self.setProgress, should_stop=self.isCanceled,
+                    total=self._total)
+            else:
+                self.result = cadastre_core.write_layer(
+                    self._source, self._fields, self._wkb_type, self._crs,
+                    self.fmt, self.path, context=self._context,
+                    progress=self.setProgress, should_stop=self.isCanceled,
+                    total=self._total)
+            return True
+        except Exception as exc:  # noqa: BLE001 — reported to the GUI thread
+            self.error = exc
+            return False
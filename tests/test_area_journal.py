@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""Area download journal: record, resume and torn-tail repair (no QGIS).
+
+Run from the repository root::
+
+    python -m unittest discover tests
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from georgian_cadastre.drawing.core.area_journal import AreaJournal  # noqa: E402
+from georgian_cadastre.napr_geom import GeomRow, compact_row  # noqa: E402
+
+JOB = {"zone": 38, "sampling": "grid", "per_radius": 30, "limit": 15}
+MATCHES = [{"code": "01.10.01.001", "lbl": "L1", "address": u"თბილისი",
+            "distance": 3.5}]
+
+
+class AreaJournalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, "area", "job.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def create(self):
+        journal = AreaJournal.create(self.path, JOB)
+        self.addCleanup(journal.close)
+        return journal
+
+    def load(self):
+        journal = AreaJournal.load(self.path)
+        if journal is not None:
+            self.addCleanup(journal.close)
+        return journal
+
+    def lines(self):
+        with open(self.path, encoding="utf-8") as fh:
+            return fh.read().split("\n")
+
+    def test_resume_replays_lookups_and_geometry(self):
+        row = compact_row({"id": 1, "code": "01.10.01.001",
+                           "wkt": "POLYGON((44.8 41.7,44.9 41.7,44.8 41.8,44.8 41.7))",
+                           "epsg": "EPSG:4326"})
+        journal = self.create()
+        journal.record_reverse("0", MATCHES)
+        journal.record_reverse("1", [])
+        journal.record_parcel("L1", [row])
+        journal.close()
+
+        again = self.load()
+        self.assertEqual(again.job, JOB)
+        self.assertFalse(again.complete)
+        self.assertEqual(again.stats(), {"lookups": 2, "parcels": 1})
+        self.assertEqual(again.matches("0"), [
+            {"code": "01.10.01.001", "lbl": "L1", "address": u"თბილისი"}])
+        self.assertEqual(again.matches("1"), [])
+        self.assertIsNone(again.matches("2"))
+        self.assertIsNone(again.rows("L2"))
+        rows = again.rows("L1")
+        self.assertIsInstance(rows[0], GeomRow)
+        self.assertIsInstance(rows[0]["wkb"], bytes)
+        self.assertEqual(rows[0]["wkb"], row["wkb"])
+        self.assertEqual(rows[0]["wkt"], row["wkt"])
+
+    def test_pending_until_finished(self):
+        self.assertFalse(AreaJournal.pending(self.path))       # no file
+        journal = self.create()
+        journal.record_reverse("0", MATCHES)
+        self.assertTrue(AreaJournal.pending(self.path))
+        journal.finish()
+        journal.close()
+        self.assertFalse(AreaJournal.pending(self.path))
+        self.assertTrue(self.load().complete)
+
+    def test_load_without_header(self):
+        self.assertIsNone(self.load())
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w", encoding="utf-8") as fh:
+            fh.write('{"rev":"0","m":[]}\n')
+        self.assertIsNone(self.load())
+
+    def test_torn_tail_is_cut_before_appending(self):
+        journal = self.create()
+        journal.record_reverse("0", MATCHES)
+        journal.close()
+        with open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(u'{"rev":"1","m":[{"code":"01.1')      # crash mid-write
+
+        resumed = self.load()
+        self.assertIsNone(resumed.matches("1"))
+        resumed.record_reverse("1", [])
+        resumed.record_reverse("2", MATCHES)
+        resumed.close()
+
+        lines = self.lines()
+        self.assertEqual(lines[-1], "")
+        for line in lines[:-1]:
+            json.loads(line)                                    # all whole
+        again = self.load()
+        self.assertEqual(again.stats(), {"lookups": 3, "parcels": 0})
+        self.assertEqual(again.matches("1"), [])
+
+    def test_torn_tail_longer_than_a_block(self):
+        journal = self.create()
+        journal.close()
+        with open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(u'{"lbl":"L9","rows":[' + u"ა" * 5000)
+        resumed = self.load()
+        resumed.record_parcel("L2", [])
+        resumed.close()
+        self.assertEqual(len(self.lines()), 3)                  # job, L2, ""
+        self.assertEqual(self.load().stats(), {"lookups": 0, "parcels": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""Outage handling of the worker pipeline (napr_client + concurrency).
+
+Pure standard library, no QGIS and no network: the fetchers are fakes.
+Run from the repository root::
+
+    python -m unittest discover tests
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+from urllib.parse import parse_qs
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from georgian_cadastre import concurrency, napr_async, napr_client  # noqa: E402
+from georgian_cadastre.napr_cache import MemoryCache  # noqa: E402
+
+PAYLOAD = ('[{"id":1,"name":"01.10.01.001","descript":"Tbilisi",'
+           '"url":"getinfo.alpha?lbl=L1","distance":"3.5"}]')
+
+
+class FlakyService:
+    """A fetcher that resets every connection until ``down_for`` seconds
+    after its first request, then answers normally."""
+
+    def __init__(self, down_for):
+        self.down_for = down_for
+        self.failures = 0
+        self._until = None
+        self._lock = threading.Lock()
+
+    def __call__(self, url, data, headers, timeout):
+        with self._lock:
+            if self._until is None:
+                self._until = time.monotonic() + self.down_for
+            down = time.monotonic() < self._until
+            self.failures += down
+        if down:
+            raise ConnectionResetError("connection reset by peer")
+        return PAYLOAD
+
+
+class BreakerTest(unittest.TestCase):
+
+    def setUp(self):
+        self._saved = (napr_client._BREAKER, napr_client.BACKOFF_BASE)
+        napr_client._BREAKER = napr_client.CircuitBreaker(threshold=2,
+                                                          cooldown=0.05)
+        napr_client.BACKOFF_BASE = 0.001
+
+    def tearDown(self):
+        napr_client._BREAKER, napr_client.BACKOFF_BASE = self._saved
+
+    def test_trip_raises_service_down(self):
+        fetch = FlakyService(down_for=60)
+        with self.assertRaises(napr_client.NaprError) as ctx:
+            napr_client.reverse(44.8, 41.7, fetch=fetch)
+        self.assertEqual(ctx.exception.key, "err_service_down")
+        self.assertTrue(ctx.exception.retryable)
+        self.assertEqual(fetch.failures, 2)     # the threshold, no more
+
+    def test_when_up_keeps_items_across_trip_and_recovery(self):
+        fetch = FlakyService(down_for=0.3)
+        items = list(range(20))
+
+        def _reverse(i):
+            return napr_client.reverse(44.8 + i * 1e-4, 41.7, fetch=fetch)
+
+        results = list(concurrency.run_ordered(
+            concurrency.when_up(_reverse), items, workers=4))
+
+        self.assertGreaterEqual(napr_client._BREAKER.trips, 1)
+        self.assertGreater(fetch.failures, 0)
+        self.assertEqual([r[0] for r in results], items)
+        failed = [(i, v) for i, _item, ok, v in results if not ok]
+        self.assertEqual(failed, [])
+        self.assertTrue(all(v[0]["lbl"] == "L1" for *_rest, v in results))
+        self.assertEqual(napr_client._BREAKER.state(), "closed")
+
+
+class InFlight:
+    """A fetcher that records how many calls overlap at most."""
+
+    def __init__(self):
+        self.now = self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, url, data, headers, timeout):
+        with self._lock:
+            self.now += 1
+            self.peak = max(self.peak, self.now)
+        time.sleep(0.01)
+        with self._lock:
+            self.now -= 1
+        return PAYLOAD
+
+
+class SharedSlotsTest(unittest.TestCase):
+
+    def test_pools_share_one_cap(self):
+        inner = InFlight()
+        slots = threading.BoundedSemaphore(3)
+        fetchers = [concurrency.capped(inner, slots) for _ in range(2)]
+
+        def _pool(fetch):
+            list(concurrency.run_ordered(
+                lambda i: fetch("u", None, {}, 5), range(12), workers=4))
+
+        threads = [threading.Thread(target=_pool, args=(f,)) for f in fetchers]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(inner.peak, 3)
+
+    def test_shared_applies_the_process_limits(self):
+        fetch = concurrency.shared(InFlight(), lambda: False)
+        self.assertEqual(fetch("u", None, {}, 5), PAYLOAD)
+        self.assertTrue(callable(fetch.should_stop))
+
+
+class BackoffTest(unittest.TestCase):
+
+    def setUp(self):
+        self._saved = (napr_client._BREAKER, napr_client.BACKOFF_BASE,
+                       napr_client.BACKOFF_MAX)
+        napr_client._BREAKER = napr_client.CircuitBreaker(threshold=100)
+        napr_client.BACKOFF_BASE = napr_client.BACKOFF_MAX = 30.0
+
+    def tearDown(self):
+        (napr_client._BREAKER, napr_client.BACKOFF_BASE,
+         napr_client.BACKOFF_MAX) = self._saved
+
+    def test_cancel_cuts_the_backoff_short(self):
+        deadline = time.monotonic() + 0.2
+        fetch = concurrency.throttled(
+            FlakyService(down_for=60), concurrency.TokenBucket(0),
+            lambda: time.monotonic() > deadline)
+        fetch = napr_client.metered(fetch)
+        started = time.monotonic()
+        with self.assertRaises(napr_client.NaprError) as ctx:
+            napr_client.reverse(44.8, 41.7, fetch=fetch)
+        self.assertEqual(ctx.exception.key, "err_cancelled")
+        self.assertLess(time.monotonic() - started, 2.0)
+
+
+class AsyncFlakyService(FlakyService):
+    """The awaitable twin: answers search and getinfo.alpha once it is up."""
+
+    async def __call__(self, url, data, headers, timeout):
+        await asyncio.sleep(0)
+        FlakyService.__call__(self, url, data, headers, timeout)
+        if "search" in url:
+            code = parse_qs(data.decode("utf-8"))["keyword"][0]
+            return json.dumps({"result": [
+                {"name": code, "resultlink": "getinfo.alpha?lbl=L" + code}]})
+        return json.dumps({"data": [
+            {"id": 1, "name": "x", "shape": "POINT(44.8 41.7)",
+             "proj": "EPSG:4326"}]})
+
+
+class AsyncBreakerTest(unittest.TestCase):
+
+    setUp = BreakerTest.setUp
+    tearDown = BreakerTest.tearDown
+
+    def test_lookup_many_waits_out_the_outage(self):
+        napr_client.set_cache(MemoryCache())
+        self.addCleanup(napr_client.set_cache, None)
+        fetch = AsyncFlakyService(down_for=0.3)
+        client = napr_async.AsyncClient(fetch=fetch, concurrency=4)
+        codes = ["01.10.01.{:03d}".format(i) for i in range(20)]
+
+        results = asyncio.run(client.lookup_many(codes))
+
+        self.assertGreaterEqual(napr_client._BREAKER.trips, 1)
+        self.assertGreater(fetch.failures, 0)
+        self.assertEqual([r["code"] for r in results], codes)
+        self.assertEqual([r for r in results if not r["ok"]], [])
+        self.assertEqual(napr_client._BREAKER.state(), "closed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""SqliteCache expiry and eviction, on a temporary file (no QGIS, no network).
+
+Run from the repository root::
+
+    python -m unittest discover tests
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from georgian_cadastre import napr_cache  # noqa: E402
+from georgian_cadastre.napr_cache import MISS, SqliteCache  # noqa: E402
+
+
+class FakeClock:
+    """Stands in for the ``time`` module inside napr_cache; every reading
+    moves one second on, so no two rows share an access time."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        self.now += 1.0
+        return self.now
+
+
+def value(size):
+    """A string whose stored JSON text is exactly ``size`` bytes."""
+    return "x" * (size - 2)
+
+
+class SqliteCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self._saved = napr_cache.time
+        self.clock = napr_cache.time = FakeClock()
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, "cache.sqlite")
+
+    def tearDown(self):
+        napr_cache.time = self._saved
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def open(self, **kwargs):
+        cache = SqliteCache(self.path, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_entries_expire_per_kind(self):
+        cache = self.open(ttl={"features": 10, "info": None})
+        cache.put("features", "L1", [1, 2])
+        cache.put("info", "L1", {"area_official": 512})
+        self.assertEqual(cache.get("features", "L1"), [1, 2])
+
+        self.clock.now += 60
+        self.assertIs(cache.get("features", "L1"), MISS)
+        self.assertEqual(cache.get("info", "L1"), {"area_official": 512})
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]),
+                         (2, 1, 1))
+
+    def test_expired_entry_frees_its_bytes(self):
+        cache = self.open(ttl={"search": 10})
+        cache.put("search", "01.10.01.001", value(100))
+        self.assertEqual(cache.stats()["bytes"], 100)
+        self.clock.now += 60
+        self.assertIs(cache.peek("search", "01.10.01.001"), MISS)
+        self.assertEqual(cache.stats()["bytes"], 0)
+
+    def test_evicts_least_recently_used_to_low_water(self):
+        cache = self.open(max_bytes=500)
+        for key in "abcde":
+            cache.put("features", key, value(100))
+        self.assertEqual(cache.stats()["evictions"], 0)
+        cache.get("features", "a")              # now the most recent read
+
+        cache.put("features", "f", value(100))  # 600 > 500: down to <= 450
+        stats = cache.stats()
+        self.assertEqual(stats["evictions"], 2)
+        self.assertEqual(stats["bytes"], 400)
+        kept = [k for k in "abcdef" if cache.peek("features", k) is not MISS]
+        self.assertEqual(kept, ["a", "d", "e", "f"])
+
+    def test_peek_does_not_refresh_lru_order(self):
+        cache = self.open(max_bytes=300)
+        for key in "abc":
+            cache.put("features", key, value(100))
+        cache.peek("features", "a")
+        cache.put("features", "d", value(100))
+        self.assertIs(cache.peek("features", "a"), MISS)
+        self.assertEqual(cache.stats()["hits"], 0)
+
+    def test_oversized_value_is_not_stored(self):
+        cache = self.open(max_bytes=50)
+        cache.put("features", "big", value(100))
+        self.assertIs(cache.get("features", "big"), MISS)
+        self.assertEqual(cache.stats()["bytes"], 0)
+
+    def test_budget_survives_reopen(self):
+        cache = self.open(max_bytes=500)
+        for key in "abc":
+            cache.put("features", key, {"wkb": b"\x01\x02\x03", "k": key})
+        used = cache.stats()["bytes"]
+        cache.close()
+        again = self.open(max_bytes=500)
+        self.assertEqual(again.stats()["bytes"], used)
+        self.assertEqual(again.get("features", "b"),
+                         {"wkb": b"\x01\x02\x03", "k": "b"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""napr_client fetcher wrappers, with fake fetchers (no QGIS, no network).
+
+Run from the repository root::
+
+    python -m unittest discover tests
+"""
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from georgian_cadastre import concurrency, napr_client  # noqa: E402
+from georgian_cadastre.http_pool import PooledFetcher  # noqa: E402
+from georgian_cadastre.napr_cache import MemoryCache  # noqa: E402
+from replay_server import ReplayServer  # noqa: E402
+
+# An info card in the service's layout, padded well past the three fields.
+CARD = (u"<html><body><table>"
+        u"<tr><td>საკადასტრო კოდი</td><td>01.10.001.001</td></tr>"
+        u"<tr><td>ფართობი</td><td>512 კვ.მ</td></tr>"
+        u"<tr><td>ნაკვეთის ტიპი</td><td>არასასოფლო-სამეურნეო</td></tr>"
+        u"<tr><td>მისამართი</td><td>ქ. თბილისი</td></tr>"
+        u"<tr><td>სტატუსი</td><td>რეგისტრირებულია</td></tr>"
+        + u"<tr><td>ისტორია</td><td>ჩანაწერი</td></tr>" * 2000
+        + u"</table></body></html>")
+
+PAYLOAD = ('[{"id":1,"name":"01.10.01.001","descript":"Tbilisi",'
+           '"url":"getinfo.alpha?lbl=L1","distance":"3.5"}]')
+
+
+def every_other_fails(answer):
+    """A fetcher whose odd-numbered calls reset the connection."""
+    calls = [0]
+
+    def _fetch(url, data, headers, timeout):
+        calls[0] += 1
+        if calls[0] % 2:
+            raise ConnectionResetError("connection reset by peer")
+        return answer
+
+    return _fetch
+
+
+class MeteredTest(unittest.TestCase):
+
+    def setUp(self):
+        self._saved = (napr_client._BREAKER, napr_client.BACKOFF_BASE)
+        napr_client._BREAKER = napr_client.CircuitBreaker()
+        napr_client.BACKOFF_BASE = 0.001
+        napr_client.set_cache(MemoryCache())
+
+    def tearDown(self):
+        napr_client._BREAKER, napr_client.BACKOFF_BASE = self._saved
+        napr_client.set_cache(None)
+
+    def test_counts_only_its_own_calls(self):
+        inner = every_other_fails(PAYLOAD)
+        mine, theirs = napr_client.metered(inner), napr_client.metered(inner)
+        for _ in range(3):
+            napr_client.reverse(44.8, 41.7, fetch=mine)
+        napr_client.reverse(44.8, 41.7, fetch=theirs)
+
+        row = mine.metrics.snapshot()["reverse"]
+        self.assertEqual((row["requests"], row["errors"], row["retries"]),
+                         (6, 3, 3))
+        self.assertEqual(mine.metrics.retries(), 3)
+        self.assertEqual(theirs.metrics.retries(), 1)
+
+    def test_counts_cache_hits(self):
+        fetch = napr_client.metered(lambda *_a: '{"features": []}')
+        with self.assertRaises(napr_client.NaprError):
+            napr_client.fetch_features("L1", fetch=fetch)
+        napr_client._CACHE.put("features", "L2", [])
+        napr_client.fetch_features("L2", fetch=fetch)
+        row = fetch.metrics.snapshot()["features"]
+        self.assertEqual((row["requests"], row["cache_hits"]), (1, 1))
+
+
+class InfoReaderTest(unittest.TestCase):
+
+    EXPECTED = {"area_official": 512.0, "parcel_type": u"არასასოფლო-სამეურნეო",
+                "status": u"რეგისტრირებულია"}
+
+    def read(self, card, size):
+        return napr_client._read_info(
+            card[i:i + size] for i in range(0, len(card), size))
+
+    def test_any_chunking_finds_the_same_fields(self):
+        for size in (1, 3, 64, 4096, len(CARD)):
+            with self.subTest(size=size):
+                self.assertEqual(self.read(CARD, size), self.EXPECTED)
+
+    def test_fields_after_a_long_preamble(self):
+        history = u"<tr><td>ისტორია</td><td>ჩანაწერი</td></tr>" * 3000
+        card = CARD.replace(u"<table>", u"<table>" + history, 1)
+        self.assertEqual(self.read(card, 7), self.EXPECTED)
+        self.assertEqual(napr_client._parse_info(card), self.EXPECTED)
+
+    def test_whitespace_split_across_chunks(self):
+        card = (u"<p>ფართობი  \n</p>  <b>1 024,5</b>\t კვ.მ "
+                u"ნაკვეთის   ტიპი</p>")
+        for size in (1, 2, 5):
+            with self.subTest(size=size):
+                info = self.read(card, size)
+                self.assertEqual(info["area_official"], 1024.5)
+                self.assertEqual(info["parcel_type"], "")
+
+
+class LookupMatchTest(unittest.TestCase):
+
+    MATCH = {"lbl": "L1", "code": "01.10.01.001"}
+    FEATURES = ('{"data": [{"id": 1, "name": "01.10.01.001",'
+                ' "shape": "POINT(44.8 41.7)", "proj": "EPSG:4326"}]}')
+
+    def setUp(self):
+        napr_client.set_cache(MemoryCache())
+
+    def tearDown(self):
+        napr_client.set_cache(None)
+
+    def test_cache_only_never_fetches(self):
+        self.assertIsNone(napr_client.lookup_match(self.MATCH, cache_only=True))
+        result = napr_client.lookup_match(self.MATCH,
+                                          fetch=lambda *_a: self.FEATURES)
+        self.assertEqual((result["lbl"], result["address"], result["wkt"]),
+                         ("L1", "", "POINT(44.8 41.7)"))
+        cached = napr_client.lookup_match(self.MATCH, cache_only=True)
+        self.assertEqual(cached, result)
+        self.assertIsNone(napr_client.lookup_match(
+            self.MATCH, with_info=True, cache_only=True))
+
+
+def wrapped(fetch):
+    """The stack the tasks build: metered(capped(throttled(fetch)))."""
+    return napr_client.metered(concurrency.capped(
+        concurrency.throttled(fetch, concurrency.TokenBucket(1000)), 2))
+
+
+class StreamOnly:
+    """A fetcher that only answers through ``.stream``, in small chunks."""
+
+    def __init__(self, body):
+        self.body = body
+        self.sent = 0
+
+    def __call__(self, url, data, headers, timeout):
+        raise AssertionError("the whole body was requested")
+
+    def stream(self, url, data, headers, timeout):
+        for i in range(0, len(self.body), 64):
+            self.sent += 1
+            yield self.body[i:i + 64]
+
+
+class StreamTest(unittest.TestCase):
+
+    def setUp(self):
+        napr_client.set_cache(MemoryCache())
+
+    def tearDown(self):
+        napr_client.set_cache(None)
+
+    def test_wrappers_forward_stream(self):
+        inner = StreamOnly(CARD)
+        fetch = wrapped(inner)
+        self.assertTrue(hasattr(fetch, "stream"))
+        info = napr_client.fetch_info("L1", fetch=fetch)
+        self.assertIsNotNone(info.get("area_official"))
+        self.assertLess(inner.sent, len(CARD) // 64 // 4)   # stopped early
+        row = fetch.metrics.snapshot()["info"]
+        self.assertEqual(row["requests"], 1)
+        self.assertLess(row["bytes"], len(CARD.encode("utf-8")) // 4)
+
+    def test_pooled_stream_against_replay_server(self):
+        server = ReplayServer(card_bytes=200000)
+        server.start()
+        pooled = PooledFetcher(max_per_host=2)
+        try:
+            napr_client.set_base_url(server.url)
+            fetch = wrapped(pooled)
+            info = napr_client.fetch_info("N12345", fetch=fetch)
+            self.assertIsNotNone(info.get("area_official"))
+            self.assertLess(fetch.metrics.snapshot()["info"]["bytes"], 100000)
+            # The card was abandoned half-read: its connection is not reused.
+            napr_client.fetch_info("N12346", fetch=fetch)
+            self.assertEqual(pooled.stats["reused"], 0)
+            # A body read to the end leaves the connection for the next call.
+            chunks = list(pooled.stream(server.url + "/__stats", None, {}, 5))
+            self.assertIn("requests", "".join(chunks))
+            list(pooled.stream(server.url + "/__stats", None, {}, 5))
+            self.assertEqual(pooled.stats["reused"], 1)
+        finally:
+            napr_client.set_base_url(None)
+            pooled.close()
+            server.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""The WKT <-> WKB codec behind the compact feature rows (no QGIS).
+
+Run from the repository root::
+
+    python -m unittest discover tests
+"""
+import math
+import os
+import struct
+import sys
+import unittest
+import zlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from georgian_cadastre import napr_client  # noqa: E402
+from georgian_cadastre.napr_geom import (  # noqa: E402
+    GeomRow, UnsupportedGeometry, compact_row, copy_geometry, pack, unpack,
+    unpack_wkt, wkb_to_wkt, wkt_to_wkb)
+
+
+class RoundTripTest(unittest.TestCase):
+
+    def assertRoundTrip(self, wkt, expected=None):
+        self.assertEqual(wkb_to_wkt(wkt_to_wkb(wkt)), expected or wkt)
+
+    def test_simple_types(self):
+        self.assertRoundTrip("POINT(44.8 41.7)")
+        self.assertRoundTrip("LINESTRING(0.0 0.0, 1.5 2.5, -3.0 4.0)")
+        self.assertRoundTrip("POLYGON((0.0 0.0, 4.0 0.0, 4.0 4.0, 0.0 0.0), "
+                             "(1.0 1.0, 2.0 1.0, 2.0 2.0, 1.0 1.0))")
+
+    def test_multipart_types(self):
+        self.assertRoundTrip("MULTIPOINT((1.0 2.0), (3.0 4.0))")
+        self.assertRoundTrip("MULTIPOINT(1 2, 3 4)",
+                             "MULTIPOINT((1.0 2.0), (3.0 4.0))")
+        self.assertRoundTrip("MULTILINESTRING((0.0 0.0, 1.0 1.0), "
+                             "(2.0 2.0, 3.0 3.0))")
+        self.assertRoundTrip("MULTIPOLYGON(((0.0 0.0, 1.0 0.0, 1.0 1.0, 0.0 0.0)), "
+                             "((5.0 5.0, 6.0 5.0, 6.0 6.0, 5.0 5.0)))")
+        self.assertRoundTrip("GEOMETRYCOLLECTION(POINT(1.0 2.0), "
+                             "LINESTRING(0.0 0.0, 1.0 1.0))")
+
+    def test_dimensions_and_empty(self):
+        self.assertRoundTrip("POINT Z(1.0 2.0 3.0)")
+        self.assertRoundTrip("POINT(1 2 3)", "POINT Z(1.0 2.0 3.0)")
+        self.assertRoundTrip("LINESTRING M(0.0 0.0 7.0, 1.0 1.0 8.0)")
+        self.assertRoundTrip("POLYGON ZM((0.0 0.0 1.0 2.0, 1.0 0.0 1.0 2.0, "
+                             "0.0 0.0 1.0 2.0))")
+        self.assertRoundTrip("POINT EMPTY")
+        self.assertRoundTrip("MULTIPOLYGON EMPTY")
+
+    def test_iso_wkb_layout(self):
+        wkb = wkt_to_wkb("POINT Z(1 2 3)")
+        self.assertEqual(struct.unpack_from("<BI", wkb), (1, 1001))
+        self.assertEqual(struct.unpack_from("<3d", wkb, 5), (1.0, 2.0, 3.0))
+        empty = wkt_to_wkb("POINT EMPTY")
+        self.assertTrue(all(math.isnan(v)
+                            for v in struct.unpack_from("<2d", empty, 5)))
+
+    def test_reads_big_endian_and_srid(self):
+        big = struct.pack(">BI2d", 0, 1, 44.8, 41.7)
+        self.assertEqual(wkb_to_wkt(big), "POINT(44.8 41.7)")
+        ewkb = struct.pack("<BII2d", 1, 0x20000001, 4326, 44.8, 41.7)
+        self.assertEqual(wkb_to_wkt(ewkb), "POINT(44.8 41.7)")
+        self.assertEqual(wkb_to_wkt(wkt_to_wkb("SRID=4326;POINT(44.8 41.7)")),
+                         "POINT(44.8 41.7)")
+
+
+class MalformedTest(unittest.TestCase):
+
+    def test_rejects_malformed_wkt(self):
+        for wkt in ("POINT(1 2, 3 4)", "POINT 1 2", "POINT(1)",
+                    "POINT(1 2 3 4 5)", "LINESTRING(0 0, 1 1",
+                    "POLYGON((0 0, 1 1 1, 0 0))", "POINT(1 2) POINT(3 4)",
+                    "POINT(a b)", "LINESTRING((0 0, 1 1))", ""):
+            with self.subTest(wkt=wkt):
+                with self.assertRaises(ValueError):
+                    wkt_to_wkb(wkt)
+
+    def test_unsupported_type_keeps_the_wkt(self):
+        with self.assertRaises(UnsupportedGeometry):
+            wkt_to_wkb("CIRCULARSTRING(0 0, 1 1, 2 0)")
+        row = compact_row({"wkt": "CIRCULARSTRING(0 0, 1 1, 2 0)"})
+        self.assertNotIn("wkb", row)
+        self.assertEqual(row["wkt"], "CIRCULARSTRING(0 0, 1 1, 2 0)")
+
+    def test_features_reject_malformed_geometry(self):
+        data = {"data": [{"id": 1, "name": "x", "shape": "POINT(1 2, 3 4)"}]}
+        with self.assertRaises(napr_client.NaprError) as ctx:
+            napr_client._parse_features(data)
+        self.assertEqual(ctx.exception.key, "err_invalid")
+
+
+class CompactRowTest(unittest.TestCase):
+
+    def test_keeps_the_service_text(self):
+        wkt = "POLYGON((44.123400 41.7,44.1235 41.7001,1 2,44.123400 41.7))"
+        row = compact_row({"id": 7, "wkt": wkt, "epsg": "EPSG:4326"})
+        self.assertIsInstance(row, GeomRow)
+        self.assertNotIn("wkt", row)
+        self.assertEqual(row["wkt"], wkt)
+        self.assertEqual(row.get("wkt"), wkt)
+        self.assertEqual(unpack(row["wkb"]), wkt_to_wkb(wkt))
+
+    def test_plain_wkb_blob_rebuilds_the_text(self):
+        blob = pack(wkt_to_wkb("POINT(1 2)"))
+        self.assertEqual(unpack_wkt(blob), "POINT(1.0 2.0)")
+        self.assertEqual(GeomRow(wkb=blob)["wkt"], "POINT(1.0 2.0)")
+        self.assertEqual(zlib.decompress(blob), wkt_to_wkb("POINT(1 2)"))
+
+    def test_copy_geometry(self):
+        row = compact_row({"wkt": "POINT(1 2)"})
+        self.assertEqual(copy_geometry(row, {}), {"wkb": row["wkb"]})
+        self.assertEqual(copy_geometry({"wkt": "POINT(1 2)"}, {}),
+                         {"wkt": "POINT(1 2)"})
+        self.assertIsNone(GeomRow(id=1).get("wkt"))
+
+
+if __name__ == "__main__":
+    unittest.main()